@@ -1,14 +1,16 @@
-import heapq
-from typing import List, Tuple, Set, Dict, Optional
+from typing import Generator, Iterable, List, Tuple, Set, Optional, Union
 from dataclasses import dataclass
 import time
 
 from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto, como_grade
+from grafo import GrafoLabirinto, como_grafo, grade_do_grafo
+from fronteira import criar_fronteira
+from contexto import obter_contexto, devolver_contexto
+from marcos import TabelaMarcos
+from instrumentacao import instrumentado
 
 # Tipos personalizados
-Labirinto = List[List[str]]
-Posicao = Tuple[int, int]
-Caminho = List[Posicao]
 VizinhoCusto = Tuple[Posicao, int]  # (posição, custo)
 
 @dataclass
@@ -21,6 +23,12 @@ class MetricasBusca:
     tempo_execucao: float
     distancia_heuristica: int
     algoritmo: str
+    insercoes: int = 0  # Entradas colocadas na fronteira
+    remocoes: int = 0  # Itens retirados da fronteira e expandidos
+    remocoes_obsoletas: int = 0  # Entradas desatualizadas descartadas sem expandir
+    nos_atualizados: int = 0  # Nós com rhs recalculado (buscas incrementais)
+    pico_nos: int = 0  # Máximo de nós guardados ao mesmo tempo (buscas com memória limitada)
+    do_cache: bool = False  # Resultado lido do cache (tempo_execucao é o da execução original)
 
 def heuristica_manhattan(pos_a: Posicao, pos_b: Posicao) -> int:
     """Calcula a distância de Manhattan entre duas posições."""
@@ -33,302 +41,843 @@ def esta_dentro_limites(pos: Posicao, altura: int, largura: int) -> bool:
     linha, coluna = pos
     return 0 <= linha < altura and 0 <= coluna < largura
 
-def obter_vizinhos_com_custo(pos: Posicao, lab: Labirinto) -> List[VizinhoCusto]:
+def obter_vizinhos_com_custo(pos: Posicao, lab: GradeLabirinto) -> List[VizinhoCusto]:
     """Retorna as posições vizinhas válidas e seus custos."""
     linha, coluna = pos
+    altura, largura, celulas = lab.altura, lab.largura, lab.celulas
     vizinhos = []
     direcoes = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # direita, baixo, esquerda, cima
     
     for dl, dc in direcoes:
         nova_linha, nova_coluna = linha + dl, coluna + dc
-        nova_pos = (nova_linha, nova_coluna)
         
-        if esta_dentro_limites(nova_pos, len(lab), len(lab[0])):
-            if lab[nova_linha][nova_coluna] != PAREDE:
+        if 0 <= nova_linha < altura and 0 <= nova_coluna < largura:
+            codigo = celulas[nova_linha * largura + nova_coluna]
+            if codigo != CEL_PAREDE:
                 # Define o custo baseado no tipo de célula
-                custo = CUSTO_BARREIRA if lab[nova_linha][nova_coluna] == BARREIRA else CUSTO_NORMAL
-                vizinhos.append((nova_pos, custo))
+                custo = CUSTO_BARREIRA if codigo == CEL_BARREIRA else CUSTO_NORMAL
+                vizinhos.append(((nova_linha, nova_coluna), custo))
     
     return vizinhos
 
 def coletar_metricas(
     caminho: Optional[Caminho],
-    custos_acumulados: Dict[Posicao, int],
-    visitados: Set[Posicao],
+    custo_total: int,
+    nos_visitados: int,
     tempo_inicio: float,
     tempo_fim: float,
     pos_inicio: Posicao,
     pos_fim: Posicao,
-    algoritmo: str
+    algoritmo: str,
+    fronteiras: Iterable = ()
 ) -> MetricasBusca:
-    """Coleta e retorna as métricas de busca."""
-    custo_total = custos_acumulados.get(pos_fim, 0) if caminho else 0
+    """Coleta e retorna as métricas de busca (somando os contadores das fronteiras usadas)."""
+    fronteiras = list(fronteiras)
     return MetricasBusca(
         caminho_encontrado=caminho is not None,
-        custo_total=custo_total,
+        custo_total=custo_total if caminho else 0,
         comprimento_caminho=len(caminho) if caminho else 0,
-        nos_visitados=len(visitados),
+        nos_visitados=nos_visitados,
         tempo_execucao=tempo_fim - tempo_inicio,
         distancia_heuristica=heuristica_manhattan(pos_inicio, pos_fim),
-        algoritmo=algoritmo
+        algoritmo=algoritmo,
+        insercoes=sum(f.insercoes for f in fronteiras),
+        remocoes=sum(f.remocoes for f in fronteiras),
+        remocoes_obsoletas=sum(f.remocoes_obsoletas for f in fronteiras)
     )
 
-def resolver_a_estrela(lab: Labirinto, inicio: Posicao, fim: Posicao) -> Tuple[Optional[Caminho], MetricasBusca]:
+@dataclass
+class EventoBusca:
+    """Expansão de uma célula, emitida pelas formas passo a passo (passos_*) das buscas."""
+    celula: int  # Índice linear da célula expandida
+    inseridas: List[int]  # Células colocadas (ou melhoradas) na fronteira por esta expansão
+    custo: int  # Custo acumulado da célula expandida (até o fim, na frente reversa)
+    melhor_custo: Optional[int] = None  # Melhor caminho completo já conhecido (bidirecional)
+
+# Gerador de uma busca: emite EventoBusca e, ao terminar, retorna (caminho, métricas)
+PassosBusca = Generator[EventoBusca, None, Tuple[Optional[Caminho], MetricasBusca]]
+
+def executar_busca(passos: PassosBusca) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """Roda uma busca passo a passo até o fim e retorna o caminho e as métricas."""
+    try:
+        while True:
+            next(passos)
+    except StopIteration as parada:
+        return parada.value
+
+def passos_a_estrela(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                     tipo_fronteira: str = "heap", marcos: Optional[TabelaMarcos] = None,
+                     eventos: bool = True) -> PassosBusca:
     """
-    Implementa o algoritmo A* (A-Star).
-    Retorna o caminho encontrado e as métricas da busca.
+    A* passo a passo: emite um EventoBusca por célula expandida (se `eventos`) e
+    retorna o caminho e as métricas ao terminar. Ver resolver_a_estrela.
     """
     tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos, custos = grafo.inicio_vizinhos, grafo.vizinhos, grafo.custos
+    largura, celula_do_no = grafo.largura, grafo.celula_do_no
+    origem, destino = grafo.indice(inicio), grafo.indice(fim)
+    lin_fim, col_fim = fim
     
-    # Fila de prioridade: (f, g, posição)
-    fronteira = [(heuristica_manhattan(inicio, fim), 0, inicio)]
-    veio_de = {inicio: None}  # Dicionário para reconstruir o caminho
-    custo_ate = {inicio: 0}  # g(n): custos acumulados
-    visitados = {inicio}  # Conjunto de posições já visitadas
+    estimar = None
+    nome = "A*"
+    if marcos is not None:
+        if (marcos.altura, marcos.largura) != (grafo.altura, grafo.largura):
+            raise ValueError("As tabelas de marcos são de um labirinto de outro tamanho")
+        # As tabelas são indexadas pela célula, não pelo nó
+        estimar = marcos.estimador(lin_fim * largura + col_fim)
+        nome = "A* (ALT)"
+    
+    # Custos (g), pais e fechados ficam no contexto reutilizável (marca == geracao: visitada)
+    contexto = obter_contexto(grafo.num_nos)
+    geracao, marca, custo_ate, veio_de = contexto.geracao, contexto.marca, contexto.custo, contexto.pai
+    marca[origem] = geracao
+    custo_ate[origem] = 0
+    veio_de[origem] = -1
+    visitados = 1
+    
+    # Fila de prioridade: ((f, g), célula)
+    fronteira = criar_fronteira(tipo_fronteira, contexto)
+    h_inicio = estimar(inicio[0] * largura + inicio[1]) if estimar else heuristica_manhattan(inicio, fim)
+    fronteira.inserir((h_inicio, 0), origem)
     
     while fronteira:
-        _, g_atual, atual = heapq.heappop(fronteira)
+        (_, g_atual), atual = fronteira.remover()
         
-        if atual == fim:
-            # Reconstrói o caminho
-            caminho = []
-            pos_atual = atual
-            while pos_atual:
-                caminho.append(pos_atual)
-                pos_atual = veio_de[pos_atual]
-            caminho = list(reversed(caminho))
+        if atual == destino:
+            caminho = grafo.reconstruir_caminho(veio_de, destino)
+            custo = custo_ate[destino]
+            devolver_contexto(contexto)
             
             tempo_fim = time.time()
             metricas = coletar_metricas(
-                caminho, custo_ate, visitados, tempo_inicio, tempo_fim,
-                inicio, fim, "A*"
+                caminho, custo, visitados, tempo_inicio, tempo_fim,
+                inicio, fim, nome, (fronteira,)
             )
             return caminho, metricas
         
         # Explora os vizinhos
-        for prox_pos, custo_movimento in obter_vizinhos_com_custo(atual, lab):
-            novo_g = g_atual + custo_movimento
+        inseridas = [] if eventos else None
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            prox = vizinhos[k]
+            novo_g = g_atual + custos[k]
             
-            if prox_pos not in custo_ate or novo_g < custo_ate[prox_pos]:
-                visitados.add(prox_pos)
-                custo_ate[prox_pos] = novo_g
-                veio_de[prox_pos] = atual
-                f = novo_g + heuristica_manhattan(prox_pos, fim)
-                heapq.heappush(fronteira, (f, novo_g, prox_pos))
+            if marca[prox] != geracao:
+                marca[prox] = geracao
+                visitados += 1
+            elif novo_g >= custo_ate[prox]:
+                continue
+            custo_ate[prox] = novo_g
+            veio_de[prox] = atual
+            celula = prox if celula_do_no is None else celula_do_no[prox]
+            if estimar is None:
+                lin, col = divmod(celula, largura)
+                f = novo_g + abs(lin - lin_fim) + abs(col - col_fim)
+            else:
+                f = novo_g + estimar(celula)
+            fronteira.inserir((f, novo_g), prox)
+            if eventos:
+                inseridas.append(prox)
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, g_atual)
     
+    devolver_contexto(contexto)
     tempo_fim = time.time()
     metricas = coletar_metricas(
-        None, custo_ate, visitados, tempo_inicio, tempo_fim,
-        inicio, fim, "A*"
+        None, 0, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, nome, (fronteira,)
     )
     return None, metricas
 
-def resolver_guloso(lab: Labirinto, inicio: Posicao, fim: Posicao) -> Tuple[Optional[Caminho], MetricasBusca]:
+@instrumentado
+def resolver_a_estrela(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                       tipo_fronteira: str = "heap",
+                       marcos: Optional[TabelaMarcos] = None) -> Tuple[Optional[Caminho], MetricasBusca]:
     """
-    Implementa o algoritmo de Busca Gulosa (Greedy Best-First Search).
+    Implementa o algoritmo A* (A-Star).
     Retorna o caminho encontrado e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    Com `marcos` (ver marcos.preprocessar_marcos), usa a heurística ALT no lugar de Manhattan.
+    """
+    return executar_busca(passos_a_estrela(lab, inicio, fim, tipo_fronteira, marcos, eventos=False))
+
+def passos_guloso(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                  tipo_fronteira: str = "heap", eventos: bool = True) -> PassosBusca:
+    """
+    Busca Gulosa passo a passo: emite um EventoBusca por célula expandida (custo 0,
+    já que a busca ignora custos). Ver resolver_guloso.
     """
     tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos = grafo.inicio_vizinhos, grafo.vizinhos
+    largura, celula_do_no = grafo.largura, grafo.celula_do_no
+    origem, destino = grafo.indice(inicio), grafo.indice(fim)
+    lin_fim, col_fim = fim
+    
+    # Pais e fechados no contexto reutilizável (marca == geracao: visitada)
+    contexto = obter_contexto(grafo.num_nos)
+    geracao, marca, veio_de = contexto.geracao, contexto.marca, contexto.pai
+    marca[origem] = geracao
+    veio_de[origem] = -1
+    visitados = 1
     
-    fronteira = [(heuristica_manhattan(inicio, fim), inicio)]
-    veio_de = {inicio: None}  # Dicionário para reconstruir o caminho
-    custo_ate = {inicio: 0}  # Para métricas
-    visitados = {inicio}  # Conjunto de posições já visitadas
+    fronteira = criar_fronteira(tipo_fronteira, contexto)
+    fronteira.inserir(heuristica_manhattan(inicio, fim), origem)
     
     while fronteira:
-        _, atual = heapq.heappop(fronteira)
+        _, atual = fronteira.remover()
         
-        if atual == fim:
+        if atual == destino:
             # Reconstrói o caminho e calcula o custo real
-            caminho = []
-            pos_atual = atual
+            caminho = grafo.reconstruir_caminho(veio_de, destino)
+            devolver_contexto(contexto)
             custo_total = 0
-            pos_anterior = None
-            
-            while pos_atual:
-                caminho.append(pos_atual)
-                if pos_anterior:
-                    # Calcula o custo real do movimento
-                    custo = (CUSTO_BARREIRA if lab[pos_anterior[0]][pos_anterior[1]] == BARREIRA 
-                            else CUSTO_NORMAL)
-                    custo_total += custo
-                pos_anterior = pos_atual
-                pos_atual = veio_de[pos_anterior]
-            
-            caminho = list(reversed(caminho))
-            custo_ate[fim] = custo_total
+            for anterior, proximo in zip(caminho, caminho[1:]):
+                custo_total += grafo.custo_aresta(grafo.indice(anterior), grafo.indice(proximo))
             
             tempo_fim = time.time()
             metricas = coletar_metricas(
-                caminho, custo_ate, visitados, tempo_inicio, tempo_fim,
-                inicio, fim, "Gulosa"
+                caminho, custo_total, visitados, tempo_inicio, tempo_fim,
+                inicio, fim, "Gulosa", (fronteira,)
             )
             return caminho, metricas
         
         # Explora os vizinhos ignorando custos
-        for prox_pos, _ in obter_vizinhos_com_custo(atual, lab):
-            if prox_pos not in visitados:
-                visitados.add(prox_pos)
-                veio_de[prox_pos] = atual
-                prioridade = heuristica_manhattan(prox_pos, fim)
-                heapq.heappush(fronteira, (prioridade, prox_pos))
+        inseridas = [] if eventos else None
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            prox = vizinhos[k]
+            if marca[prox] != geracao:
+                marca[prox] = geracao
+                visitados += 1
+                veio_de[prox] = atual
+                lin, col = divmod(prox if celula_do_no is None else celula_do_no[prox], largura)
+                prioridade = abs(lin - lin_fim) + abs(col - col_fim)
+                fronteira.inserir(prioridade, prox)
+                if eventos:
+                    inseridas.append(prox)
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, 0)
     
+    devolver_contexto(contexto)
     tempo_fim = time.time()
     metricas = coletar_metricas(
-        None, custo_ate, visitados, tempo_inicio, tempo_fim,
-        inicio, fim, "Gulosa"
+        None, 0, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, "Gulosa", (fronteira,)
     )
     return None, metricas
 
-def resolver_dfs(lab: Labirinto, inicio: Posicao, fim: Posicao) -> Tuple[Optional[Caminho], MetricasBusca]:
+@instrumentado
+def resolver_guloso(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                    tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
     """
-    Implementa o algoritmo de Busca em Profundidade (DFS).
+    Implementa o algoritmo de Busca Gulosa (Greedy Best-First Search).
     Retorna o caminho encontrado e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    """
+    return executar_busca(passos_guloso(lab, inicio, fim, tipo_fronteira, eventos=False))
+
+def passos_dfs(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+               eventos: bool = True, ponteiros_pai: bool = True) -> PassosBusca:
+    """
+    DFS passo a passo: emite um EventoBusca por célula retirada da pilha (as
+    "inseridas" são as empilhadas). Ver resolver_dfs.
     """
     tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos, custos = grafo.inicio_vizinhos, grafo.vizinhos, grafo.custos
+    origem, destino = grafo.indice(inicio), grafo.indice(fim)
+    
+    # Custos acumulados (para as métricas) e pais no contexto reutilizável (marca == geracao: visitada)
+    contexto = obter_contexto(grafo.num_nos)
+    geracao, marca, custos_acumulados, veio_de = contexto.geracao, contexto.marca, contexto.custo, contexto.pai
+    marca[origem] = geracao
+    custos_acumulados[origem] = 0
+    veio_de[origem] = -1
+    visitados = 1
     
-    pilha = [(inicio, [inicio])]  # (posição_atual, caminho_até_aqui)
-    visitados = {inicio}
-    custos_acumulados = {inicio: 0}  # Para métricas
+    # Com ponteiros de pai a pilha guarda só células; sem eles, cada entrada leva
+    # a cópia do caminho até ali (memória quadrática no comprimento do caminho)
+    pilha = [origem] if ponteiros_pai else [(origem, [origem])]
+    guardados = 1  # Células na pilha mais pais (ou células nas cópias dos caminhos)
+    pico = 1
     
     while pilha:
-        atual, caminho = pilha.pop()
+        if ponteiros_pai:
+            atual = pilha.pop()
+            guardados -= 1
+        else:
+            atual, caminho = pilha.pop()
+            guardados -= len(caminho)
         
-        if atual == fim:
+        if atual == destino:
+            custo = custos_acumulados[destino]
+            if ponteiros_pai:
+                caminho = grafo.reconstruir_caminho(veio_de, destino)
+            else:
+                caminho = [grafo.posicao(idx) for idx in caminho]
+            devolver_contexto(contexto)
             tempo_fim = time.time()
             metricas = coletar_metricas(
-                caminho, custos_acumulados, visitados, tempo_inicio, tempo_fim,
+                caminho, custo, visitados, tempo_inicio, tempo_fim,
                 inicio, fim, "DFS"
             )
+            metricas.pico_nos = pico
             return caminho, metricas
         
         # Explora os vizinhos
-        for prox_pos, custo in obter_vizinhos_com_custo(atual, lab):
-            linha, coluna = prox_pos
-            if prox_pos not in visitados:
-                visitados.add(prox_pos)
-                novo_caminho = list(caminho)
-                novo_caminho.append(prox_pos)
-                custos_acumulados[prox_pos] = custos_acumulados[atual] + custo
-                pilha.append((prox_pos, novo_caminho))
+        inseridas = [] if eventos else None
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            prox = vizinhos[k]
+            if marca[prox] != geracao:
+                marca[prox] = geracao
+                visitados += 1
+                custos_acumulados[prox] = custos_acumulados[atual] + custos[k]
+                if ponteiros_pai:
+                    veio_de[prox] = atual
+                    pilha.append(prox)
+                    guardados += 2
+                else:
+                    novo_caminho = list(caminho)
+                    novo_caminho.append(prox)
+                    pilha.append((prox, novo_caminho))
+                    guardados += len(novo_caminho)
+                if eventos:
+                    inseridas.append(prox)
+        if guardados > pico:
+            pico = guardados
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, custos_acumulados[atual])
     
+    devolver_contexto(contexto)
     tempo_fim = time.time()
     metricas = coletar_metricas(
-        None, custos_acumulados, visitados, tempo_inicio, tempo_fim,
+        None, 0, visitados, tempo_inicio, tempo_fim,
         inicio, fim, "DFS"
     )
+    metricas.pico_nos = pico
     return None, metricas
 
-def resolver_dijkstra(lab: Labirinto, inicio: Posicao, fim: Posicao) -> Tuple[Optional[Caminho], MetricasBusca]:
+@instrumentado
+def resolver_dfs(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                 ponteiros_pai: bool = True) -> Tuple[Optional[Caminho], MetricasBusca]:
     """
-    Implementa o algoritmo de Dijkstra.
+    Implementa o algoritmo de Busca em Profundidade (DFS).
     Retorna o caminho encontrado e as métricas da busca.
+    Com ponteiros_pai (padrão), cada célula guarda só o pai e o caminho é refeito no
+    fim; com ponteiros_pai=False, cada entrada da pilha leva uma cópia do caminho.
+    O pico de nós guardados vai em metricas.pico_nos.
+    """
+    return executar_busca(passos_dfs(lab, inicio, fim, eventos=False, ponteiros_pai=ponteiros_pai))
+
+def passos_dijkstra(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                    tipo_fronteira: str = "heap", eventos: bool = True) -> PassosBusca:
+    """
+    Dijkstra passo a passo: emite um EventoBusca por célula expandida. Ver resolver_dijkstra.
     """
     tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos, custos = grafo.inicio_vizinhos, grafo.vizinhos, grafo.custos
+    origem, destino = grafo.indice(inicio), grafo.indice(fim)
+    
+    # Custos, pais e fechados no contexto reutilizável (marca == geracao: visitada)
+    contexto = obter_contexto(grafo.num_nos)
+    geracao, marca, custo_ate, veio_de = contexto.geracao, contexto.marca, contexto.custo, contexto.pai
+    marca[origem] = geracao
+    custo_ate[origem] = 0
+    veio_de[origem] = -1
+    visitados = 1
     
-    # Fila de prioridade: (custo_acumulado, posição)
-    fronteira = [(0, inicio)]
-    veio_de = {inicio: None}  # Dicionário para reconstruir o caminho
-    custo_ate = {inicio: 0}  # Custos acumulados até cada posição
-    visitados = {inicio}  # Conjunto de posições já visitadas
+    # Fila de prioridade: (custo_acumulado, célula)
+    fronteira = criar_fronteira(tipo_fronteira, contexto)
+    fronteira.inserir(0, origem)
     
     while fronteira:
-        custo_atual, atual = heapq.heappop(fronteira)
+        custo_atual, atual = fronteira.remover()
         
-        if atual == fim:
-            # Reconstrói o caminho
-            caminho = []
-            pos_atual = atual
-            while pos_atual:
-                caminho.append(pos_atual)
-                pos_atual = veio_de[pos_atual]
-            caminho = list(reversed(caminho))
+        if atual == destino:
+            caminho = grafo.reconstruir_caminho(veio_de, destino)
+            custo = custo_ate[destino]
+            devolver_contexto(contexto)
             
             tempo_fim = time.time()
             metricas = coletar_metricas(
-                caminho, custo_ate, visitados, tempo_inicio, tempo_fim,
-                inicio, fim, "Dijkstra"
+                caminho, custo, visitados, tempo_inicio, tempo_fim,
+                inicio, fim, "Dijkstra", (fronteira,)
             )
             return caminho, metricas
         
         # Explora os vizinhos
-        for prox_pos, custo_movimento in obter_vizinhos_com_custo(atual, lab):
-            novo_custo = custo_atual + custo_movimento
+        inseridas = [] if eventos else None
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            prox = vizinhos[k]
+            novo_custo = custo_atual + custos[k]
             
-            if prox_pos not in custo_ate or novo_custo < custo_ate[prox_pos]:
-                visitados.add(prox_pos)
-                custo_ate[prox_pos] = novo_custo
-                veio_de[prox_pos] = atual
-                heapq.heappush(fronteira, (novo_custo, prox_pos))
+            if marca[prox] != geracao:
+                marca[prox] = geracao
+                visitados += 1
+            elif novo_custo >= custo_ate[prox]:
+                continue
+            custo_ate[prox] = novo_custo
+            veio_de[prox] = atual
+            fronteira.inserir(novo_custo, prox)
+            if eventos:
+                inseridas.append(prox)
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, custo_atual)
     
+    devolver_contexto(contexto)
     tempo_fim = time.time()
     metricas = coletar_metricas(
-        None, custo_ate, visitados, tempo_inicio, tempo_fim,
-        inicio, fim, "Dijkstra"
+        None, 0, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, "Dijkstra", (fronteira,)
     )
     return None, metricas 
 
-def resolver_best_first_search(lab: Labirinto, inicio: Posicao, fim: Posicao) -> Tuple[Optional[Caminho], MetricasBusca]:
+@instrumentado
+def resolver_dijkstra(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                      tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
     """
-    Implementa o algoritmo Best-First Search.
+    Implementa o algoritmo de Dijkstra.
     Retorna o caminho encontrado e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    """
+    return executar_busca(passos_dijkstra(lab, inicio, fim, tipo_fronteira, eventos=False))
+
+def passos_best_first_search(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                             tipo_fronteira: str = "heap", eventos: bool = True) -> PassosBusca:
+    """
+    Best-First Search passo a passo: emite um EventoBusca por célula expandida.
+    Ver resolver_best_first_search.
     """
     tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos, custos = grafo.inicio_vizinhos, grafo.vizinhos, grafo.custos
+    largura, celula_do_no = grafo.largura, grafo.celula_do_no
+    origem, destino = grafo.indice(inicio), grafo.indice(fim)
+    lin_fim, col_fim = fim
+    
+    # Fila de prioridade: (2 * heurística + custo_acumulado, célula), isto é,
+    # heurística + custo_acumulado/2 em dobro para a prioridade ficar inteira
+    contexto = obter_contexto(grafo.num_nos)
+    geracao, marca, custo_ate, veio_de = contexto.geracao, contexto.marca, contexto.custo, contexto.pai
+    marca[origem] = geracao
+    custo_ate[origem] = 0
+    veio_de[origem] = -1
+    visitados = 1
     
-    # Fila de prioridade: (heurística + custo_acumulado/2, posição)
-    fronteira = [(heuristica_manhattan(inicio, fim), inicio)]
-    veio_de = {inicio: None}  # Dicionário para reconstruir o caminho
-    custo_ate = {inicio: 0}  # Para métricas
-    visitados = {inicio}  # Conjunto de posições já visitadas
+    fronteira = criar_fronteira(tipo_fronteira, contexto)
+    fronteira.inserir(2 * heuristica_manhattan(inicio, fim), origem)
     
     while fronteira:
-        _, atual = heapq.heappop(fronteira)
+        _, atual = fronteira.remover()
         
-        if atual == fim:
-            # Reconstrói o caminho e calcula o custo real
-            caminho = []
-            pos_atual = atual
-            custo_total = 0
-            pos_anterior = None
-            
-            while pos_atual:
-                caminho.append(pos_atual)
-                if pos_anterior:
-                    # Calcula o custo real do movimento
-                    for vizinho, custo in obter_vizinhos_com_custo(pos_anterior, lab):
-                        if vizinho == pos_atual:
-                            custo_total += custo
-                            break
-                pos_anterior = pos_atual
-                pos_atual = veio_de[pos_anterior]
-            
-            caminho = list(reversed(caminho))
-            custo_ate[fim] = custo_total
+        if atual == destino:
+            caminho = grafo.reconstruir_caminho(veio_de, destino)
+            custo = custo_ate[destino]
+            devolver_contexto(contexto)
             
             tempo_fim = time.time()
             metricas = coletar_metricas(
-                caminho, custo_ate, visitados, tempo_inicio, tempo_fim,
-                inicio, fim, "Best-First"
+                caminho, custo, visitados, tempo_inicio, tempo_fim,
+                inicio, fim, "Best-First", (fronteira,)
             )
             return caminho, metricas
         
         # Explora os vizinhos considerando tanto a heurística quanto o custo
-        for prox_pos, custo_movimento in obter_vizinhos_com_custo(atual, lab):
-            if prox_pos not in visitados:
-                visitados.add(prox_pos)
-                veio_de[prox_pos] = atual
-                custo_ate[prox_pos] = custo_ate[atual] + custo_movimento
+        inseridas = [] if eventos else None
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            prox = vizinhos[k]
+            if marca[prox] != geracao:
+                marca[prox] = geracao
+                visitados += 1
+                veio_de[prox] = atual
+                g = custo_ate[atual] + custos[k]
+                custo_ate[prox] = g
                 
                 # Combina heurística com custo acumulado para melhor estimativa
-                h = heuristica_manhattan(prox_pos, fim)
-                g = custo_ate[prox_pos]
-                prioridade = h + g/2  # Dá mais peso à heurística que ao custo
+                lin, col = divmod(prox if celula_do_no is None else celula_do_no[prox], largura)
+                h = abs(lin - lin_fim) + abs(col - col_fim)
+                prioridade = 2 * h + g  # Dá mais peso à heurística que ao custo
                 
-                heapq.heappush(fronteira, (prioridade, prox_pos))
+                fronteira.inserir(prioridade, prox)
+                if eventos:
+                    inseridas.append(prox)
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, custo_ate[atual])
+    
+    devolver_contexto(contexto)
+    tempo_fim = time.time()
+    metricas = coletar_metricas(
+        None, 0, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, "Best-First", (fronteira,)
+    )
+    return None, metricas 
+
+@instrumentado
+def resolver_best_first_search(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                               tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Implementa o algoritmo Best-First Search.
+    Retorna o caminho encontrado e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    """
+    return executar_busca(passos_best_first_search(lab, inicio, fim, tipo_fronteira, eventos=False))
+
+def passos_bidirecional(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                        usar_heuristica: bool, algoritmo: str, tipo_fronteira: str = "heap",
+                        eventos: bool = True) -> PassosBusca:
+    """
+    Busca bidirecional: uma frente sai do início e outra do fim até se encontrarem.
+    Emite um EventoBusca por célula expandida, de qualquer uma das frentes, com o custo
+    do melhor caminho completo já encontrado (mu).
+    
+    A adjacência é simétrica, então a frente reversa, ao expandir v, chega a cada
+    vizinho u pagando o custo da aresta u -> v (na grade, o custo de entrar em v).
+    Com heurística, usa os potenciais médios pf(v) = (h(v, fim) - h(v, início)) / 2 e
+    pr = -pf, que são consistentes nos dois sentidos; as chaves são guardadas em dobro
+    para ficarem inteiras. A busca para quando a soma das menores chaves das duas filas
+    alcança o custo do melhor caminho já encontrado (mu), o que garante o custo ótimo.
+    """
+    tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos, custos = grafo.inicio_vizinhos, grafo.vizinhos, grafo.custos
+    largura, celula_do_no = grafo.largura, grafo.celula_do_no
+    origem, destino = grafo.indice(inicio), grafo.indice(fim)
+    lin_ini, col_ini = inicio
+    lin_fim, col_fim = fim
+    
+    def potencial_dobro(celula: int) -> int:
+        """2 * pf(celula) = h(celula, fim) - h(celula, início)."""
+        if not usar_heuristica:
+            return 0
+        if celula_do_no is not None:
+            celula = celula_do_no[celula]
+        lin, col = divmod(celula, largura)
+        return (abs(lin - lin_fim) + abs(col - col_fim)) - (abs(lin - lin_ini) + abs(col - col_ini))
+    
+    # Um contexto por frente: custos a partir do início / até o fim, e o pai de cada
+    # célula (na volta, a próxima célula em direção ao fim)
+    contexto_ida, contexto_volta = obter_contexto(grafo.num_nos), obter_contexto(grafo.num_nos)
+    geracao_ida, marca_ida = contexto_ida.geracao, contexto_ida.marca
+    custo_ida, veio_de_ida = contexto_ida.custo, contexto_ida.pai
+    geracao_volta, marca_volta = contexto_volta.geracao, contexto_volta.marca
+    custo_volta, veio_de_volta = contexto_volta.custo, contexto_volta.pai
+    marca_ida[origem] = geracao_ida
+    custo_ida[origem] = 0
+    veio_de_ida[origem] = -1
+    marca_volta[destino] = geracao_volta
+    custo_volta[destino] = 0
+    veio_de_volta[destino] = -1
+    # Células vistas pelas duas frentes, para contar a união dos visitados
+    visitados_ida = visitados_volta = 1
+    comum = 1 if origem == destino else 0
+    
+    # Filas de prioridade: (2 * (g + potencial), célula)
+    fronteira_ida = criar_fronteira(tipo_fronteira, contexto_ida)
+    fronteira_ida.inserir(potencial_dobro(origem), origem)
+    fronteira_volta = criar_fronteira(tipo_fronteira, contexto_volta)
+    fronteira_volta.inserir(-potencial_dobro(destino), destino)
+    
+    melhor_custo = 0 if origem == destino else float("inf")  # mu
+    encontro = origem if origem == destino else -1
+    
+    while fronteira_ida and fronteira_volta:
+        # Critério de parada: nenhuma célula ainda aberta pode melhorar mu
+        if fronteira_ida.menor_prioridade() + fronteira_volta.menor_prioridade() >= 2 * melhor_custo:
+            break
+        
+        # Expande o lado com a fronteira menor
+        inseridas = [] if eventos else None
+        if len(fronteira_ida) <= len(fronteira_volta):
+            _, atual = fronteira_ida.remover()
+            g_atual = custo_ida[atual]
+            for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+                prox = vizinhos[k]
+                novo_g = g_atual + custos[k]
+                if marca_ida[prox] != geracao_ida:
+                    marca_ida[prox] = geracao_ida
+                    visitados_ida += 1
+                    if marca_volta[prox] == geracao_volta:
+                        comum += 1
+                elif novo_g >= custo_ida[prox]:
+                    continue
+                custo_ida[prox] = novo_g
+                veio_de_ida[prox] = atual
+                fronteira_ida.inserir(2 * novo_g + potencial_dobro(prox), prox)
+                if eventos:
+                    inseridas.append(prox)
+                if marca_volta[prox] == geracao_volta and novo_g + custo_volta[prox] < melhor_custo:
+                    melhor_custo = novo_g + custo_volta[prox]
+                    encontro = prox
+        else:
+            _, atual = fronteira_volta.remover()
+            g_atual = custo_volta[atual]
+            for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+                prox = vizinhos[k]
+                novo_g = g_atual + grafo.custo_aresta(prox, atual)  # Aresta prox -> atual
+                if marca_volta[prox] != geracao_volta:
+                    marca_volta[prox] = geracao_volta
+                    visitados_volta += 1
+                    if marca_ida[prox] == geracao_ida:
+                        comum += 1
+                elif novo_g >= custo_volta[prox]:
+                    continue
+                custo_volta[prox] = novo_g
+                veio_de_volta[prox] = atual
+                fronteira_volta.inserir(2 * novo_g - potencial_dobro(prox), prox)
+                if eventos:
+                    inseridas.append(prox)
+                if marca_ida[prox] == geracao_ida and custo_ida[prox] + novo_g < melhor_custo:
+                    melhor_custo = custo_ida[prox] + novo_g
+                    encontro = prox
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, g_atual, None if encontro == -1 else melhor_custo)
+    
+    nos_visitados = visitados_ida + visitados_volta - comum
+    if encontro == -1:
+        devolver_contexto(contexto_ida)
+        devolver_contexto(contexto_volta)
+        tempo_fim = time.time()
+        metricas = coletar_metricas(
+            None, 0, nos_visitados, tempo_inicio, tempo_fim,
+            inicio, fim, algoritmo, (fronteira_ida, fronteira_volta)
+        )
+        return None, metricas
+    
+    # Junta as duas metades no ponto de encontro
+    caminho = grafo.reconstruir_caminho(veio_de_ida, encontro)
+    atual = veio_de_volta[encontro]
+    while atual != -1:
+        caminho.append(grafo.posicao(atual))
+        atual = veio_de_volta[atual]
+    devolver_contexto(contexto_ida)
+    devolver_contexto(contexto_volta)
     
     tempo_fim = time.time()
     metricas = coletar_metricas(
-        None, custo_ate, visitados, tempo_inicio, tempo_fim,
-        inicio, fim, "Best-First"
+        caminho, melhor_custo, nos_visitados, tempo_inicio, tempo_fim,
+        inicio, fim, algoritmo, (fronteira_ida, fronteira_volta)
     )
-    return None, metricas 
\ No newline at end of file
+    return caminho, metricas
+
+@instrumentado
+def busca_bidirecional(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                       usar_heuristica: bool, algoritmo: str,
+                       tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
+    """Roda passos_bidirecional até o fim e retorna o caminho e as métricas."""
+    return executar_busca(passos_bidirecional(lab, inicio, fim, usar_heuristica, algoritmo,
+                                              tipo_fronteira, eventos=False))
+
+def passos_a_estrela_bidirecional(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                                  tipo_fronteira: str = "heap", eventos: bool = True) -> PassosBusca:
+    """A* bidirecional passo a passo (ver passos_bidirecional)."""
+    return passos_bidirecional(lab, inicio, fim, True, "A* Bidirecional", tipo_fronteira, eventos)
+
+def passos_dijkstra_bidirecional(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                                 tipo_fronteira: str = "heap", eventos: bool = True) -> PassosBusca:
+    """Dijkstra bidirecional passo a passo (ver passos_bidirecional)."""
+    return passos_bidirecional(lab, inicio, fim, False, "Dijkstra Bidirecional", tipo_fronteira, eventos)
+
+@instrumentado
+def resolver_a_estrela_bidirecional(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                                    tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Implementa o A* bidirecional com potenciais médios (Manhattan nos dois sentidos).
+    Retorna o caminho encontrado e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    """
+    return busca_bidirecional(lab, inicio, fim, True, "A* Bidirecional", tipo_fronteira)
+
+@instrumentado
+def resolver_dijkstra_bidirecional(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                                   tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Implementa o algoritmo de Dijkstra bidirecional.
+    Retorna o caminho encontrado e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    """
+    return busca_bidirecional(lab, inicio, fim, False, "Dijkstra Bidirecional", tipo_fronteira)
+
+def passos_jps(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+               tipo_fronteira: str = "heap", eventos: bool = True) -> PassosBusca:
+    """
+    Jump Point Search passo a passo: emite um EventoBusca por ponto de salto expandido;
+    as "inseridas" são os pontos de salto encontrados a partir dele. Ver resolver_jps.
+    """
+    tempo_inicio = time.time()
+    grade = grade_do_grafo(lab) if isinstance(lab, GrafoLabirinto) else como_grade(lab)
+    altura, largura, celulas = grade.altura, grade.largura, grade.celulas
+    lin_fim, col_fim = fim
+    
+    def livre(linha: int, coluna: int) -> bool:
+        """Célula de custo normal dentro da grade (paredes e barreiras bloqueiam o salto)."""
+        if 0 <= linha < altura and 0 <= coluna < largura:
+            codigo = celulas[linha * largura + coluna]
+            return codigo != CEL_PAREDE and codigo != CEL_BARREIRA
+        return False
+    
+    def perto_de_barreira(linha: int, coluna: int) -> bool:
+        """Verifica se algum vizinho direto é uma barreira."""
+        for dl, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            l, c = linha + dl, coluna + dc
+            if 0 <= l < altura and 0 <= c < largura and celulas[l * largura + c] == CEL_BARREIRA:
+                return True
+        return False
+    
+    def saltar_vertical(linha: int, coluna: int, dl: int) -> Optional[Tuple[Posicao, int]]:
+        """Anda na vertical até um ponto de salto; retorna (ponto, distância) ou None."""
+        distancia = 0
+        while True:
+            proxima = linha + dl
+            if not livre(proxima, coluna):
+                return None
+            distancia += 1
+            if (proxima == lin_fim and coluna == col_fim) or perto_de_barreira(proxima, coluna):
+                return (proxima, coluna), distancia
+            # Vizinho lateral forçado: não dava para ter virado antes
+            if ((livre(proxima, coluna + 1) and not livre(linha, coluna + 1)) or
+                    (livre(proxima, coluna - 1) and not livre(linha, coluna - 1))):
+                return (proxima, coluna), distancia
+            linha = proxima
+    
+    def saltar_horizontal(linha: int, coluna: int, dc: int) -> Optional[Tuple[Posicao, int]]:
+        """Anda na horizontal até um ponto de salto; retorna (ponto, distância) ou None."""
+        distancia = 0
+        while True:
+            proxima = coluna + dc
+            if not livre(linha, proxima):
+                return None
+            distancia += 1
+            coluna = proxima
+            if (linha == lin_fim and coluna == col_fim) or perto_de_barreira(linha, coluna):
+                return (linha, coluna), distancia
+            if saltar_vertical(linha, coluna, 1) or saltar_vertical(linha, coluna, -1):
+                return (linha, coluna), distancia
+    
+    def direcoes_podadas(pos: Posicao, pai: Optional[Posicao]) -> List[Tuple[int, int]]:
+        """Direções a explorar a partir de um ponto de salto, dada a direção de chegada."""
+        linha, coluna = pos
+        todas = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # direita, baixo, esquerda, cima
+        if pai is None or celulas[linha * largura + coluna] == CEL_BARREIRA or perto_de_barreira(linha, coluna):
+            return todas
+        dl = (linha > pai[0]) - (linha < pai[0])
+        dc = (coluna > pai[1]) - (coluna < pai[1])
+        if dl == 0:
+            # Chegou na horizontal: segue em frente ou vira para cima/baixo
+            return [d for d in todas if d != (0, -dc)]
+        direcoes = [(dl, 0)]
+        for lado in (1, -1):
+            if livre(linha, coluna + lado) and not livre(linha - dl, coluna + lado):
+                direcoes.append((0, lado))
+        return direcoes
+    
+    # g(n) e pai de cada ponto de salto (pelo índice linear) no contexto reutilizável
+    origem, destino = inicio[0] * largura + inicio[1], lin_fim * largura + col_fim
+    contexto = obter_contexto(altura * largura)
+    geracao, marca, custo_ate, veio_de = contexto.geracao, contexto.marca, contexto.custo, contexto.pai
+    marca[origem] = geracao
+    custo_ate[origem] = 0
+    veio_de[origem] = -1
+    visitados = 1
+    
+    # Fila de prioridade: ((f, g), índice)
+    fronteira = criar_fronteira(tipo_fronteira, contexto)
+    fronteira.inserir((heuristica_manhattan(inicio, fim), 0), origem)
+    
+    while fronteira:
+        (_, g_atual), atual = fronteira.remover()
+        
+        if atual == destino:
+            # Reconstrói o caminho preenchendo os trechos retos entre pontos de salto
+            pontos = []
+            idx = destino
+            while idx != -1:
+                pontos.append(divmod(idx, largura))
+                idx = veio_de[idx]
+            pontos.reverse()
+            custo = custo_ate[destino]
+            devolver_contexto(contexto)
+            caminho = [inicio]
+            for (l1, c1), (l2, c2) in zip(pontos, pontos[1:]):
+                dl = (l2 > l1) - (l2 < l1)
+                dc = (c2 > c1) - (c2 < c1)
+                for passo in range(1, abs(l2 - l1) + abs(c2 - c1) + 1):
+                    caminho.append((l1 + dl * passo, c1 + dc * passo))
+            
+            tempo_fim = time.time()
+            metricas = coletar_metricas(
+                caminho, custo, visitados, tempo_inicio, tempo_fim,
+                inicio, fim, "JPS", (fronteira,)
+            )
+            return caminho, metricas
+        
+        linha, coluna = divmod(atual, largura)
+        pai = veio_de[atual]
+        inseridas = [] if eventos else None
+        for dl, dc in direcoes_podadas((linha, coluna), None if pai == -1 else divmod(pai, largura)):
+            l, c = linha + dl, coluna + dc
+            if not (0 <= l < altura and 0 <= c < largura):
+                continue
+            codigo = celulas[l * largura + c]
+            if codigo == CEL_PAREDE:
+                continue
+            if codigo == CEL_BARREIRA:
+                salto = (l, c), CUSTO_BARREIRA  # Parada obrigatória
+            elif dl == 0:
+                salto = saltar_horizontal(linha, coluna, dc)
+            else:
+                salto = saltar_vertical(linha, coluna, dl)
+            if salto is None:
+                continue
+            
+            (l, c), custo = salto
+            prox = l * largura + c
+            novo_g = g_atual + (custo if codigo == CEL_BARREIRA else custo * CUSTO_NORMAL)
+            if marca[prox] != geracao:
+                marca[prox] = geracao
+                visitados += 1
+            elif novo_g >= custo_ate[prox]:
+                continue
+            custo_ate[prox] = novo_g
+            veio_de[prox] = atual
+            fronteira.inserir((novo_g + abs(l - lin_fim) + abs(c - col_fim), novo_g), prox)
+            if eventos:
+                inseridas.append(prox)
+        
+        if eventos:
+            yield EventoBusca(atual, inseridas, g_atual)
+    
+    devolver_contexto(contexto)
+    tempo_fim = time.time()
+    metricas = coletar_metricas(
+        None, 0, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, "JPS", (fronteira,)
+    )
+    return None, metricas
+
+@instrumentado
+def resolver_jps(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                 tipo_fronteira: str = "heap") -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Implementa Jump Point Search para a grade 4-conectada com barreiras.
+    
+    Entre caminhos de mesmo custo só se consideram os canônicos (movimentos horizontais
+    antes dos verticais), então em vez de colocar na fila cada célula de um corredor,
+    a busca "salta" em linha reta até o próximo ponto de salto:
+    - Salto vertical para no fim, numa célula vizinha de barreira ou quando surge um
+      vizinho lateral forçado (livre aqui, bloqueado na célula anterior).
+    - Salto horizontal para nos mesmos casos ou quando um salto vertical a partir da
+      célula atual encontra um ponto de salto.
+    Barreiras são paradas obrigatórias: a busca só entra nelas a partir de um vizinho
+    (pagando CUSTO_BARREIRA), e o início, as barreiras e as células vizinhas a elas são
+    expandidos nas quatro direções. Com isso o custo continua ótimo, como no A*.
+    Retorna o caminho encontrado (célula a célula) e as métricas da busca.
+    A fila é escolhida por tipo_fronteira (ver fronteira.FRONTEIRAS).
+    """
+    return executar_busca(passos_jps(lab, inicio, fim, tipo_fronteira, eventos=False))
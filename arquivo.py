@@ -0,0 +1,178 @@
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, GradeLabirinto, como_grade
+
+# Cabeçalho: assinatura, versão, dimensões, início, fim, semente, número de moedas e CRC32 das células
+ASSINATURA = b"LABR"
+VERSAO_FORMATO = 1
+FORMATO_CABECALHO = struct.Struct("<4sHxxQQQQQQqQI4x")
+FORMATO_MOEDA = struct.Struct("<QQ")
+SEM_SEMENTE = -1
+
+def alinhar(deslocamento: int, alinhamento: int = 8) -> int:
+    """Arredonda o deslocamento para cima até um múltiplo do alinhamento."""
+    return (deslocamento + alinhamento - 1) // alinhamento * alinhamento
+
+@dataclass
+class CabecalhoLabirinto:
+    """Metadados gravados antes das células no arquivo binário."""
+    altura: int
+    largura: int
+    inicio: Posicao
+    fim: Posicao
+    moedas: List[Posicao]
+    semente: Optional[int]
+    checksum: int
+
+    @property
+    def deslocamento_celulas(self) -> int:
+        """Posição no arquivo onde começa o vetor de células."""
+        return FORMATO_CABECALHO.size + FORMATO_MOEDA.size * len(self.moedas)
+
+def empacotar_cabecalho(cabecalho: CabecalhoLabirinto) -> bytes:
+    """Serializa o cabeçalho e a lista de moedas."""
+    semente = SEM_SEMENTE if cabecalho.semente is None else cabecalho.semente
+    dados = FORMATO_CABECALHO.pack(
+        ASSINATURA, VERSAO_FORMATO, cabecalho.altura, cabecalho.largura,
+        cabecalho.inicio[0], cabecalho.inicio[1], cabecalho.fim[0], cabecalho.fim[1],
+        semente, len(cabecalho.moedas), cabecalho.checksum
+    )
+    return dados + b"".join(FORMATO_MOEDA.pack(l, c) for l, c in cabecalho.moedas)
+
+def ler_cabecalho(dados) -> CabecalhoLabirinto:
+    """Lê o cabeçalho do início de um buffer (bytes, mmap ou memoryview)."""
+    if len(dados) < FORMATO_CABECALHO.size:
+        raise ValueError("Arquivo de labirinto truncado: cabeçalho incompleto")
+    (assinatura, versao, altura, largura, lin_ini, col_ini, lin_fim, col_fim,
+     semente, num_moedas, checksum) = FORMATO_CABECALHO.unpack_from(dados, 0)
+    if assinatura != ASSINATURA:
+        raise ValueError("Arquivo não é um labirinto (assinatura inválida)")
+    if versao != VERSAO_FORMATO:
+        raise ValueError(f"Versão de formato não suportada: {versao}")
+
+    moedas = [
+        FORMATO_MOEDA.unpack_from(dados, FORMATO_CABECALHO.size + k * FORMATO_MOEDA.size)
+        for k in range(num_moedas)
+    ]
+    return CabecalhoLabirinto(
+        altura=altura,
+        largura=largura,
+        inicio=(lin_ini, col_ini),
+        fim=(lin_fim, col_fim),
+        moedas=moedas,
+        semente=None if semente == SEM_SEMENTE else semente,
+        checksum=checksum
+    )
+
+def _permissoes_novo_arquivo(caminho_arquivo: str) -> int:
+    """Permissões do arquivo substituído, ou as de um arquivo novo (0o666 menos a umask)."""
+    try:
+        return os.stat(caminho_arquivo).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def escrever_linhas(caminho_arquivo: str, altura: int, largura: int, linhas: Iterable[bytes],
+                    inicio: Posicao, fim: Posicao, moedas: Iterable[Posicao] = (),
+                    semente: Optional[int] = None) -> CabecalhoLabirinto:
+    """
+    Grava um labirinto a partir de linhas de códigos produzidas sob demanda.
+    O checksum é calculado durante a escrita e o cabeçalho é regravado no final,
+    então a memória usada depende só do tamanho de cada linha.
+
+    A gravação vai para um arquivo temporário no mesmo diretório, que só substitui o
+    destino (os.replace) no fim. Assim dá para salvar um labirinto carregado por
+    carregar_labirinto no próprio arquivo de onde veio: as linhas continuam sendo lidas
+    do mapeamento do arquivo antigo, que não é truncado. Uma falha no meio deixa o
+    destino intacto.
+    """
+    cabecalho = CabecalhoLabirinto(altura, largura, inicio, fim, list(moedas), semente, 0)
+    diretorio = os.path.dirname(os.path.abspath(caminho_arquivo))
+    descritor, temporario = tempfile.mkstemp(dir=diretorio, prefix=".labirinto-", suffix=".tmp")
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(empacotar_cabecalho(cabecalho))
+            checksum = 0
+            total = 0
+            for linha in linhas:
+                arquivo.write(linha)
+                checksum = zlib.crc32(linha, checksum)
+                total += len(linha)
+            if total != altura * largura:
+                raise ValueError(f"Foram gravadas {total} células, esperado {altura * largura}")
+            cabecalho.checksum = checksum
+            arquivo.seek(0)
+            arquivo.write(empacotar_cabecalho(cabecalho))
+        os.chmod(temporario, _permissoes_novo_arquivo(caminho_arquivo))
+        os.replace(temporario, caminho_arquivo)
+    except BaseException:
+        try:
+            os.unlink(temporario)
+        except FileNotFoundError:
+            pass
+        raise
+    return cabecalho
+
+def salvar_labirinto(caminho_arquivo: str, lab: Union[Labirinto, GradeLabirinto], inicio: Posicao,
+                     fim: Posicao, moedas: Iterable[Posicao] = (),
+                     semente: Optional[int] = None) -> CabecalhoLabirinto:
+    """
+    Salva o labirinto (grade ou forma antiga em lista) no formato binário.
+
+    Args:
+        caminho_arquivo: Arquivo de destino
+        lab: O labirinto a ser salvo
+        inicio: Posição de início
+        fim: Posição de fim
+        moedas: Posições das moedas
+        semente: Semente usada na geração, se conhecida
+    """
+    grade = como_grade(lab)
+    celulas = memoryview(grade.celulas)
+    largura = grade.largura
+    linhas = (celulas[i * largura:(i + 1) * largura] for i in range(grade.altura))
+    return escrever_linhas(caminho_arquivo, grade.altura, largura, linhas, inicio, fim, moedas, semente)
+
+def carregar_labirinto(caminho_arquivo: str, gravavel: bool = False,
+                       verificar: bool = False) -> Tuple[GradeLabirinto, Posicao, Posicao, List[Posicao]]:
+    """
+    Abre um labirinto salvo via mmap, sem copiar as células: a GradeLabirinto devolvida
+    lê direto do mapeamento, então abrir um arquivo de vários GB é instantâneo.
+    Retorna o labirinto, as posições de início e fim e as posições das moedas,
+    como gerar_labirinto.
+
+    Args:
+        caminho_arquivo: Arquivo a ser aberto
+        gravavel: Se True, o mapeamento é copy-on-write (alterações não vão para o disco)
+        verificar: Se True, confere o checksum (lê o arquivo inteiro)
+    """
+    with open(caminho_arquivo, "rb") as arquivo:
+        acesso = mmap.ACCESS_COPY if gravavel else mmap.ACCESS_READ
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=acesso)
+
+    cabecalho = ler_cabecalho(mapa)
+    inicio_celulas = cabecalho.deslocamento_celulas
+    fim_celulas = inicio_celulas + cabecalho.altura * cabecalho.largura
+    if len(mapa) < fim_celulas:
+        raise ValueError("Arquivo de labirinto truncado: faltam células")
+
+    # A memoryview mantém o mmap vivo enquanto a grade existir
+    celulas = memoryview(mapa)[inicio_celulas:fim_celulas]
+    if verificar and zlib.crc32(celulas) != cabecalho.checksum:
+        raise ValueError("Checksum das células não confere: arquivo corrompido")
+
+    lab = GradeLabirinto(cabecalho.altura, cabecalho.largura, celulas)
+    return lab, cabecalho.inicio, cabecalho.fim, cabecalho.moedas
+
+def converter_para_labirinto(caminho_arquivo: str) -> Tuple[Labirinto, Posicao, Posicao, List[Posicao]]:
+    """Carrega um arquivo binário e devolve o labirinto na forma antiga (lista de listas)."""
+    lab, inicio, fim, moedas = carregar_labirinto(caminho_arquivo)
+    return lab.para_labirinto(), inicio, fim, moedas
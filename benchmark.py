@@ -0,0 +1,229 @@
+import argparse
+import csv
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from labirinto import gerar_labirinto
+from grafo import compilar_grafo
+from algoritmos import (
+    MetricasBusca,
+    resolver_a_estrela,
+    resolver_dijkstra,
+    resolver_dfs,
+    resolver_guloso,
+    resolver_best_first_search,
+    resolver_a_estrela_bidirecional,
+    resolver_dijkstra_bidirecional,
+    resolver_jps
+)
+from memoria_limitada import resolver_ida_estrela, resolver_sma_estrela
+
+# Algoritmos medidos (nome usado nos relatórios -> função)
+SOLUCIONADORES = {
+    "resolver_a_estrela": resolver_a_estrela,
+    "resolver_dijkstra": resolver_dijkstra,
+    "resolver_dfs": resolver_dfs,
+    "resolver_guloso": resolver_guloso,
+    "resolver_best_first_search": resolver_best_first_search,
+    "resolver_a_estrela_bidirecional": resolver_a_estrela_bidirecional,
+    "resolver_dijkstra_bidirecional": resolver_dijkstra_bidirecional,
+    "resolver_jps": resolver_jps,
+    "resolver_ida_estrela": resolver_ida_estrela,
+    "resolver_sma_estrela": resolver_sma_estrela,
+}
+
+# Campos que identificam um cenário (usados para casar resultados com a linha de base)
+CAMPOS_CHAVE = ("alvo", "altura", "largura", "chance_remover_parede", "chance_barreira", "semente")
+CAMPOS_RESULTADO = CAMPOS_CHAVE + (
+    "repeticoes", "mediana_ns", "p95_ns", "nos_visitados", "custo_total",
+    "insercoes", "remocoes", "remocoes_obsoletas", "pico_nos", "pico_memoria_bytes"
+)
+
+def percentil(valores: List[int], p: float) -> int:
+    """Percentil pelo método do posto mais próximo."""
+    ordenados = sorted(valores)
+    posto = max(1, math.ceil(len(ordenados) * p / 100))
+    return ordenados[posto - 1]
+
+def medir(funcao: Callable[[], object], aquecimento: int, repeticoes: int) -> Tuple[List[int], object]:
+    """Executa a função `aquecimento` vezes sem medir e depois `repeticoes` vezes com perf_counter_ns."""
+    resultado = None
+    for _ in range(aquecimento):
+        resultado = funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter_ns()
+        resultado = funcao()
+        tempos.append(time.perf_counter_ns() - inicio)
+    return tempos, resultado
+
+def pico_memoria(funcao: Callable[[], object]) -> int:
+    """Executa a função uma vez com tracemalloc ligado e devolve o pico de memória alocada."""
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def executar_benchmark(tamanhos: List[Tuple[int, int]], chances_extras: List[float],
+                       chances_barreira: List[float], sementes: List[int],
+                       aquecimento: int = 1, repeticoes: int = 5,
+                       medir_memoria: bool = True) -> List[Dict]:
+    """
+    Varre tamanhos, densidades de caminhos extras e de barreiras para cada semente,
+    medindo a geração (gerar_labirinto com Prim), a compilação do grafo e cada solucionador.
+    O pico de memória é medido numa execução separada, fora das repetições cronometradas.
+    """
+    resultados = []
+
+    def registrar(alvo: str, cenario: Dict, tempos: List[int], pico: Optional[int],
+                  metricas: Optional[MetricasBusca] = None) -> None:
+        resultados.append({
+            "alvo": alvo,
+            **cenario,
+            "repeticoes": len(tempos),
+            "mediana_ns": int(statistics.median(tempos)),
+            "p95_ns": percentil(tempos, 95),
+            "nos_visitados": metricas.nos_visitados if metricas else None,
+            "custo_total": metricas.custo_total if metricas else None,
+            "insercoes": metricas.insercoes if metricas else None,
+            "remocoes": metricas.remocoes if metricas else None,
+            "remocoes_obsoletas": metricas.remocoes_obsoletas if metricas else None,
+            "pico_nos": metricas.pico_nos if metricas else None,
+            "pico_memoria_bytes": pico,
+        })
+
+    for altura, largura in tamanhos:
+        for chance_extras in chances_extras:
+            for chance_barreira in chances_barreira:
+                for semente in sementes:
+                    cenario = {
+                        "altura": altura,
+                        "largura": largura,
+                        "chance_remover_parede": chance_extras,
+                        "chance_barreira": chance_barreira,
+                        "semente": semente,
+                    }
+
+                    def gerar():
+                        # Sem o relatório da geração, que só atrapalharia a saída
+                        return gerar_labirinto(altura, largura, 5, "prim", semente,
+                                               chance_extras, chance_barreira, verboso=False)
+
+                    tempos, (lab, inicio, fim, _) = medir(gerar, aquecimento, repeticoes)
+                    registrar("gerar_labirinto_prim", cenario, tempos,
+                              pico_memoria(gerar) if medir_memoria else None)
+
+                    tempos, grafo = medir(lambda: compilar_grafo(lab), aquecimento, repeticoes)
+                    registrar("compilar_grafo", cenario, tempos,
+                              pico_memoria(lambda: compilar_grafo(lab)) if medir_memoria else None)
+
+                    for nome, resolver in SOLUCIONADORES.items():
+                        executar = lambda: resolver(grafo, inicio, fim)
+                        tempos, (_, metricas) = medir(executar, aquecimento, repeticoes)
+                        registrar(nome, cenario, tempos,
+                                  pico_memoria(executar) if medir_memoria else None, metricas)
+
+    return resultados
+
+def salvar_json(resultados: List[Dict], caminho_arquivo: str) -> None:
+    """Salva os resultados como lista JSON."""
+    with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+        json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+
+def salvar_csv(resultados: List[Dict], caminho_arquivo: str) -> None:
+    """Salva os resultados como CSV, uma linha por alvo e cenário."""
+    with open(caminho_arquivo, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_RESULTADO)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+def comparar_com_base(resultados: List[Dict], base: List[Dict], tolerancia: float = 0.10) -> List[Dict]:
+    """
+    Compara a mediana de cada cenário com a linha de base.
+    Retorna as regressões: cenários cuja mediana cresceu mais que `tolerancia`
+    ou cujo número de nós visitados aumentou.
+    """
+    por_chave = {tuple(r[c] for c in CAMPOS_CHAVE): r for r in base}
+    regressoes = []
+    for atual in resultados:
+        anterior = por_chave.get(tuple(atual[c] for c in CAMPOS_CHAVE))
+        if anterior is None:
+            continue
+        razao = atual["mediana_ns"] / max(anterior["mediana_ns"], 1)
+        mais_nos = (atual["nos_visitados"] is not None and anterior["nos_visitados"] is not None
+                    and atual["nos_visitados"] > anterior["nos_visitados"])
+        if razao > 1 + tolerancia or mais_nos:
+            regressoes.append({
+                **{c: atual[c] for c in CAMPOS_CHAVE},
+                "mediana_base_ns": anterior["mediana_ns"],
+                "mediana_atual_ns": atual["mediana_ns"],
+                "razao": round(razao, 3),
+                "nos_base": anterior["nos_visitados"],
+                "nos_atual": atual["nos_visitados"],
+            })
+    return regressoes
+
+def ler_tamanho(texto: str) -> Tuple[int, int]:
+    """Converte 'ALTURAxLARGURA' em (altura, largura)."""
+    try:
+        altura, largura = texto.lower().split("x")
+        return int(altura), int(largura)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tamanho inválido: {texto!r} (use ALTURAxLARGURA)") from None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando. Retorna 1 se houver regressões."""
+    parser = argparse.ArgumentParser(description="Benchmark reprodutível dos geradores e algoritmos de busca.")
+    parser.add_argument("--tamanhos", type=ler_tamanho, nargs="+", default=[(21, 41), (51, 101)],
+                        help="Tamanhos ALTURAxLARGURA a varrer")
+    parser.add_argument("--extras", type=float, nargs="+", default=[0.0, 0.4],
+                        help="Densidades de caminhos extras (chance_remover_parede)")
+    parser.add_argument("--barreiras", type=float, nargs="+", default=[0.0, 0.05],
+                        help="Densidades de barreiras (chance_barreira)")
+    parser.add_argument("--sementes", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--aquecimento", type=int, default=1)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede o pico de memória")
+    parser.add_argument("--json", dest="saida_json", help="Arquivo JSON de saída")
+    parser.add_argument("--csv", dest="saida_csv", help="Arquivo CSV de saída")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior usado como linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Aumento relativo da mediana tolerado antes de acusar regressão")
+    args = parser.parse_args(argv)
+
+    resultados = executar_benchmark(
+        args.tamanhos, args.extras, args.barreiras, args.sementes,
+        args.aquecimento, args.repeticoes, not args.sem_memoria
+    )
+
+    if args.saida_json:
+        salvar_json(resultados, args.saida_json)
+    if args.saida_csv:
+        salvar_csv(resultados, args.saida_csv)
+    if not args.saida_json and not args.saida_csv:
+        json.dump(resultados, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar_com_base(resultados, base, args.tolerancia)
+        for r in regressoes:
+            print(f"REGRESSÃO {r['alvo']} {r['altura']}x{r['largura']} extras={r['chance_remover_parede']} "
+                  f"barreiras={r['chance_barreira']} semente={r['semente']}: "
+                  f"{r['mediana_base_ns']} ns -> {r['mediana_atual_ns']} ns (x{r['razao']}), "
+                  f"nós {r['nos_base']} -> {r['nos_atual']}", file=sys.stderr)
+        if regressoes:
+            return 1
+        print("Nenhuma regressão encontrada.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
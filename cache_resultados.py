@@ -0,0 +1,255 @@
+import dataclasses
+import json
+import os
+import sqlite3
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto
+from grafo import GrafoLabirinto, impressao_digital
+from algoritmos import MetricasBusca
+
+Resolvedor = Callable[..., Tuple[Optional[Caminho], MetricasBusca]]
+ResultadoBusca = Tuple[Optional[Caminho], MetricasBusca]
+# (impressão digital do labirinto, algoritmo, início, fim)
+ChaveResultado = Tuple[str, str, Posicao, Posicao]
+
+# Acessos acumulados em memória antes de gravar a coluna `uso` da camada em disco
+MAX_USOS_PENDENTES = 1024
+# Campos esperados nas métricas gravadas; entradas de outra versão de MetricasBusca são ignoradas
+CAMPOS_METRICAS = frozenset(campo.name for campo in dataclasses.fields(MetricasBusca))
+
+# Codificação do caminho: um byte de formato e os dados
+SEM_CAMINHO = 0
+CAMINHO_PASSOS = 1  # Início e 2 bits por passo (direita, baixo, esquerda, cima)
+CAMINHO_POSICOES = 2  # Posições soltas, para caminhos que não andam de vizinho em vizinho
+FORMATO_PASSOS = struct.Struct("<BQQQ")  # formato, linha, coluna, número de passos
+PASSOS = {(0, 1): 0, (1, 0): 1, (0, -1): 2, (-1, 0): 3}
+DESLOCAMENTOS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+def codificar_caminho(caminho: Optional[Caminho]) -> bytes:
+    """
+    Codifica o caminho de forma compacta: a posição inicial e 2 bits por passo (4 passos
+    por byte). Caminhos com saltos (passos que não são entre vizinhos) guardam as posições.
+    """
+    if caminho is None:
+        return bytes([SEM_CAMINHO])
+    codigos = []
+    for (l1, c1), (l2, c2) in zip(caminho, caminho[1:]):
+        codigo = PASSOS.get((l2 - l1, c2 - c1))
+        if codigo is None:
+            return bytes([CAMINHO_POSICOES]) + array("q", [v for pos in caminho for v in pos]).tobytes()
+        codigos.append(codigo)
+    dados = bytearray((len(codigos) + 3) // 4)
+    for i, codigo in enumerate(codigos):
+        dados[i >> 2] |= codigo << ((i & 3) * 2)
+    linha, coluna = caminho[0]
+    return FORMATO_PASSOS.pack(CAMINHO_PASSOS, linha, coluna, len(codigos)) + bytes(dados)
+
+def decodificar_caminho(dados: bytes) -> Optional[Caminho]:
+    """Desfaz codificar_caminho."""
+    formato = dados[0]
+    if formato == SEM_CAMINHO:
+        return None
+    if formato == CAMINHO_POSICOES:
+        valores = array("q")
+        valores.frombytes(dados[1:])
+        return [(valores[i], valores[i + 1]) for i in range(0, len(valores), 2)]
+    _, linha, coluna, num_passos = FORMATO_PASSOS.unpack_from(dados, 0)
+    passos = dados[FORMATO_PASSOS.size:]
+    caminho = [(linha, coluna)]
+    for i in range(num_passos):
+        dl, dc = DESLOCAMENTOS[(passos[i >> 2] >> ((i & 3) * 2)) & 3]
+        linha += dl
+        coluna += dc
+        caminho.append((linha, coluna))
+    return caminho
+
+def nome_algoritmo(resolver: Resolvedor) -> str:
+    """Nome estável do solucionador usado na chave (módulo e nome qualificado)."""
+    return f"{getattr(resolver, '__module__', '')}.{getattr(resolver, '__qualname__', repr(resolver))}"
+
+class CacheDisco:
+    """
+    Camada em disco do cache de resultados, num arquivo SQLite. Cada entrada guarda o
+    caminho codificado e as métricas em JSON; quando o total passa de orcamento_bytes,
+    as entradas usadas há mais tempo são apagadas. Uma leitura não escreve no arquivo:
+    o novo `uso` das entradas lidas fica em memória e vai para o disco junto com a
+    próxima gravação (ou a cada MAX_USOS_PENDENTES leituras, ou ao fechar).
+    """
+
+    def __init__(self, caminho_arquivo: str, orcamento_bytes: int = 256 * 2 ** 20):
+        self.orcamento_bytes = orcamento_bytes
+        self.conexao = sqlite3.connect(caminho_arquivo)
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS resultados ("
+            " chave TEXT PRIMARY KEY, caminho BLOB NOT NULL, metricas TEXT NOT NULL,"
+            " tamanho INTEGER NOT NULL, uso INTEGER NOT NULL)"
+        )
+        self.conexao.execute("CREATE INDEX IF NOT EXISTS resultados_uso ON resultados (uso)")
+        self.conexao.commit()
+        self.bytes_usados, uso = self.conexao.execute(
+            "SELECT COALESCE(SUM(tamanho), 0), COALESCE(MAX(uso), 0) FROM resultados"
+        ).fetchone()
+        self.uso = uso  # Relógio lógico dos acessos (para descartar os mais antigos)
+        self.usos_pendentes: Dict[str, int] = {}  # chave -> uso ainda não gravado
+
+    @staticmethod
+    def _texto_chave(chave: ChaveResultado) -> str:
+        impressao, algoritmo, (l1, c1), (l2, c2) = chave
+        return f"{impressao}|{algoritmo}|{l1},{c1}|{l2},{c2}"
+
+    def obter(self, chave: ChaveResultado) -> Optional[ResultadoBusca]:
+        texto = self._texto_chave(chave)
+        linha = self.conexao.execute(
+            "SELECT caminho, metricas FROM resultados WHERE chave = ?", (texto,)
+        ).fetchone()
+        if linha is None:
+            return None
+        metricas = json.loads(linha[1])
+        if not isinstance(metricas, dict) or metricas.keys() != CAMPOS_METRICAS:
+            return None  # Gravada com outros campos: conta como falha e é regravada
+        self.uso += 1
+        self.usos_pendentes[texto] = self.uso
+        if len(self.usos_pendentes) >= MAX_USOS_PENDENTES:
+            self._gravar_usos()
+            self.conexao.commit()
+        return decodificar_caminho(linha[0]), MetricasBusca(**metricas)
+
+    def _gravar_usos(self) -> None:
+        """Grava os usos acumulados pelas leituras (sem commit)."""
+        if self.usos_pendentes:
+            self.conexao.executemany(
+                "UPDATE resultados SET uso = ? WHERE chave = ?",
+                [(uso, chave) for chave, uso in self.usos_pendentes.items()]
+            )
+            self.usos_pendentes.clear()
+
+    def guardar(self, chave: ChaveResultado, caminho: Optional[Caminho], metricas: MetricasBusca) -> None:
+        texto = self._texto_chave(chave)
+        dados = codificar_caminho(caminho)
+        metricas_json = json.dumps(dataclasses.asdict(metricas), separators=(",", ":"))
+        tamanho = len(texto) + len(dados) + len(metricas_json)
+        if tamanho > self.orcamento_bytes:
+            return
+        self._gravar_usos()
+        self.uso += 1
+        self.usos_pendentes.pop(texto, None)
+        anterior = self.conexao.execute("SELECT tamanho FROM resultados WHERE chave = ?", (texto,)).fetchone()
+        if anterior is not None:
+            self.bytes_usados -= anterior[0]
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO resultados (chave, caminho, metricas, tamanho, uso) VALUES (?, ?, ?, ?, ?)",
+            (texto, dados, metricas_json, tamanho, self.uso)
+        )
+        self.bytes_usados += tamanho
+        while self.bytes_usados > self.orcamento_bytes:
+            antigo = self.conexao.execute(
+                "SELECT chave, tamanho FROM resultados ORDER BY uso LIMIT 1"
+            ).fetchone()
+            self.conexao.execute("DELETE FROM resultados WHERE chave = ?", (antigo[0],))
+            self.bytes_usados -= antigo[1]
+        self.conexao.commit()
+
+    def limpar(self) -> None:
+        self.usos_pendentes.clear()
+        self.conexao.execute("DELETE FROM resultados")
+        self.conexao.commit()
+        self.bytes_usados = 0
+
+    def fechar(self) -> None:
+        self._gravar_usos()
+        self.conexao.commit()
+        self.conexao.close()
+
+class CacheResultados:
+    """
+    Cache de resultados dos solucionadores, endereçado pelo conteúdo: a chave é
+    (impressão digital do labirinto, algoritmo, início, fim), então o mesmo labirinto
+    resolvido de novo (mesmo que carregado de outro arquivo) acerta o cache,
+    e uma grade alterada tem outra impressão digital e nunca recebe um resultado antigo.
+
+    A camada em memória é um LRU de até max_entradas resultados, devolvidos como cópias
+    (o caminho e as métricas do chamador podem ser alterados à vontade) com
+    `do_cache=True` nas métricas: o tempo_execucao é o da execução que gerou o resultado,
+    não uma medida nova. Com
+    `arquivo`, uma camada em disco (SQLite, caminhos com 2 bits por passo) guarda até
+    orcamento_disco_bytes e sobrevive entre execuções; acertos nela sobem para a memória.
+    """
+
+    def __init__(self, max_entradas: int = 1024, arquivo: Optional[str] = None,
+                 orcamento_disco_bytes: int = 256 * 2 ** 20):
+        self.max_entradas = max_entradas
+        self.memoria: "OrderedDict[ChaveResultado, ResultadoBusca]" = OrderedDict()
+        self.disco = CacheDisco(os.fspath(arquivo), orcamento_disco_bytes) if arquivo is not None else None
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    @staticmethod
+    def chave(impressao: str, resolver: Resolvedor, inicio: Posicao, fim: Posicao) -> ChaveResultado:
+        return impressao, nome_algoritmo(resolver), tuple(inicio), tuple(fim)
+
+    def _guardar_memoria(self, chave: ChaveResultado, resultado: ResultadoBusca) -> None:
+        self.memoria[chave] = resultado
+        self.memoria.move_to_end(chave)
+        while len(self.memoria) > self.max_entradas:
+            self.memoria.popitem(last=False)
+            self.descartes += 1
+
+    def obter(self, impressao: str, resolver: Resolvedor, inicio: Posicao, fim: Posicao) -> Optional[ResultadoBusca]:
+        """Retorna uma cópia do resultado guardado, ou None se não houver."""
+        chave = self.chave(impressao, resolver, inicio, fim)
+        resultado = self.memoria.get(chave)
+        if resultado is not None:
+            self.memoria.move_to_end(chave)
+            self.acertos_memoria += 1
+        else:
+            if self.disco is not None:
+                resultado = self.disco.obter(chave)
+            if resultado is None:
+                self.falhas += 1
+                return None
+            self._guardar_memoria(chave, resultado)
+            self.acertos_disco += 1
+        caminho, metricas = resultado
+        return (None if caminho is None else list(caminho)), dataclasses.replace(metricas, do_cache=True)
+
+    def guardar(self, impressao: str, resolver: Resolvedor, inicio: Posicao, fim: Posicao,
+                caminho: Optional[Caminho], metricas: MetricasBusca) -> None:
+        """Guarda (uma cópia de) o resultado nas duas camadas."""
+        chave = self.chave(impressao, resolver, inicio, fim)
+        resultado = (None if caminho is None else list(caminho)), dataclasses.replace(metricas, do_cache=False)
+        self._guardar_memoria(chave, resultado)
+        if self.disco is not None:
+            self.disco.guardar(chave, *resultado)
+
+    def resolver(self, resolver: Resolvedor, lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto],
+                 inicio: Posicao, fim: Posicao, impressao: Optional[str] = None) -> ResultadoBusca:
+        """
+        Retorna o resultado guardado de resolver(lab, inicio, fim) ou roda o solucionador
+        e guarda o resultado. `impressao` evita recalcular a impressão digital quando
+        quem chama já a tem (ex.: a da grade antes de compilar o grafo).
+        """
+        if impressao is None:
+            impressao = impressao_digital(lab)
+        resultado = self.obter(impressao, resolver, inicio, fim)
+        if resultado is not None:
+            return resultado
+        caminho, metricas = resolver(lab, inicio, fim)
+        self.guardar(impressao, resolver, inicio, fim, caminho, metricas)
+        return caminho, metricas
+
+    def limpar(self) -> None:
+        """Esvazia as duas camadas."""
+        self.memoria.clear()
+        if self.disco is not None:
+            self.disco.limpar()
+
+    def fechar(self) -> None:
+        """Fecha o arquivo da camada em disco."""
+        if self.disco is not None:
+            self.disco.fechar()
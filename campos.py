@@ -0,0 +1,177 @@
+import heapq
+import time
+import weakref
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto, como_grade
+from grafo import GrafoLabirinto, como_grafo, custos_de_entrada, impressao_digital, tipo_indice
+from algoritmos import MetricasBusca, coletar_metricas
+from instrumentacao import instrumentado
+
+# Direção do próximo passo rumo ao fim: direita, baixo, esquerda, cima (ou nenhuma)
+SEM_DIRECAO = 255
+
+class CampoDistancias:
+    """
+    Campo de distâncias até um fim fixo: distancia[v] é o custo mínimo de v até o fim
+    (-1 se inalcançável) e direcao[v] é o índice do passo (direita, baixo, esquerda,
+    cima) que leva ao vizinho seguinte num caminho mínimo. Com ele, qualquer início é
+    respondido em O(tamanho do caminho), sem nova busca.
+    """
+    __slots__ = ("altura", "largura", "destino", "distancia", "direcao")
+
+    def __init__(self, altura: int, largura: int, destino: int, distancia: array, direcao: bytearray):
+        self.altura = altura
+        self.largura = largura
+        self.destino = destino
+        self.distancia = distancia
+        self.direcao = direcao
+
+    @property
+    def tamanho_bytes(self) -> int:
+        """Memória ocupada pelos vetores do campo."""
+        return len(self.distancia) * self.distancia.itemsize + len(self.direcao)
+
+    def custo_ate_fim(self, pos: Posicao) -> Optional[int]:
+        """Custo mínimo de pos até o fim, ou None se não há caminho."""
+        custo = self.distancia[pos[0] * self.largura + pos[1]]
+        return custo if custo >= 0 else None
+
+    def caminho_de(self, inicio: Posicao) -> Optional[Caminho]:
+        """Segue o campo a partir de inicio até o fim."""
+        largura = self.largura
+        atual = inicio[0] * largura + inicio[1]
+        if self.distancia[atual] < 0:
+            return None
+        deslocamentos = (1, largura, -1, -largura)
+        direcao, destino = self.direcao, self.destino
+        caminho = [inicio]
+        while atual != destino:
+            atual += deslocamentos[direcao[atual]]
+            caminho.append(divmod(atual, largura))
+        return caminho
+
+def calcular_campo(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], fim: Posicao) -> CampoDistancias:
+    """
+    Dijkstra reverso a partir do fim, com os custos reais (CUSTO_BARREIRA ao entrar
+    em barreiras). Como o custo é pago ao entrar na célula, a aresta v -> atual custa
+    o custo de entrada de atual.
+    """
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos = grafo.inicio_vizinhos, grafo.vizinhos
+    largura, num_celulas = grafo.largura, grafo.num_celulas
+    custo_celula = custos_de_entrada(grafo)
+    destino = grafo.indice(fim)
+
+    distancia = array(tipo_indice(CUSTO_BARREIRA * num_celulas), [-1]) * num_celulas
+    direcao = bytearray([SEM_DIRECAO]) * num_celulas
+    distancia[destino] = 0
+    fila = [(0, destino)]
+    while fila:
+        d, atual = heapq.heappop(fila)
+        if d > distancia[atual]:
+            continue  # Entrada desatualizada
+        novo = d + custo_celula[atual]
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            anterior = vizinhos[k]
+            if distancia[anterior] < 0 or novo < distancia[anterior]:
+                distancia[anterior] = novo
+                # Passo de `anterior` até `atual` (vertical primeiro: com largura 1, ±1 é vertical)
+                passo = atual - anterior
+                direcao[anterior] = (1 if passo == largura else 3 if passo == -largura
+                                     else 0 if passo == 1 else 2)
+                heapq.heappush(fila, (novo, anterior))
+
+    return CampoDistancias(grafo.altura, largura, destino, distancia, direcao)
+
+class CacheCampos:
+    """
+    Cache LRU de campos de distâncias, com limite em bytes, indexado pela impressão
+    digital do labirinto e pelo fim. Uma grade alterada tem outra impressão digital,
+    então nunca recebe um campo antigo; além disso, ao notar que uma grade já vista
+    mudou, o cache descarta na hora os campos da versão anterior.
+    """
+
+    def __init__(self, orcamento_bytes: int = 64 * 2 ** 20):
+        self.orcamento_bytes = orcamento_bytes
+        self.campos: "OrderedDict[Tuple[str, int], CampoDistancias]" = OrderedDict()
+        self.bytes_usados = 0
+        # id(grade) -> (referência fraca à grade, impressão vista por último); a entrada
+        # some quando a grade é coletada, então um id reaproveitado nunca a encontra
+        self.ultima_impressao: Dict[int, Tuple[weakref.ref, str]] = {}
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def _impressao(self, lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto]) -> str:
+        impressao = impressao_digital(lab)
+        if isinstance(lab, GradeLabirinto):
+            chave = id(lab)
+            anterior = self.ultima_impressao.get(chave)
+            if anterior is not None and anterior[0]() is lab:
+                if anterior[1] != impressao:
+                    self.invalidar(anterior[1])
+                    self.ultima_impressao[chave] = (anterior[0], impressao)
+            else:
+                referencia = weakref.ref(lab, lambda ref, chave=chave: self._esquecer_grade(chave, ref))
+                self.ultima_impressao[chave] = (referencia, impressao)
+        return impressao
+
+    def _esquecer_grade(self, chave: int, referencia: weakref.ref) -> None:
+        entrada = self.ultima_impressao.get(chave)
+        if entrada is not None and entrada[0] is referencia:
+            del self.ultima_impressao[chave]
+
+    def campo(self, lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], fim: Posicao) -> CampoDistancias:
+        """Retorna o campo do fim, calculando-o (e guardando) se ainda não estiver no cache."""
+        if not isinstance(lab, GrafoLabirinto):
+            lab = como_grade(lab)
+        chave = (self._impressao(lab), fim[0] * lab.largura + fim[1])
+        campo = self.campos.get(chave)
+        if campo is not None:
+            self.campos.move_to_end(chave)
+            self.acertos += 1
+            return campo
+
+        self.falhas += 1
+        campo = calcular_campo(lab, fim)
+        if campo.tamanho_bytes <= self.orcamento_bytes:
+            self.campos[chave] = campo
+            self.bytes_usados += campo.tamanho_bytes
+            while self.bytes_usados > self.orcamento_bytes:
+                _, antigo = self.campos.popitem(last=False)
+                self.bytes_usados -= antigo.tamanho_bytes
+                self.descartes += 1
+        return campo
+
+    def invalidar(self, impressao: str) -> None:
+        """Descarta todos os campos de um labirinto (pela impressão digital)."""
+        for chave in [chave for chave in self.campos if chave[0] == impressao]:
+            self.bytes_usados -= self.campos.pop(chave).tamanho_bytes
+
+    def limpar(self) -> None:
+        """Esvazia o cache."""
+        self.campos.clear()
+        self.bytes_usados = 0
+        self.ultima_impressao.clear()
+
+@instrumentado
+def resolver_por_campo(cache: CacheCampos, lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto],
+                       inicio: Posicao, fim: Posicao) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Responde a consulta seguindo o campo de distâncias do fim (calculado uma única vez
+    por labirinto e fim). Retorna o caminho e as métricas, como os resolver_*.
+    """
+    tempo_inicio = time.time()
+    campo = cache.campo(lab, fim)
+    caminho = campo.caminho_de(inicio)
+    custo = campo.custo_ate_fim(inicio) or 0
+    tempo_fim = time.time()
+    metricas = coletar_metricas(
+        caminho, custo, len(caminho) if caminho else 0, tempo_inicio, tempo_fim,
+        inicio, fim, "Campo de Distâncias"
+    )
+    return caminho, metricas
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos do projeto se importam pelo nome (from grade import ...), sem pacote
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
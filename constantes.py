@@ -32,4 +32,21 @@ COR_DESTAQUE = Fore.LIGHTYELLOW_EX
 COR_ERRO = Fore.LIGHTRED_EX
 COR_SUCESSO = Fore.LIGHTGREEN_EX
 COR_INFO = Fore.LIGHTWHITE_EX
-RESET_COR = Style.RESET_ALL 
\ No newline at end of file
+RESET_COR = Style.RESET_ALL
+
+# Códigos compactos das células (um byte por célula na GradeLabirinto)
+CEL_CAMINHO = 0
+CEL_PAREDE = 1
+CEL_BARREIRA = 2
+CEL_MOEDA = 3
+CEL_INICIO = 4
+CEL_FIM = 5
+CEL_JOGADOR = 6
+CEL_SOLUCAO = 7
+CEL_VISITADO = 8
+
+# Caractere colorido usado para desenhar cada código (indexado pelo código)
+CARACTERES_CELULA = (
+    CAMINHO, PAREDE, BARREIRA, MOEDA, INICIO, FIM,
+    JOGADOR, CAMINHO_SOLUCAO, VISITADO_BUSCA
+)
@@ -0,0 +1,98 @@
+from array import array
+from typing import List
+
+# Quantos contextos livres ficam guardados para as próximas consultas
+MAX_CONTEXTOS_LIVRES = 4
+# Contextos maiores que isto (em células) não são guardados ao fim da busca: o próximo
+# labirinto gigante aloca os seus de novo, em vez de a memória ficar presa até o fim
+# do processo (com 4 vetores de 4 bytes, 2**22 células são 64 MiB por contexto)
+MAX_CELULAS_LIVRES = 2 ** 22
+# Maior geração representável nas marcas antes de recomeçar a contagem
+MAX_GERACAO = 2 ** 31 - 1
+
+def _tipo(tamanho: int) -> str:
+    """Typecode dos vetores: int de 32 bits enquanto índices e custos couberem."""
+    return "i" if tamanho < 2 ** 28 else "q"
+
+class ContextoBusca:
+    """
+    Estado de busca reutilizável entre consultas, em vetores planos (array de inteiros
+    de 32 bits, sem um objeto por célula) indexados pelo índice linear da célula: custo
+    acumulado (g), pai e as marcas de visitado e de fechado. Uma célula só tem custo e
+    pai válidos nesta consulta se marca[i] == geracao (e está fechada se
+    fechado[i] == geracao), então começar uma consulta nova é só incrementar a geração,
+    sem limpar nada e sem alocar dicionários por consulta.
+    """
+    __slots__ = ("tamanho", "geracao", "tipo", "marca", "fechado", "custo", "pai")
+
+    def __init__(self, tamanho: int):
+        self.tamanho = 0
+        self.geracao = 0
+        self.tipo = _tipo(tamanho)
+        self.marca = array("i")
+        self.fechado = array("i")
+        self.custo = array(self.tipo)
+        self.pai = array(self.tipo)
+        self.garantir(tamanho)
+
+    @property
+    def tamanho_bytes(self) -> int:
+        return sum(vetor.itemsize * len(vetor) for vetor in (self.marca, self.fechado, self.custo, self.pai))
+
+    def garantir(self, tamanho: int) -> None:
+        """Aumenta os vetores para caberem `tamanho` células (nunca diminui)."""
+        extra = tamanho - self.tamanho
+        if extra <= 0:
+            return
+        tipo = _tipo(tamanho)
+        if tipo != self.tipo:
+            self.custo = array(tipo, self.custo)
+            self.pai = array(tipo, self.pai)
+            self.tipo = tipo
+        self.marca.frombytes(bytes(4 * extra))
+        self.fechado.frombytes(bytes(4 * extra))
+        self.custo.frombytes(bytes(self.custo.itemsize * extra))
+        self.pai.extend(array(tipo, [-1]) * extra)
+        self.tamanho = tamanho
+
+    def nova_consulta(self) -> int:
+        """Começa uma consulta em O(1) (nova geração) e retorna a geração."""
+        if self.geracao >= MAX_GERACAO:
+            # As marcas acabariam: zera tudo (raro) e recomeça a contagem
+            vazio = bytes(4 * self.tamanho)
+            self.marca = array("i", vazio)
+            self.fechado = array("i", vazio)
+            self.geracao = 0
+        self.geracao += 1
+        return self.geracao
+
+# Contextos que não estão em uso por nenhuma busca
+_livres: List[ContextoBusca] = []
+
+def obter_contexto(tamanho: int) -> ContextoBusca:
+    """
+    Pega um contexto livre (ou cria um) com espaço para `tamanho` células e começa
+    uma consulta nova nele. Buscas simultâneas (ex.: duas formas passo a passo
+    intercaladas, ou as duas frentes da bidirecional) recebem contextos diferentes.
+    """
+    try:
+        contexto = _livres.pop()
+    except IndexError:
+        contexto = ContextoBusca(tamanho)
+    else:
+        contexto.garantir(tamanho)
+    contexto.nova_consulta()
+    return contexto
+
+def devolver_contexto(contexto: ContextoBusca) -> None:
+    """
+    Devolve o contexto para reutilização quando a busca termina. Uma busca abandonada
+    no meio simplesmente não devolve o seu, que é descartado pelo coletor de lixo;
+    contextos acima de MAX_CELULAS_LIVRES também são descartados.
+    """
+    if len(_livres) < MAX_CONTEXTOS_LIVRES and contexto.tamanho <= MAX_CELULAS_LIVRES:
+        _livres.append(contexto)
+
+def liberar_contextos() -> None:
+    """Descarta todos os contextos livres guardados."""
+    _livres.clear()
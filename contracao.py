@@ -0,0 +1,334 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto
+from grafo import GrafoLabirinto, como_grafo, custos_de_entrada, tipo_indice
+from algoritmos import MetricasBusca, resolver_a_estrela, resolver_jps
+from memoria_limitada import resolver_ida_estrela, resolver_sma_estrela
+from instrumentacao import instrumentado
+
+Resolvedor = Callable[..., Tuple[Optional[Caminho], MetricasBusca]]
+
+# Nós livres no fim do CSR para emendar início e fim que caem no meio de um corredor;
+# cada um ganha uma aresta para cada lado do corredor (a de trás e a da frente)
+NOS_EMENDA = 2
+ARESTAS_EMENDA = 2
+
+class GrafoJuncoes(GrafoLabirinto):
+    """
+    Grafo de junções: os corredores de largura 1 (células com exatamente dois vizinhos)
+    e os becos viram uma única aresta entre junções, com a soma dos custos de entrada
+    das células percorridas. As junções são renumeradas de 0 a num_juncoes - 1, na ordem
+    das células, com CSR próprio; celula_do_no leva cada nó à sua célula, o que basta
+    para as buscas calcularem a heurística de Manhattan.
+
+    Cada corredor c guarda suas células internas em
+    celulas_corredor[inicio_corredor[c]:inicio_corredor[c + 1]] (custos de entrada em
+    custo_corredor), na ordem de extremos_corredor[2c] para extremos_corredor[2c + 1];
+    lugar_da_celula[celula] é a posição da célula nesse vetor (-1 fora dos corredores).
+    Corredores paralelos e laços ficam cada um com suas arestas: a aresta k percorre o
+    corredor trecho_da_aresta[k] // 2, do primeiro extremo para o segundo se o trecho
+    for par e ao contrário se for ímpar.
+
+    Os últimos NOS_EMENDA nós ficam livres para emenda().
+    """
+    __slots__ = ("custo_no", "lugar_da_celula", "inicio_corredor", "celulas_corredor", "custo_corredor",
+                 "extremos_corredor", "trecho_da_aresta", "num_juncoes", "emendados", "ligacoes")
+
+    @property
+    def num_corredores(self) -> int:
+        return len(self.inicio_corredor) - 1
+
+    def celulas_do_corredor(self, corredor: int) -> List[int]:
+        """Células internas do corredor, do primeiro para o segundo extremo."""
+        return list(self.celulas_corredor[self.inicio_corredor[corredor]:self.inicio_corredor[corredor + 1]])
+
+    def corredor_da_celula(self, celula: int) -> int:
+        """Corredor que passa pela célula (-1 para junções e paredes)."""
+        lugar = self.lugar_da_celula[celula]
+        return -1 if lugar < 0 else bisect_right(self.inicio_corredor, lugar) - 1
+
+    def indice(self, pos: Posicao) -> int:
+        """Retorna o nó de uma junção ou de uma posição emendada."""
+        celula = pos[0] * self.largura + pos[1]
+        no = bisect_left(self.celula_do_no, celula, 0, self.num_juncoes)
+        if no < self.num_juncoes and self.celula_do_no[no] == celula:
+            return no
+        if celula in self.emendados:
+            return self.emendados[celula]
+        raise ValueError(f"Posição {pos} não é uma junção (use emenda para início e fim)")
+
+    def posicao(self, indice: int) -> Posicao:
+        """Retorna a posição (linha, coluna) da célula de um nó."""
+        return divmod(self.celula_do_no[indice], self.largura)
+
+    def custo_aresta(self, origem: int, destino: int) -> int:
+        """Retorna o custo da aresta mais barata de origem até destino."""
+        melhor = self._aresta_mais_barata(origem, destino)
+        if melhor < 0:
+            raise ValueError(f"Nós {self.posicao(origem)} e {self.posicao(destino)} não são vizinhos")
+        return self.custos[melhor]
+
+    def reconstruir_caminho(self, veio_de: Dict[int, int], destino: int) -> Caminho:
+        """Reconstrói o caminho de junções seguindo os pais (-1 marca a origem)."""
+        caminho = []
+        atual = destino
+        while atual != -1:
+            caminho.append(self.posicao(atual))
+            atual = veio_de[atual]
+        caminho.reverse()
+        return caminho
+
+    def _aresta_mais_barata(self, origem: int, destino: int) -> int:
+        melhor = -1
+        for k in range(self.inicio_vizinhos[origem], self.inicio_vizinhos[origem + 1]):
+            if self.vizinhos[k] == destino and (melhor < 0 or self.custos[k] < self.custos[melhor]):
+                melhor = k
+        return melhor
+
+    def _emendar_corredor(self, corredor: int, celulas: List[int], salvos: List[Tuple[int, int, int]]) -> None:
+        """
+        Divide o corredor nas células emendadas (em ordem no corredor): a aresta do
+        primeiro extremo passa a chegar na primeira delas, a do segundo extremo na
+        última, e cada emendada liga-se às vizinhas pelas suas arestas livres.
+        """
+        inicio_vizinhos, vizinhos, custos = self.inicio_vizinhos, self.vizinhos, self.custos
+        primeira, ultima = self.inicio_corredor[corredor], self.inicio_corredor[corredor + 1]
+        ponta_a, ponta_b = self.extremos_corredor[2 * corredor], self.extremos_corredor[2 * corredor + 1]
+        nos = [ponta_a] + [self.emendados[celula] for celula in celulas] + [ponta_b]
+        cortes = [primeira - 1] + [self.lugar_da_celula[celula] for celula in celulas] + [ultima]
+        custo_no = [self.custo_no[ponta_a]] + [self.custo_corredor[lugar] for lugar in cortes[1:-1]] + \
+                   [self.custo_no[ponta_b]]
+
+        def aresta_do_trecho(no: int, trecho: int) -> int:
+            for k in range(inicio_vizinhos[no], inicio_vizinhos[no + 1]):
+                if self.trecho_da_aresta[k] == trecho:
+                    return k
+            raise ValueError(f"Corredor {corredor} sem aresta no nó {no}")
+
+        # (nó de saída, chegada) -> [(aresta, custo, células internas)]
+        escritas: Dict[Tuple[int, int], List[Tuple[int, int, List[int]]]] = {}
+        for i in range(len(nos) - 1):
+            de, para = nos[i], nos[i + 1]
+            internas = list(self.celulas_corredor[cortes[i] + 1:cortes[i + 1]])
+            soma = sum(self.custo_corredor[cortes[i] + 1:cortes[i + 1]])
+            ida = aresta_do_trecho(de, 2 * corredor) if i == 0 else inicio_vizinhos[de] + 1
+            volta = aresta_do_trecho(para, 2 * corredor + 1) if i == len(nos) - 2 else inicio_vizinhos[para]
+            escritas.setdefault((de, para), []).append((ida, soma + custo_no[i + 1], internas))
+            escritas.setdefault((para, de), []).append((volta, soma + custo_no[i], internas[::-1]))
+
+        # Num laço as duas voltas ligam os mesmos nós: a mais barata fica na primeira
+        # aresta, como nos corredores paralelos
+        for (_, para), arestas in escritas.items():
+            for k, (_, custo, internas) in zip(sorted(k for k, _, _ in arestas),
+                                               sorted(arestas, key=lambda aresta: aresta[1])):
+                salvos.append((k, vizinhos[k], custos[k]))
+                vizinhos[k] = para
+                custos[k] = custo
+                self.ligacoes[k] = internas
+
+    @contextmanager
+    def emenda(self, inicio: Posicao, fim: Posicao) -> Iterator["GrafoJuncoes"]:
+        """
+        Dentro do bloco, início e fim que não forem junções ocupam os nós livres do fim
+        do CSR. Os que caem no meio de um corredor ficam ligados às pontas dele (ou um
+        ao outro, se dividirem o mesmo corredor): as duas arestas do corredor passam a
+        chegar neles, e o resto do grafo não é tocado. As arestas escritas são
+        restauradas na saída; o grafo atende uma emenda por vez.
+        """
+        if self.emendados:
+            raise ValueError("O grafo de junções já está emendado para outra consulta")
+        salvos: List[Tuple[int, int, int]] = []
+        try:
+            por_corredor: Dict[int, List[int]] = {}
+            livre = self.num_juncoes
+            for linha, coluna in dict.fromkeys((tuple(inicio), tuple(fim))):
+                celula = linha * self.largura + coluna
+                if self.lugar_da_celula[celula] < 0:
+                    no = bisect_left(self.celula_do_no, celula, 0, self.num_juncoes)
+                    if no < self.num_juncoes and self.celula_do_no[no] == celula:
+                        continue  # Já é uma junção
+                self.emendados[celula] = livre
+                self.celula_do_no[livre] = celula
+                livre += 1
+                corredor = self.corredor_da_celula(celula)
+                if corredor >= 0:  # Fora de corredores (paredes), o nó fica isolado
+                    por_corredor.setdefault(corredor, []).append(celula)
+            for corredor, celulas in por_corredor.items():
+                celulas.sort(key=self.lugar_da_celula.__getitem__)
+                self._emendar_corredor(corredor, celulas, salvos)
+            self.marcar_modificado()
+            yield self
+        finally:
+            for k, vizinho, custo in reversed(salvos):
+                self.vizinhos[k] = vizinho
+                self.custos[k] = custo
+            for no in self.emendados.values():
+                self.celula_do_no[no] = -1
+            self.emendados.clear()
+            self.ligacoes.clear()
+            self.marcar_modificado()
+
+    def expandir_caminho(self, caminho: Caminho) -> Caminho:
+        """Converte um caminho de junções (e emendas) em um caminho célula a célula."""
+        if not caminho:
+            return caminho
+        largura = self.largura
+        expandido = [caminho[0]]
+        for anterior, proximo in zip(caminho, caminho[1:]):
+            k = self._aresta_mais_barata(self.indice(anterior), self.indice(proximo))
+            if k < 0:
+                raise ValueError(f"Células {anterior} e {proximo} não são ligadas por um corredor")
+            internas = self.ligacoes.get(k)
+            if internas is None:
+                trecho = self.trecho_da_aresta[k]
+                internas = self.celulas_do_corredor(trecho // 2)
+                if trecho % 2:
+                    internas.reverse()
+            expandido.extend(divmod(celula, largura) for celula in internas)
+            expandido.append(proximo)
+        return expandido
+
+def contrair_grafo(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto]) -> GrafoJuncoes:
+    """
+    Contrai corredores e becos do labirinto em um grafo de junções.
+
+    Junções são as células abertas com grau diferente de 2 (becos e bifurcações); cada
+    corredor entre duas junções vira uma aresta por sentido, com custo igual à soma dos
+    custos de entrada das células internas mais o da junção de chegada. Laços sem
+    nenhuma junção ganham uma junção artificial.
+    """
+    grafo = como_grafo(lab)
+    inicio_vizinhos, vizinhos = grafo.inicio_vizinhos, grafo.vizinhos
+    num_celulas = grafo.num_celulas
+    custo_celula = custos_de_entrada(grafo)
+    tipo = tipo_indice(num_celulas)
+
+    juncao = bytearray(num_celulas)
+    for idx in range(num_celulas):
+        if custo_celula[idx] and inicio_vizinhos[idx + 1] - inicio_vizinhos[idx] != 2:
+            juncao[idx] = 1
+
+    lugar_da_celula = array(tipo, [-1]) * num_celulas
+    inicio_corredor = array(tipo, [0])
+    celulas_corredor = array(tipo)
+    custo_corredor = bytearray()
+    extremos_corredor = array(tipo)
+    # Arestas que saem de cada junção: (célula de chegada, custo, trecho)
+    saidas: Dict[int, List[Tuple[int, int, int]]] = {}
+
+    def percorrer(origem: int, primeira: int) -> None:
+        """Segue o corredor que sai de origem por `primeira` até a próxima junção."""
+        corredor = len(inicio_corredor) - 1
+        anterior, atual = origem, primeira
+        soma = 0
+        while not juncao[atual]:
+            lugar_da_celula[atual] = len(celulas_corredor)
+            celulas_corredor.append(atual)
+            custo_corredor.append(custo_celula[atual])
+            soma += custo_celula[atual]
+            k = inicio_vizinhos[atual]
+            proxima = vizinhos[k] if vizinhos[k] != anterior else vizinhos[k + 1]
+            anterior, atual = atual, proxima
+        inicio_corredor.append(len(celulas_corredor))
+        extremos_corredor.extend((origem, atual))
+        saidas.setdefault(origem, []).append((atual, soma + custo_celula[atual], 2 * corredor))
+        saidas.setdefault(atual, []).append((origem, soma + custo_celula[origem], 2 * corredor + 1))
+
+    def contrair_a_partir(juncao_atual: int) -> None:
+        for k in range(inicio_vizinhos[juncao_atual], inicio_vizinhos[juncao_atual + 1]):
+            viz = vizinhos[k]
+            if juncao[viz]:
+                if juncao_atual < viz:  # Junções vizinhas: um corredor sem células internas
+                    percorrer(juncao_atual, viz)
+            elif lugar_da_celula[viz] < 0:
+                percorrer(juncao_atual, viz)
+
+    for idx in range(num_celulas):
+        if juncao[idx]:
+            contrair_a_partir(idx)
+    # O que sobrou são ciclos sem junção: promove uma célula de cada um
+    for idx in range(num_celulas):
+        if custo_celula[idx] and not juncao[idx] and lugar_da_celula[idx] < 0:
+            juncao[idx] = 1
+            contrair_a_partir(idx)
+
+    # Renumera as junções na ordem das células
+    celula_do_no = array(tipo)
+    custo_no = bytearray()
+    no_da_juncao: Dict[int, int] = {}
+    for idx in range(num_celulas):
+        if juncao[idx]:
+            no_da_juncao[idx] = len(celula_do_no)
+            celula_do_no.append(idx)
+            custo_no.append(custo_celula[idx])
+    num_juncoes = len(celula_do_no)
+    for extremo in range(len(extremos_corredor)):
+        extremos_corredor[extremo] = no_da_juncao[extremos_corredor[extremo]]
+
+    # Monta o CSR das junções, seguido dos nós livres para as emendas
+    tipo_custo = tipo_indice(CUSTO_BARREIRA * num_celulas)
+    novo_inicio = array(tipo, [0])
+    novos_vizinhos = array(tipo)
+    novos_custos = array(tipo_custo)
+    trecho_da_aresta = array(tipo)
+    for celula in celula_do_no:
+        # Mais baratas primeiro: entre corredores paralelos, as buscas que ficam com a
+        # primeira aresta que chega a um nó (DFS, gulosa) pegam o mesmo que expandir_caminho
+        for para, custo, trecho in sorted(saidas.get(celula, ()), key=lambda saida: saida[1]):
+            novos_vizinhos.append(no_da_juncao[para])
+            novos_custos.append(custo)
+            trecho_da_aresta.append(trecho)
+        novo_inicio.append(len(novos_vizinhos))
+    for livre in range(num_juncoes, num_juncoes + NOS_EMENDA):
+        # Laços de custo 0 enquanto o nó não é usado: inofensivos para as buscas
+        novos_vizinhos.extend([livre] * ARESTAS_EMENDA)
+        novos_custos.extend([0] * ARESTAS_EMENDA)
+        trecho_da_aresta.extend([-1] * ARESTAS_EMENDA)
+        novo_inicio.append(len(novos_vizinhos))
+        celula_do_no.append(-1)
+
+    contraido = GrafoJuncoes(grafo.altura, grafo.largura, novo_inicio, novos_vizinhos, novos_custos)
+    contraido.celula_do_no = celula_do_no
+    contraido.custo_no = custo_no
+    contraido.lugar_da_celula = lugar_da_celula
+    contraido.inicio_corredor = inicio_corredor
+    contraido.celulas_corredor = celulas_corredor
+    contraido.custo_corredor = custo_corredor
+    contraido.extremos_corredor = extremos_corredor
+    contraido.trecho_da_aresta = trecho_da_aresta
+    contraido.num_juncoes = num_juncoes
+    contraido.emendados = {}
+    contraido.ligacoes = {}
+    return contraido
+
+@instrumentado
+def resolver_contraido(grafo: GrafoJuncoes, inicio: Posicao, fim: Posicao,
+                       resolver: Resolvedor = resolver_a_estrela,
+                       **opcoes) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Resolve no grafo de junções e devolve o caminho célula a célula, pronto para
+    marcar_caminho_no_labirinto. Início e fim no meio de corredores são emendados
+    na hora; o custo é o mesmo da busca na grade.
+
+    Args:
+        grafo: Grafo criado por contrair_grafo
+        inicio: Posição de início
+        fim: Posição de fim
+        resolver: Qualquer resolver_* de algoritmos.py que aceite um grafo
+        **opcoes: Repassadas ao resolver (ex.: tipo_fronteira)
+    """
+    if resolver is resolver_jps:
+        raise ValueError("JPS depende da geometria da grade e não roda no grafo de junções")
+    if resolver in (resolver_ida_estrela, resolver_sma_estrela):
+        raise ValueError("As buscas com memória limitada numeram os nós pela célula e não rodam no grafo de junções")
+    with grafo.emenda(inicio, fim):
+        caminho, metricas = resolver(grafo, inicio, fim, **opcoes)
+        if caminho is None:
+            return None, metricas
+        caminho = grafo.expandir_caminho(caminho)
+    return caminho, replace(metricas, comprimento_caminho=len(caminho))
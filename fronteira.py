@@ -0,0 +1,318 @@
+import heapq
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from contexto import ContextoBusca
+from instrumentacao import sessao_ativa
+
+# Prioridade: número ou tupla comparável (ex.: (f, g)); empates são desfeitos pelo item,
+# como nas tuplas (prioridade..., item) usadas antes com heapq.
+Prioridade = Any
+
+class FronteiraHeap:
+    """
+    Heap binário com remoção preguiçosa: melhorar a prioridade de um item só insere
+    uma nova entrada, e as antigas são descartadas na remoção graças ao conjunto de
+    fechados (itens já removidos). Exige que um item removido não precise ser reaberto,
+    o que vale para Dijkstra e para o A* com heurística consistente.
+    Com um ContextoBusca (itens inteiros), os fechados são marcados na lista do contexto
+    em vez de num conjunto novo por consulta.
+    """
+
+    def __init__(self, contexto: Optional[ContextoBusca] = None):
+        self.heap: List[Tuple[Prioridade, Hashable]] = []
+        self.fechados = set() if contexto is None else None
+        self.fechado = None if contexto is None else contexto.fechado
+        self.geracao = 0 if contexto is None else contexto.geracao
+        self.insercoes = 0
+        self.remocoes = 0
+        self.remocoes_obsoletas = 0
+
+    def _descartar_obsoletas(self) -> None:
+        """Tira do topo as entradas de itens já fechados."""
+        heap = self.heap
+        if self.fechado is not None:
+            fechado, geracao = self.fechado, self.geracao
+            while heap and fechado[heap[0][1]] == geracao:
+                heapq.heappop(heap)
+                self.remocoes_obsoletas += 1
+            return
+        fechados = self.fechados
+        while heap and heap[0][1] in fechados:
+            heapq.heappop(heap)
+            self.remocoes_obsoletas += 1
+
+    def inserir(self, prioridade: Prioridade, item: Hashable) -> None:
+        """Insere o item (ou uma prioridade melhor para ele)."""
+        heapq.heappush(self.heap, (prioridade, item))
+        self.insercoes += 1
+
+    def remover(self) -> Tuple[Prioridade, Hashable]:
+        """Remove e retorna (prioridade, item) com a menor prioridade, fechando o item."""
+        heap = self.heap
+        prioridade, item = heapq.heappop(heap)
+        fechado = self.fechado
+        if fechado is not None:
+            geracao = self.geracao
+            while fechado[item] == geracao:
+                self.remocoes_obsoletas += 1
+                prioridade, item = heapq.heappop(heap)
+            fechado[item] = geracao
+        else:
+            fechados = self.fechados
+            while item in fechados:
+                self.remocoes_obsoletas += 1
+                prioridade, item = heapq.heappop(heap)
+            fechados.add(item)
+        self.remocoes += 1
+        return prioridade, item
+
+    def menor_prioridade(self) -> Optional[Prioridade]:
+        """Retorna a menor prioridade válida sem remover (None se vazia)."""
+        self._descartar_obsoletas()
+        return self.heap[0][0] if self.heap else None
+
+    def __bool__(self) -> bool:
+        heap = self.heap
+        if heap:
+            item = heap[0][1]
+            if (self.fechado[item] == self.geracao if self.fechado is not None
+                    else item in self.fechados):
+                self._descartar_obsoletas()
+        return bool(heap)
+
+    def __len__(self) -> int:
+        """Número de entradas guardadas (pode incluir obsoletas)."""
+        return len(self.heap)
+
+class FronteiraHeapIndexado:
+    """
+    Heap binário indexado com decrease-key: cada item tem no máximo uma entrada,
+    e melhorar a prioridade sobe a entrada existente no lugar de duplicá-la.
+    Nunca há remoções obsoletas, ao custo de manter o índice de posições. Não usa
+    fechados, então o ContextoBusca é aceito só por compatibilidade.
+    """
+
+    def __init__(self, contexto: Optional[ContextoBusca] = None):
+        self.heap: List[Tuple[Prioridade, Hashable]] = []
+        self.posicoes: Dict[Hashable, int] = {}
+        self.insercoes = 0
+        self.remocoes = 0
+        self.remocoes_obsoletas = 0
+
+    def _subir(self, i: int) -> None:
+        heap, posicoes = self.heap, self.posicoes
+        entrada = heap[i]
+        while i > 0:
+            pai = (i - 1) >> 1
+            if heap[pai] <= entrada:
+                break
+            heap[i] = heap[pai]
+            posicoes[heap[i][1]] = i
+            i = pai
+        heap[i] = entrada
+        posicoes[entrada[1]] = i
+
+    def _descer(self, i: int) -> None:
+        heap, posicoes = self.heap, self.posicoes
+        tamanho = len(heap)
+        entrada = heap[i]
+        while True:
+            filho = 2 * i + 1
+            if filho >= tamanho:
+                break
+            if filho + 1 < tamanho and heap[filho + 1] < heap[filho]:
+                filho += 1
+            if entrada <= heap[filho]:
+                break
+            heap[i] = heap[filho]
+            posicoes[heap[i][1]] = i
+            i = filho
+        heap[i] = entrada
+        posicoes[entrada[1]] = i
+
+    def inserir(self, prioridade: Prioridade, item: Hashable) -> None:
+        """Insere o item ou diminui sua prioridade; prioridades piores são ignoradas."""
+        i = self.posicoes.get(item)
+        if i is None:
+            self.heap.append((prioridade, item))
+            self._subir(len(self.heap) - 1)
+        elif prioridade < self.heap[i][0]:
+            self.heap[i] = (prioridade, item)
+            self._subir(i)
+        else:
+            return
+        self.insercoes += 1
+
+    def remover(self) -> Tuple[Prioridade, Hashable]:
+        """Remove e retorna (prioridade, item) com a menor prioridade."""
+        heap = self.heap
+        topo = heap[0]
+        ultimo = heap.pop()
+        del self.posicoes[topo[1]]
+        if heap:
+            heap[0] = ultimo
+            self._descer(0)
+        self.remocoes += 1
+        return topo
+
+    def menor_prioridade(self) -> Optional[Prioridade]:
+        """Retorna a menor prioridade sem remover (None se vazia)."""
+        return self.heap[0][0] if self.heap else None
+
+    def __bool__(self) -> bool:
+        return bool(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+class FronteiraBaldes:
+    """
+    Fila de baldes (algoritmo de Dial) para prioridades inteiras pequenas, como as
+    somas de CUSTO_NORMAL e CUSTO_BARREIRA. Inserir e remover custam O(1) mais o avanço
+    do cursor sobre baldes vazios. Em prioridades tupla, só o primeiro elemento escolhe
+    o balde e, dentro dele, o último inserido sai primeiro. O cursor volta quando chega
+    uma prioridade menor, então também serve para filas não monotônicas (ex.: Gulosa).
+    Entradas obsoletas são descartadas pelos fechados, como em FronteiraHeap (inclusive
+    marcados no ContextoBusca, se houver).
+    """
+
+    def __init__(self, contexto: Optional[ContextoBusca] = None):
+        self.baldes: Dict[int, List[Tuple[Prioridade, Hashable]]] = {}
+        self.cursor = 0
+        self.tamanho = 0
+        self.fechados = set() if contexto is None else None
+        self.fechado = None if contexto is None else contexto.fechado
+        self.geracao = 0 if contexto is None else contexto.geracao
+        self.insercoes = 0
+        self.remocoes = 0
+        self.remocoes_obsoletas = 0
+
+    def _avancar(self) -> Optional[List[Tuple[Prioridade, Hashable]]]:
+        """Posiciona o cursor no primeiro balde com entrada válida e o retorna."""
+        baldes, fechados = self.baldes, self.fechados
+        fechado, geracao = self.fechado, self.geracao
+        while self.tamanho:
+            balde = baldes.get(self.cursor)
+            while balde:
+                item = balde[-1][1]
+                if (fechado[item] != geracao) if fechado is not None else (item not in fechados):
+                    return balde
+                balde.pop()
+                self.tamanho -= 1
+                self.remocoes_obsoletas += 1
+            if balde is not None:
+                del baldes[self.cursor]
+            if self.tamanho:
+                self.cursor += 1
+        return None
+
+    def inserir(self, prioridade: Prioridade, item: Hashable) -> None:
+        """Insere o item no balde da sua prioridade."""
+        chave = prioridade[0] if isinstance(prioridade, tuple) else prioridade
+        if not self.tamanho or chave < self.cursor:
+            self.cursor = chave
+        balde = self.baldes.get(chave)
+        if balde is None:
+            self.baldes[chave] = [(prioridade, item)]
+        else:
+            balde.append((prioridade, item))
+        self.tamanho += 1
+        self.insercoes += 1
+
+    def remover(self) -> Tuple[Prioridade, Hashable]:
+        """Remove e retorna (prioridade, item) do menor balde, fechando o item."""
+        balde = self._avancar()
+        if balde is None:
+            raise IndexError("remover de uma fronteira vazia")
+        prioridade, item = balde.pop()
+        self.tamanho -= 1
+        if self.fechado is not None:
+            self.fechado[item] = self.geracao
+        else:
+            self.fechados.add(item)
+        self.remocoes += 1
+        return prioridade, item
+
+    def menor_prioridade(self) -> Optional[Prioridade]:
+        """Retorna a chave do menor balde com entrada válida (None se vazia)."""
+        return self.cursor if self._avancar() is not None else None
+
+    def __bool__(self) -> bool:
+        return self._avancar() is not None
+
+    def __len__(self) -> int:
+        """Número de entradas guardadas (pode incluir obsoletas)."""
+        return self.tamanho
+
+class FronteiraInstrumentada:
+    """
+    Envolve outra fronteira contando o pico de entradas guardadas (incluindo obsoletas)
+    e as reexpansões (itens removidos mais de uma vez). criar_fronteira só a usa com a
+    instrumentação ligada, então as buscas normais não pagam por essas contagens.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.pico = 0
+        self.reexpansoes = 0
+        self.removidos = set()
+
+    @property
+    def insercoes(self) -> int:
+        return self.base.insercoes
+
+    @property
+    def remocoes(self) -> int:
+        return self.base.remocoes
+
+    @property
+    def remocoes_obsoletas(self) -> int:
+        return self.base.remocoes_obsoletas
+
+    def inserir(self, prioridade: Prioridade, item: Hashable) -> None:
+        base = self.base
+        base.inserir(prioridade, item)
+        if len(base) > self.pico:
+            self.pico = len(base)
+
+    def remover(self) -> Tuple[Prioridade, Hashable]:
+        prioridade, item = self.base.remover()
+        if item in self.removidos:
+            self.reexpansoes += 1
+        else:
+            self.removidos.add(item)
+        return prioridade, item
+
+    def menor_prioridade(self) -> Optional[Prioridade]:
+        return self.base.menor_prioridade()
+
+    def __bool__(self) -> bool:
+        return bool(self.base)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+# Backends disponíveis para os algoritmos de busca
+FRONTEIRAS = {
+    "heap": FronteiraHeap,
+    "heap_indexado": FronteiraHeapIndexado,
+    "baldes": FronteiraBaldes,
+}
+
+def criar_fronteira(tipo: str, contexto: Optional[ContextoBusca] = None):
+    """
+    Cria uma fronteira vazia do tipo pedido ("heap", "heap_indexado" ou "baldes"),
+    marcando os fechados no `contexto` se ele for informado (itens inteiros).
+    Dentro de uma busca instrumentada, ela vem envolvida por FronteiraInstrumentada.
+    """
+    try:
+        fronteira = FRONTEIRAS[tipo](contexto)
+    except KeyError:
+        raise ValueError(
+            f"Fronteira desconhecida: {tipo!r} (opções: {', '.join(FRONTEIRAS)})"
+        ) from None
+    sessao = sessao_ativa()
+    if sessao is not None and sessao.medindo:
+        fronteira = FronteiraInstrumentada(fronteira)
+        sessao.fronteiras.append(fronteira)
+    return fronteira
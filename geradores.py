@@ -0,0 +1,438 @@
+import random
+import re
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from constantes import *
+from grade import GradeLabirinto, Posicao
+from arquivo import escrever_linhas
+
+EsculpirLabirinto = Callable[[GradeLabirinto, random.Random], None]
+
+# Tabelas de tradução de bytes aleatórios (bit menos significativo decide)
+TABELA_BIT = bytes(b & 1 for b in range(256))
+TABELA_ABRE_SE_UM = bytes([CEL_PAREDE, CEL_CAMINHO]) * 128
+TABELA_ABRE_SE_ZERO = bytes([CEL_CAMINHO, CEL_PAREDE]) * 128
+
+def bytes_aleatorios(rng: random.Random, quantidade: int) -> bytes:
+    """Sorteia `quantidade` bytes usando o gerador informado."""
+    if quantidade <= 0:
+        return b""
+    return rng.getrandbits(8 * quantidade).to_bytes(quantidade, "little")
+
+def dimensoes_malha(lab: GradeLabirinto) -> tuple:
+    """Retorna quantas linhas e colunas de células (posições ímpares internas) cabem na grade."""
+    return (lab.altura - 1) // 2, (lab.largura - 1) // 2
+
+def abrir_celulas_malha(lab: GradeLabirinto) -> None:
+    """Abre todas as células (ímpar, ímpar) da malha, deixando os muros entre elas fechados."""
+    linhas, colunas = dimensoes_malha(lab)
+    abertas = bytes([CEL_CAMINHO]) * colunas
+    for r in range(linhas):
+        inicio = (2 * r + 1) * lab.largura + 1
+        lab.celulas[inicio:inicio + 2 * colunas:2] = abertas
+
+# Peso de cada vizinha na chave de abrir_paredes_linha (1 por caminho, 5 por parede)
+TABELA_PESO_VIZINHA = bytes(1 if b == CEL_CAMINHO else 5 if b == CEL_PAREDE else 0 for b in range(256))
+TABELA_E_PAREDE = bytes(int(b == CEL_PAREDE) for b in range(256))
+
+def _classe_parede(chave: int) -> int:
+    """
+    Classe de uma célula de abrir_paredes_linha pela chave
+    caminhos + 5 * paredes vizinhas + 25 * (é parede) + 50 * (passou no sorteio):
+    0 = não abre, 1 = abre mesmo se a vizinha da esquerda abrir, 2 = abre só se ela não abrir.
+    """
+    sorteada, resto = divmod(chave, 50)
+    parede, resto = divmod(resto, 25)
+    paredes, caminhos = divmod(resto, 5)
+    if not (sorteada and parede and paredes >= 2 and caminhos <= 2):
+        return 0
+    # A vizinha da esquerda que abre vira um caminho a mais e uma parede a menos
+    return 1 if paredes >= 3 and caminhos <= 1 else 2
+
+TABELA_CLASSE_PAREDE = bytes(_classe_parede(chave) if chave < 100 else 0 for chave in range(256))
+# Numa sequência de classes, cada 2 logo depois de uma célula que abriu fica fechada
+PADRAO_FECHA_APOS_ABRIR = re.compile(b"[\x01\x02]\x02")
+TABELA_ABRIU = bytes(int(b in (1, 2)) for b in range(256))
+
+def _inteiro(dados: bytes) -> int:
+    return int.from_bytes(dados, "little")
+
+def sortear_mascara(rng: random.Random, quantidade: int, chance: float) -> int:
+    """
+    Faz `quantidade` sorteios independentes com probabilidade `chance` (resolução de 1/65536)
+    e retorna o resultado como inteiro com um byte 0/1 por sorteio (little-endian).
+    """
+    limite = min(max(round(chance * 65536), 0), 65536)
+    alto, baixo = divmod(limite, 256)
+    sorteados = bytes_aleatorios(rng, 2 * quantidade)
+    altos, baixos = sorteados[:quantidade], sorteados[quantidade:]
+    # Passa se o byte alto é menor que `alto`, ou igual a ele com o byte baixo menor que `baixo`
+    tabela_igual = bytearray(256)
+    if alto < 256:
+        tabela_igual[alto] = 1
+    menor = _inteiro(altos.translate(bytes([1]) * alto + bytes(256 - alto)))
+    igual = _inteiro(altos.translate(tabela_igual))
+    baixo_menor = _inteiro(baixos.translate(bytes([1]) * baixo + bytes(256 - baixo)))
+    return menor | (igual & baixo_menor)
+
+def sortear_celulas(lab: GradeLabirinto, codigo: int, chance: float, rng: random.Random) -> List[int]:
+    """
+    Índices lineares, em ordem crescente, das células com `codigo` que passam num sorteio
+    com probabilidade `chance`. Sorteio e filtro são feitos por blocos com operações sobre
+    bytes; só as células escolhidas passam por código Python.
+    """
+    tabela = bytes(int(b == codigo) for b in range(256))
+    escolhidas = []
+    bloco = 1 << 20
+    for base in range(0, len(lab.celulas), bloco):
+        trecho = bytes(lab.celulas[base:base + bloco])
+        mascara = _inteiro(trecho.translate(tabela)) & sortear_mascara(rng, len(trecho), chance)
+        marcadas = mascara.to_bytes(len(trecho), "little")
+        idx = marcadas.find(1)
+        while idx != -1:
+            escolhidas.append(base + idx)
+            idx = marcadas.find(1, idx + 1)
+    return escolhidas
+
+def abrir_paredes_linha(acima, atual, abaixo, chance_remover_parede: float,
+                        rng: random.Random) -> None:
+    """
+    Aplica a regra de adicionar_caminhos_extras a uma linha interna.
+    `atual` é modificada no lugar; `acima` já deve estar processada e `abaixo` ainda não,
+    exatamente como na varredura linha a linha do labirinto inteiro.
+    
+    A linha inteira é tratada de uma vez, sem laço por célula: as contagens de vizinhos
+    são somas de máscaras como inteiros (um byte por célula, sem vai-um), a classe de
+    cada célula sai de uma tabela de tradução, e a única dependência sequencial (a
+    vizinha da esquerda pode ter acabado de abrir) é resolvida por uma substituição
+    de expressão regular sobre as classes.
+    """
+    n = len(atual)
+    if n < 3:
+        return
+    atual = memoryview(atual)
+    linha = bytes(atual)
+    vizinhas = (linha[2:], bytes(abaixo[1:n - 1]), linha[:n - 2], bytes(acima[1:n - 1]))
+    meio = linha[1:n - 1]
+    chave = (sum(_inteiro(v.translate(TABELA_PESO_VIZINHA)) for v in vizinhas)
+             + 25 * _inteiro(meio.translate(TABELA_E_PAREDE))
+             + 50 * sortear_mascara(rng, n - 2, chance_remover_parede))
+    classes = chave.to_bytes(n - 2, "little").translate(TABELA_CLASSE_PAREDE)
+    abertas = _inteiro(PADRAO_FECHA_APOS_ABRIR.sub(b"\x01\x00", classes).translate(TABELA_ABRIU))
+    if abertas:
+        nova = _inteiro(meio) + abertas * (CEL_CAMINHO - CEL_PAREDE)
+        atual[1:n - 1] = nova.to_bytes(n - 2, "little")
+
+def esculpir_prim(lab: GradeLabirinto, rng: random.Random) -> None:
+    """
+    Algoritmo de Prim com muros fronteira sorteados.
+    A remoção do muro sorteado troca-o com o último da lista, em O(1).
+    """
+    altura, largura, celulas = lab.altura, lab.largura, lab.celulas
+
+    # Escolhe uma célula inicial (sempre em posição ímpar para manter a estrutura)
+    lin_atual = rng.randrange(1, altura - 1, 2)
+    col_atual = rng.randrange(1, largura - 1, 2)
+    celulas[lin_atual * largura + col_atual] = CEL_CAMINHO
+
+    # Lista de muros fronteira (muro, célula_adjacente) em índices lineares
+    muros_fronteira = []
+
+    def adicionar_muros_fronteira(lin: int, col: int) -> None:
+        """Adiciona muros adjacentes à célula atual à lista de fronteira."""
+        for dl, dc in ((0, 2), (2, 0), (0, -2), (-2, 0)):  # direita, baixo, esquerda, cima
+            lin_adj = lin + dl
+            col_adj = col + dc
+            if 0 <= lin_adj < altura and 0 <= col_adj < largura:
+                # O muro está entre a célula atual e a adjacente
+                muro = (lin + dl // 2) * largura + col + dc // 2
+                muros_fronteira.append((muro, lin_adj * largura + col_adj))
+
+    adicionar_muros_fronteira(lin_atual, col_atual)
+
+    while muros_fronteira:
+        # Sorteia um muro e o troca com o último para removê-lo em O(1)
+        idx_muro = rng.randrange(len(muros_fronteira))
+        muros_fronteira[idx_muro], muros_fronteira[-1] = muros_fronteira[-1], muros_fronteira[idx_muro]
+        muro, adjacente = muros_fronteira.pop()
+
+        # Se a célula adjacente ainda for parede
+        if celulas[adjacente] == CEL_PAREDE:
+            celulas[muro] = CEL_CAMINHO
+            celulas[adjacente] = CEL_CAMINHO
+            adicionar_muros_fronteira(*divmod(adjacente, largura))
+
+def esculpir_kruskal(lab: GradeLabirinto, rng: random.Random) -> None:
+    """Algoritmo de Kruskal: muros em ordem aleatória e union-find para evitar ciclos."""
+    linhas, colunas = dimensoes_malha(lab)
+    largura, celulas = lab.largura, lab.celulas
+    num_celulas = linhas * colunas
+    abrir_celulas_malha(lab)
+
+    # Muro codificado como 2 * célula + direção (0 = leste, 1 = sul)
+    muros = []
+    for cid in range(num_celulas):
+        r, c = divmod(cid, colunas)
+        if c + 1 < colunas:
+            muros.append(2 * cid)
+        if r + 1 < linhas:
+            muros.append(2 * cid + 1)
+    rng.shuffle(muros)
+
+    pai = array("i", range(num_celulas))
+    tamanho = array("i", [1]) * num_celulas
+
+    def raiz(x: int) -> int:
+        while pai[x] != x:
+            pai[x] = pai[pai[x]]  # Compressão de caminho por divisão pela metade
+            x = pai[x]
+        return x
+
+    unioes = 0
+    for muro in muros:
+        cid, direcao = divmod(muro, 2)
+        vizinho = cid + 1 if direcao == 0 else cid + colunas
+        raiz_a, raiz_b = raiz(cid), raiz(vizinho)
+        if raiz_a == raiz_b:
+            continue
+
+        # União por tamanho
+        if tamanho[raiz_a] < tamanho[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        pai[raiz_b] = raiz_a
+        tamanho[raiz_a] += tamanho[raiz_b]
+
+        r, c = divmod(cid, colunas)
+        linha, coluna = 2 * r + 1, 2 * c + 1
+        if direcao == 0:
+            celulas[linha * largura + coluna + 1] = CEL_CAMINHO
+        else:
+            celulas[(linha + 1) * largura + coluna] = CEL_CAMINHO
+
+        unioes += 1
+        if unioes == num_celulas - 1:
+            break
+
+def esculpir_backtracking(lab: GradeLabirinto, rng: random.Random) -> None:
+    """Backtracking recursivo implementado com pilha explícita (sem limite de recursão)."""
+    linhas, colunas = dimensoes_malha(lab)
+    largura, celulas = lab.largura, lab.celulas
+
+    def indice_grade(cid: int) -> int:
+        r, c = divmod(cid, colunas)
+        return (2 * r + 1) * largura + 2 * c + 1
+
+    inicial = rng.randrange(linhas * colunas)
+    celulas[indice_grade(inicial)] = CEL_CAMINHO
+    pilha = [inicial]
+
+    while pilha:
+        cid = pilha[-1]
+        r, c = divmod(cid, colunas)
+        opcoes = []
+        if c + 1 < colunas and celulas[indice_grade(cid + 1)] == CEL_PAREDE:
+            opcoes.append(cid + 1)
+        if r + 1 < linhas and celulas[indice_grade(cid + colunas)] == CEL_PAREDE:
+            opcoes.append(cid + colunas)
+        if c > 0 and celulas[indice_grade(cid - 1)] == CEL_PAREDE:
+            opcoes.append(cid - 1)
+        if r > 0 and celulas[indice_grade(cid - colunas)] == CEL_PAREDE:
+            opcoes.append(cid - colunas)
+
+        if not opcoes:
+            pilha.pop()
+            continue
+
+        vizinho = opcoes[rng.randrange(len(opcoes))]
+        idx_atual, idx_vizinho = indice_grade(cid), indice_grade(vizinho)
+        celulas[(idx_atual + idx_vizinho) // 2] = CEL_CAMINHO  # Muro entre as duas células
+        celulas[idx_vizinho] = CEL_CAMINHO
+        pilha.append(vizinho)
+
+def esculpir_arvore_binaria(lab: GradeLabirinto, rng: random.Random) -> None:
+    """
+    Árvore binária: cada célula abre o muro ao norte ou a oeste.
+    Cada linha é montada de uma vez com fatias do buffer e bytes.translate.
+    """
+    linhas, colunas = dimensoes_malha(lab)
+    largura, celulas = lab.largura, lab.celulas
+    abrir_celulas_malha(lab)
+
+    for r in range(linhas):
+        inicio = (2 * r + 1) * largura
+        if r == 0:
+            # Primeira linha só pode ir para oeste
+            celulas[inicio + 2:inicio + 2 * colunas:2] = bytes([CEL_CAMINHO]) * (colunas - 1)
+            continue
+
+        sorteio = bytes_aleatorios(rng, colunas)
+        acima = inicio - largura
+        celulas[inicio + 2:inicio + 2 * colunas:2] = sorteio[1:].translate(TABELA_ABRE_SE_UM)
+        celulas[acima + 1:acima + 2 * colunas:2] = sorteio.translate(TABELA_ABRE_SE_ZERO)
+        # A primeira coluna não tem muro a oeste: sempre abre ao norte
+        celulas[acima + 1] = CEL_CAMINHO
+
+def esculpir_sidewinder(lab: GradeLabirinto, rng: random.Random) -> None:
+    """
+    Sidewinder: cada linha forma corredores para leste; ao fechar um corredor,
+    uma célula sorteada dele abre o muro ao norte. As aberturas a leste de cada
+    linha são aplicadas de uma vez no buffer.
+    """
+    linhas, colunas = dimensoes_malha(lab)
+    largura, celulas = lab.largura, lab.celulas
+    abrir_celulas_malha(lab)
+
+    for r in range(linhas):
+        inicio = (2 * r + 1) * largura
+        if r == 0:
+            celulas[inicio + 2:inicio + 2 * colunas:2] = bytes([CEL_CAMINHO]) * (colunas - 1)
+            continue
+
+        # 1 = fecha o corredor nesta célula, 0 = continua para leste
+        decisoes = bytes_aleatorios(rng, colunas).translate(TABELA_BIT)
+        celulas[inicio + 2:inicio + 2 * colunas:2] = decisoes[:-1].translate(TABELA_ABRE_SE_ZERO)
+
+        acima = inicio - largura
+        inicio_corredor = 0
+        while inicio_corredor < colunas:
+            fim_corredor = decisoes.find(1, inicio_corredor, colunas - 1)
+            if fim_corredor == -1:
+                fim_corredor = colunas - 1
+            escolhida = rng.randrange(inicio_corredor, fim_corredor + 1)
+            celulas[acima + 2 * escolhida + 1] = CEL_CAMINHO
+            inicio_corredor = fim_corredor + 1
+
+def extremos_eller(altura: int, largura: int) -> Tuple[Posicao, Posicao]:
+    """Posições de início e fim marcadas por gerar_linhas_eller: primeira e última célula da malha."""
+    linhas, colunas = (altura - 1) // 2, (largura - 1) // 2
+    return (1, 1), (2 * linhas - 1, 2 * colunas - 1)
+
+def gerar_linhas_eller(altura: int, largura: int, semente: Optional[int] = None,
+                       chance_remover_parede: float = 0.0, chance_juntar: float = 0.5,
+                       chance_descer: float = 0.5) -> Iterator[bytes]:
+    """
+    Gera um labirinto perfeito com o algoritmo de Eller, produzindo uma linha por vez.
+    Só os conjuntos da linha atual e uma janela de três linhas ficam em memória, então
+    o consumo depende da largura e não da área.
+    
+    Args:
+        altura: Altura do labirinto
+        largura: Largura do labirinto
+        semente: Semente do gerador aleatório
+        chance_remover_parede: Se positiva, aplica adicionar_caminhos_extras na janela deslizante
+        chance_juntar: Probabilidade de unir duas células vizinhas de conjuntos diferentes
+        chance_descer: Probabilidade de cada célula abrir passagem para a linha de baixo
+    
+    Yields:
+        Cada linha da grade como bytes de códigos de célula, com início e fim
+        (ver extremos_eller) já marcados.
+    """
+    if altura < 3 or largura < 3:
+        raise ValueError("O labirinto precisa ter pelo menos 3x3 células")
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+    rng = random.Random(semente)
+    linhas, colunas = (altura - 1) // 2, (largura - 1) // 2
+    
+    def linhas_escavadas() -> Iterator[bytearray]:
+        """Linhas produzidas pelo algoritmo de Eller, antes dos caminhos extras."""
+        yield bytearray([CEL_PAREDE]) * largura
+        
+        conjuntos = [-1] * colunas  # Conjunto de cada coluna na linha atual
+        membros = {}  # Conjunto -> colunas que pertencem a ele
+        proximo_conjunto = 0
+        
+        for r in range(linhas):
+            ultima = r == linhas - 1
+            
+            # Células que não vieram de cima começam em conjuntos próprios
+            for c in range(colunas):
+                if conjuntos[c] == -1:
+                    conjuntos[c] = proximo_conjunto
+                    membros[proximo_conjunto] = [c]
+                    proximo_conjunto += 1
+            
+            linha_celulas = bytearray([CEL_PAREDE]) * largura
+            linha_celulas[1:2 * colunas:2] = bytes([CEL_CAMINHO]) * colunas
+            
+            # Junções horizontais (na última linha todos os conjuntos precisam se unir)
+            for c in range(colunas - 1):
+                conj_a, conj_b = conjuntos[c], conjuntos[c + 1]
+                if conj_a != conj_b and (ultima or rng.random() < chance_juntar):
+                    linha_celulas[2 * c + 2] = CEL_CAMINHO
+                    # Une o conjunto menor ao maior
+                    if len(membros[conj_a]) < len(membros[conj_b]):
+                        conj_a, conj_b = conj_b, conj_a
+                    for col in membros[conj_b]:
+                        conjuntos[col] = conj_a
+                    membros[conj_a].extend(membros.pop(conj_b))
+            yield linha_celulas
+            
+            # Passagens para baixo: cada conjunto desce por pelo menos uma célula
+            linha_muros = bytearray([CEL_PAREDE]) * largura
+            if not ultima:
+                novos_conjuntos = [-1] * colunas
+                novos_membros = {}
+                for conj, colunas_conj in membros.items():
+                    descem = [c for c in colunas_conj if rng.random() < chance_descer]
+                    if not descem:
+                        descem = [colunas_conj[rng.randrange(len(colunas_conj))]]
+                    for c in descem:
+                        linha_muros[2 * c + 1] = CEL_CAMINHO
+                        novos_conjuntos[c] = conj
+                    novos_membros[conj] = descem
+                conjuntos, membros = novos_conjuntos, novos_membros
+            yield linha_muros
+        
+        # Altura par: completa com linhas de parede
+        for _ in range(altura - (2 * linhas + 1)):
+            yield bytearray([CEL_PAREDE]) * largura
+    
+    inicio, fim = extremos_eller(altura, largura)
+    
+    def finalizar(indice: int, linha: bytearray) -> bytes:
+        """Marca início e fim e congela a linha para entrega."""
+        if indice == inicio[0]:
+            linha[inicio[1]] = CEL_INICIO
+        if indice == fim[0]:
+            linha[fim[1]] = CEL_FIM
+        return bytes(linha)
+    
+    # Janela deslizante: a linha i só é processada quando a linha i + 1 já existe
+    brutas = linhas_escavadas()
+    anterior = next(brutas)
+    atual = next(brutas)
+    yield finalizar(0, anterior)
+    indice = 1
+    for abaixo in brutas:
+        if chance_remover_parede > 0 and indice < altura - 1:
+            abrir_paredes_linha(anterior, atual, abaixo, chance_remover_parede, rng)
+        yield finalizar(indice, atual)
+        anterior, atual = atual, abaixo
+        indice += 1
+    yield finalizar(indice, atual)
+
+def escrever_labirinto_eller(caminho_arquivo: str, altura: int, largura: int,
+                             semente: Optional[int] = None,
+                             chance_remover_parede: float = 0.0) -> Tuple[Posicao, Posicao]:
+    """
+    Gera um labirinto com gerar_linhas_eller gravando cada linha direto no arquivo,
+    no formato binário de arquivo.py (pode ser aberto com carregar_labirinto).
+    Retorna as posições de início e fim.
+    """
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+    inicio, fim = extremos_eller(altura, largura)
+    linhas = gerar_linhas_eller(altura, largura, semente, chance_remover_parede)
+    escrever_linhas(caminho_arquivo, altura, largura, linhas, inicio, fim, semente=semente)
+    return inicio, fim
+
+# Algoritmos disponíveis para labirinto.gerar_labirinto
+ALGORITMOS_GERACAO: Dict[str, EsculpirLabirinto] = {
+    "prim": esculpir_prim,
+    "kruskal": esculpir_kruskal,
+    "backtracking": esculpir_backtracking,
+    "arvore_binaria": esculpir_arvore_binaria,
+    "sidewinder": esculpir_sidewinder,
+}
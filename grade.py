@@ -0,0 +1,252 @@
+import hashlib
+import struct
+from typing import List, Optional, Tuple, Union
+
+from constantes import *
+
+# Tipos personalizados
+Labirinto = List[List[str]]  # Forma antiga: matriz de caracteres coloridos
+Posicao = Tuple[int, int]
+Caminho = List[Posicao]
+
+# Código de cada caractere colorido (para converter a forma antiga)
+CODIGO_POR_CARACTERE = {car: codigo for codigo, car in enumerate(CARACTERES_CELULA)}
+
+# Células por bloco da impressão digital incremental
+BLOCO_IMPRESSAO = 4096
+MODULO_IMPRESSAO = 1 << 128
+# Tamanho mínimo do registro de alterações antes de descartar as mais antigas
+# (o limite é o maior entre este e o número de células)
+MIN_REGISTRO = 4096
+
+class GradeLabirinto:
+    """
+    Labirinto compacto: um byte por célula, guardado em ordem de linhas.
+    As cores só são aplicadas na hora de desenhar (renderizar_linha).
+
+    `versao` aumenta a cada alteração feita por lab[pos] = codigo; quem escrever
+    direto em `celulas` deve chamar marcar_modificada() para invalidar caches.
+    Depois de registrar_alteracoes(), as células alteradas ficam anotadas e podem ser
+    consultadas com alteracoes_desde(versao) (usado pelo replanejamento incremental).
+    Cada leitor do registro avisa o que já consumiu com esquecer_alteracoes e sai com
+    parar_registro; o registro guarda só o que algum leitor ainda não leu, e no máximo
+    max(MIN_REGISTRO, altura * largura) alterações (quem ficar para trás recomeça do zero).
+    """
+    __slots__ = ("altura", "largura", "celulas", "versao", "_impressao", "_registro", "_inicio_registro",
+                 "_leitores", "_proximo_leitor", "_hash_blocos", "_soma_blocos", "_blocos_sujos", "__weakref__")
+
+    def __init__(self, altura: int, largura: int, celulas=None, preenchimento: int = CEL_PAREDE):
+        """
+        Args:
+            altura: Número de linhas
+            largura: Número de colunas
+            celulas: Buffer de códigos já existente (bytearray ou memoryview)
+            preenchimento: Código usado quando nenhum buffer é informado
+        """
+        if celulas is None:
+            celulas = bytearray([preenchimento]) * (altura * largura)
+        elif len(celulas) != altura * largura:
+            raise ValueError(
+                f"Buffer com {len(celulas)} células não corresponde a {altura}x{largura}"
+            )
+        self.altura = altura
+        self.largura = largura
+        self.celulas = celulas
+        self.versao = 0
+        self._impressao = None  # (versão, impressão digital) calculada por último
+        # Hash de cada bloco de células e a soma deles; os blocos alterados desde o último
+        # cálculo ficam em _blocos_sujos (None: recalcular todos)
+        self._hash_blocos: List[int] = []
+        self._soma_blocos = 0
+        self._blocos_sujos: Optional[set] = None
+        # Índices alterados desde a versão _inicio_registro, um por versão (-1: célula desconhecida)
+        self._registro: Optional[List[int]] = None
+        self._inicio_registro = 0
+        self._leitores: dict = {}  # leitor -> versão até onde já leu
+        self._proximo_leitor = 0
+
+    @classmethod
+    def de_labirinto(cls, lab: Labirinto) -> "GradeLabirinto":
+        """Converte a forma antiga (lista de listas de caracteres) para a grade."""
+        altura = len(lab)
+        largura = len(lab[0])
+        celulas = bytearray(altura * largura)
+        idx = 0
+        for linha in lab:
+            if len(linha) != largura:
+                raise ValueError("Todas as linhas do labirinto devem ter a mesma largura")
+            for car in linha:
+                try:
+                    celulas[idx] = CODIGO_POR_CARACTERE[car]
+                except KeyError:
+                    raise ValueError(f"Caractere de célula desconhecido: {car!r}") from None
+                idx += 1
+        return cls(altura, largura, celulas)
+
+    def para_labirinto(self) -> Labirinto:
+        """Converte a grade para a forma antiga (lista de listas de caracteres)."""
+        largura = self.largura
+        return [
+            [CARACTERES_CELULA[c] for c in self.celulas[i * largura:(i + 1) * largura]]
+            for i in range(self.altura)
+        ]
+
+    def indice(self, linha: int, coluna: int) -> int:
+        """Retorna o índice linear de uma célula."""
+        return linha * self.largura + coluna
+
+    def posicao(self, indice: int) -> Posicao:
+        """Retorna a posição (linha, coluna) de um índice linear."""
+        return divmod(indice, self.largura)
+
+    def dentro_limites(self, pos: Posicao) -> bool:
+        """Verifica se uma posição está dentro da grade."""
+        linha, coluna = pos
+        return 0 <= linha < self.altura and 0 <= coluna < self.largura
+
+    def __getitem__(self, pos: Posicao) -> int:
+        linha, coluna = pos
+        return self.celulas[linha * self.largura + coluna]
+
+    def __setitem__(self, pos: Posicao, codigo: int) -> None:
+        linha, coluna = pos
+        idx = linha * self.largura + coluna
+        self.celulas[idx] = codigo
+        self.versao += 1
+        if self._blocos_sujos is not None:
+            self._blocos_sujos.add(idx // BLOCO_IMPRESSAO)
+        if self._registro is not None:
+            self._registro.append(idx)
+            if len(self._registro) > max(MIN_REGISTRO, len(self.celulas)):
+                self._cortar_registro(self.versao - len(self._registro) // 2)
+
+    def marcar_modificada(self) -> None:
+        """Registra uma alteração feita direto em `celulas` (células desconhecidas)."""
+        self.versao += 1
+        self._blocos_sujos = None
+        if self._registro is not None:
+            self._registro.append(-1)
+
+    def registrar_alteracoes(self) -> int:
+        """
+        Passa a anotar as células alteradas por lab[pos] = codigo (se ainda não anotava)
+        e retorna o número do novo leitor, usado em esquecer_alteracoes e parar_registro.
+        """
+        if self._registro is None:
+            self._registro = []
+            self._inicio_registro = self.versao
+        leitor = self._proximo_leitor
+        self._proximo_leitor += 1
+        self._leitores[leitor] = self.versao
+        return leitor
+
+    def parar_registro(self, leitor: int) -> None:
+        """Remove o leitor; sem leitores, o registro é desligado e liberado."""
+        if self._leitores.pop(leitor, None) is None:
+            return
+        if not self._leitores:
+            self._registro = None
+        else:
+            self._cortar_registro(min(self._leitores.values()))
+
+    def alteracoes_desde(self, versao: int) -> Optional[List[int]]:
+        """
+        Índices das células alteradas depois de `versao`, sem repetições. Retorna None
+        se não for possível saber (registro desligado, já esquecido ou alteração feita
+        direto em `celulas`); nesse caso quem consulta deve recomeçar do zero.
+        """
+        if self._registro is None or versao < self._inicio_registro:
+            return None
+        alteradas = set(self._registro[versao - self._inicio_registro:])
+        if -1 in alteradas:
+            return None
+        return sorted(alteradas)
+
+    def esquecer_alteracoes(self, ate_versao: int, leitor: Optional[int] = None) -> None:
+        """
+        Avisa que `leitor` já consumiu as alterações até `ate_versao`; o registro descarta
+        o que todos os leitores já leram. Sem `leitor`, descarta até `ate_versao` direto.
+        """
+        if leitor is not None:
+            if leitor not in self._leitores:
+                return
+            self._leitores[leitor] = max(self._leitores[leitor], ate_versao)
+            ate_versao = min(self._leitores.values())
+        self._cortar_registro(ate_versao)
+
+    def _cortar_registro(self, ate_versao: int) -> None:
+        """Descarta do registro as alterações até `ate_versao`."""
+        if self._registro is not None and ate_versao > self._inicio_registro:
+            ate_versao = min(ate_versao, self.versao)
+            del self._registro[:ate_versao - self._inicio_registro]
+            self._inicio_registro = ate_versao
+
+    def _hash_bloco(self, bloco: int) -> int:
+        """BLAKE2b do número do bloco e das suas células, como inteiro de 128 bits."""
+        inicio = bloco * BLOCO_IMPRESSAO
+        resumo = hashlib.blake2b(struct.pack("<Q", bloco), digest_size=16)
+        resumo.update(self.celulas[inicio:inicio + BLOCO_IMPRESSAO])
+        return int.from_bytes(resumo.digest(), "little")
+
+    def impressao_digital(self) -> str:
+        """
+        Hash das dimensões e das células, usado como chave de caches.
+
+        As células são divididas em blocos de BLOCO_IMPRESSAO; cada bloco tem seu
+        BLAKE2b (que inclui o número do bloco) e a impressão é o hash das dimensões com
+        a soma dos blocos módulo 2^128. Uma alteração por lab[pos] = codigo só suja o
+        bloco da célula, então a próxima consulta refaz o hash de poucos blocos em vez da
+        grade inteira. Fica guardada até a próxima alteração.
+        """
+        if self._impressao is not None and self._impressao[0] == self.versao:
+            return self._impressao[1]
+        if self._blocos_sujos is None:
+            num_blocos = -(-len(self.celulas) // BLOCO_IMPRESSAO)
+            self._hash_blocos = [self._hash_bloco(bloco) for bloco in range(num_blocos)]
+            self._soma_blocos = sum(self._hash_blocos) % MODULO_IMPRESSAO
+        else:
+            for bloco in self._blocos_sujos:
+                novo = self._hash_bloco(bloco)
+                self._soma_blocos = (self._soma_blocos + novo - self._hash_blocos[bloco]) % MODULO_IMPRESSAO
+                self._hash_blocos[bloco] = novo
+        self._blocos_sujos = set()
+        resumo = hashlib.blake2b(struct.pack("<QQ", self.altura, self.largura), digest_size=16)
+        resumo.update(self._soma_blocos.to_bytes(16, "little"))
+        self._impressao = (self.versao, resumo.hexdigest())
+        return self._impressao[1]
+
+    def __eq__(self, outra: object) -> bool:
+        if not isinstance(outra, GradeLabirinto):
+            return NotImplemented
+        return (self.altura == outra.altura and self.largura == outra.largura
+                and self.celulas == outra.celulas)
+
+    def copiar(self) -> "GradeLabirinto":
+        """Retorna uma cópia independente da grade."""
+        return GradeLabirinto(self.altura, self.largura, bytearray(self.celulas))
+
+    def posicoes_com(self, codigo: int) -> List[Posicao]:
+        """Retorna todas as posições que contêm o código informado."""
+        largura = self.largura
+        alvo = bytes([codigo])
+        posicoes = []
+        # Varre em blocos para também funcionar sobre memoryview (ex.: arquivo mapeado)
+        bloco = 1 << 20
+        for base in range(0, len(self.celulas), bloco):
+            trecho = bytes(self.celulas[base:base + bloco])
+            idx = trecho.find(alvo)
+            while idx != -1:
+                posicoes.append(divmod(base + idx, largura))
+                idx = trecho.find(alvo, idx + 1)
+        return posicoes
+
+    def renderizar_linha(self, linha: int) -> str:
+        """Monta a string colorida de uma linha da grade."""
+        inicio = linha * self.largura
+        return "".join(CARACTERES_CELULA[c] for c in self.celulas[inicio:inicio + self.largura])
+
+def como_grade(lab: Union[Labirinto, GradeLabirinto]) -> GradeLabirinto:
+    """Aceita a grade ou a forma antiga e sempre devolve uma GradeLabirinto."""
+    if isinstance(lab, GradeLabirinto):
+        return lab
+    return GradeLabirinto.de_labirinto(lab)
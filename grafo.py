@@ -0,0 +1,183 @@
+import hashlib
+import heapq
+from array import array
+from typing import Dict, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto, como_grade
+
+def tipo_indice(num_celulas: int) -> str:
+    """Escolhe o typecode de array capaz de guardar índices lineares até num_celulas."""
+    return "i" if num_celulas < 2 ** 31 else "q"
+
+class GrafoLabirinto:
+    """
+    Grafo de adjacência do labirinto em formato CSR (compressed sparse row).
+
+    Os vizinhos da célula de índice linear `u` são vizinhos[inicio_vizinhos[u]:inicio_vizinhos[u + 1]],
+    e custos[k] é o custo de entrar em vizinhos[k] (CUSTO_NORMAL ou CUSTO_BARREIRA).
+    Paredes não têm arestas. Os vetores não mudam depois de compilados; quem alterá-los
+    deve chamar marcar_modificado() para invalidar a impressão digital guardada.
+
+    Aqui cada nó é uma célula. Grafos derivados com numeração própria (ex.: o grafo de
+    junções de contracao.py) preenchem celula_do_no, que leva cada nó ao índice linear
+    da sua célula; as buscas usam esse vetor para a heurística.
+    """
+    __slots__ = ("altura", "largura", "inicio_vizinhos", "vizinhos", "custos", "celula_do_no", "_impressao")
+
+    def __init__(self, altura: int, largura: int, inicio_vizinhos: array, vizinhos: array, custos: array):
+        self.altura = altura
+        self.largura = largura
+        self.inicio_vizinhos = inicio_vizinhos
+        self.vizinhos = vizinhos
+        self.custos = custos
+        self.celula_do_no = None  # None: o nó é a própria célula
+        self._impressao = None  # Impressão digital calculada por último
+
+    def marcar_modificado(self) -> None:
+        """Registra uma alteração nos vetores CSR (a impressão digital é recalculada)."""
+        self._impressao = None
+
+    @property
+    def num_celulas(self) -> int:
+        return self.altura * self.largura
+
+    @property
+    def num_nos(self) -> int:
+        """Quantidade de nós (tamanho dos vetores indexados por nó nas buscas)."""
+        return len(self.inicio_vizinhos) - 1
+
+    def indice(self, pos: Posicao) -> int:
+        """Retorna o índice linear de uma posição."""
+        return pos[0] * self.largura + pos[1]
+
+    def posicao(self, indice: int) -> Posicao:
+        """Retorna a posição (linha, coluna) de um índice linear."""
+        return divmod(indice, self.largura)
+
+    def custo_aresta(self, origem: int, destino: int) -> int:
+        """Retorna o custo de ir de origem até destino (vizinhos diretos)."""
+        for k in range(self.inicio_vizinhos[origem], self.inicio_vizinhos[origem + 1]):
+            if self.vizinhos[k] == destino:
+                return self.custos[k]
+        raise ValueError(f"Células {self.posicao(origem)} e {self.posicao(destino)} não são vizinhas")
+
+    def reconstruir_caminho(self, veio_de: Dict[int, int], destino: int) -> Caminho:
+        """Reconstrói o caminho seguindo os pais (-1 marca a origem) e devolve posições."""
+        caminho = []
+        atual = destino
+        while atual != -1:
+            caminho.append(divmod(atual, self.largura))
+            atual = veio_de[atual]
+        caminho.reverse()
+        return caminho
+
+def compilar_grafo(lab: Union[Labirinto, GradeLabirinto]) -> GrafoLabirinto:
+    """
+    Compila o labirinto em um GrafoLabirinto.
+    Os vizinhos seguem a mesma ordem de obter_vizinhos_com_custo: direita, baixo, esquerda, cima.
+    """
+    grade = como_grade(lab)
+    altura, largura, celulas = grade.altura, grade.largura, grade.celulas
+    tipo = tipo_indice(altura * largura)
+
+    inicio_vizinhos = array(tipo, [0])
+    vizinhos = array(tipo)
+    custos = array("B")
+
+    for idx in range(altura * largura):
+        if celulas[idx] != CEL_PAREDE:
+            linha, coluna = divmod(idx, largura)
+            candidatos = (
+                (idx + 1, coluna + 1 < largura),
+                (idx + largura, linha + 1 < altura),
+                (idx - 1, coluna > 0),
+                (idx - largura, linha > 0),
+            )
+            for viz, valido in candidatos:
+                if valido:
+                    codigo = celulas[viz]
+                    if codigo != CEL_PAREDE:
+                        vizinhos.append(viz)
+                        custos.append(CUSTO_BARREIRA if codigo == CEL_BARREIRA else CUSTO_NORMAL)
+        inicio_vizinhos.append(len(vizinhos))
+
+    return GrafoLabirinto(altura, largura, inicio_vizinhos, vizinhos, custos)
+
+def como_grafo(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto]) -> GrafoLabirinto:
+    """Aceita grafo, grade ou a forma antiga e sempre devolve um GrafoLabirinto."""
+    if isinstance(lab, GrafoLabirinto):
+        return lab
+    return compilar_grafo(lab)
+
+def custos_de_entrada(grafo: GrafoLabirinto) -> bytearray:
+    """
+    Retorna, para cada célula, o custo de entrar nela (0 para células sem arestas,
+    que se comportam como paredes).
+    """
+    inicio_vizinhos, vizinhos = grafo.inicio_vizinhos, grafo.vizinhos
+    custo_celula = bytearray(grafo.num_celulas)
+    for idx in range(grafo.num_celulas):
+        if inicio_vizinhos[idx] != inicio_vizinhos[idx + 1]:
+            custo_celula[idx] = CUSTO_NORMAL
+    custos = bytes(grafo.custos)
+    k = custos.find(CUSTO_BARREIRA)
+    while k != -1:
+        custo_celula[vizinhos[k]] = CUSTO_BARREIRA
+        k = custos.find(CUSTO_BARREIRA, k + 1)
+    return custo_celula
+
+# Converte custo de entrada em código de célula (usado por grade_do_grafo)
+CODIGO_POR_CUSTO = bytes(
+    CEL_PAREDE if custo == 0 else CEL_BARREIRA if custo == CUSTO_BARREIRA else CEL_CAMINHO
+    for custo in range(256)
+)
+
+def grade_do_grafo(grafo: GrafoLabirinto) -> GradeLabirinto:
+    """
+    Reconstrói uma grade de custos a partir do grafo: células sem arestas viram paredes,
+    células em que se entra com CUSTO_BARREIRA viram barreiras e o resto vira caminho.
+    Útil para algoritmos que precisam da geometria da grade (ex.: Jump Point Search).
+    """
+    celulas = custos_de_entrada(grafo).translate(CODIGO_POR_CUSTO)
+    return GradeLabirinto(grafo.altura, grafo.largura, celulas)
+
+def impressao_digital(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto]) -> str:
+    """
+    Impressão digital do labirinto para chaves de cache. Grades usam o hash das células
+    (GradeLabirinto.impressao_digital); grafos, o hash dos vetores CSR, calculado uma vez
+    e guardado no grafo.
+    """
+    if isinstance(lab, GrafoLabirinto):
+        if lab._impressao is None:
+            resumo = hashlib.blake2b(b"grafo", digest_size=16)
+            resumo.update(f"{lab.altura}x{lab.largura}".encode())
+            for vetor in (lab.inicio_vizinhos, lab.vizinhos, lab.custos):
+                resumo.update(memoryview(vetor).cast("B"))
+            if lab.celula_do_no is not None:
+                resumo.update(memoryview(lab.celula_do_no).cast("B"))
+            lab._impressao = resumo.hexdigest()
+        return lab._impressao
+    return como_grade(lab).impressao_digital()
+
+def distancias_a_partir(grafo: GrafoLabirinto, origem: int) -> array:
+    """
+    Dijkstra completo a partir de uma célula: retorna o custo mínimo de origem até
+    cada célula (-1 para as inalcançáveis), num array indexado pelo índice linear.
+    """
+    inicio_vizinhos, vizinhos, custos = grafo.inicio_vizinhos, grafo.vizinhos, grafo.custos
+    distancia = array(tipo_indice(CUSTO_BARREIRA * grafo.num_celulas), [-1]) * grafo.num_celulas
+    distancia[origem] = 0
+    fila = [(0, origem)]
+    while fila:
+        d, atual = heapq.heappop(fila)
+        if d > distancia[atual]:
+            continue  # Entrada desatualizada
+        for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+            prox = vizinhos[k]
+            nova = d + custos[k]
+            atual_prox = distancia[prox]
+            if atual_prox < 0 or nova < atual_prox:
+                distancia[prox] = nova
+                heapq.heappush(fila, (nova, prox))
+    return distancia
@@ -0,0 +1,213 @@
+import heapq
+import time
+import weakref
+from typing import List, Optional, Tuple
+
+from constantes import *
+from grade import Posicao, Caminho, GradeLabirinto
+from algoritmos import MetricasBusca, coletar_metricas
+from instrumentacao import instrumentado
+
+INFINITO = float("inf")
+
+class PlanejadorDStarLite:
+    """
+    D* Lite: busca incremental que guarda o estado entre consultas e, quando células
+    mudam (barreiras postas ou tiradas, paredes abertas), conserta só a parte afetada
+    da solução em vez de buscar do zero. Também aceita mover o início (ex.: o jogador
+    andou) sem perder o que já foi calculado.
+
+    A busca vai do fim para o início: g[v] é o custo conhecido de v até o fim e rhs[v]
+    é o valor com um passo de antecedência, min sobre os vizinhos w de custo(w) + g[w].
+    Células com g != rhs estão inconsistentes e ficam na fila, ordenadas pela chave
+    (min(g, rhs) + h(início, v) + km, min(g, rhs)).
+
+    A grade passa a registrar suas alterações (GradeLabirinto.registrar_alteracoes), e
+    cada resolver() lê as células alteradas desde a consulta anterior e as libera do
+    registro. fechar() (ou o fim do planejador) deixa de registrar.
+    """
+    __slots__ = ("lab", "inicio", "fim", "g", "rhs", "fila", "chaves", "km", "ultimo_inicio",
+                 "versao", "expandidos", "atualizados", "leitor", "_fim_registro", "__weakref__")
+
+    def __init__(self, lab: GradeLabirinto, inicio: Posicao, fim: Posicao):
+        self.lab = lab
+        self.inicio = lab.indice(*inicio)
+        self.fim = lab.indice(*fim)
+        self.leitor = lab.registrar_alteracoes()
+        self._fim_registro = weakref.finalize(self, lab.parar_registro, self.leitor)
+        self.versao = lab.versao
+        self.expandidos = 0
+        self.atualizados = 0
+        self._reiniciar()
+
+    def _reiniciar(self) -> None:
+        """Descarta o estado e começa uma busca nova."""
+        num_celulas = self.lab.altura * self.lab.largura
+        self.g: List[float] = [INFINITO] * num_celulas
+        self.rhs: List[float] = [INFINITO] * num_celulas
+        self.fila: List[Tuple[float, float, int]] = []
+        self.chaves = {}  # célula -> chave atual na fila (as outras entradas são obsoletas)
+        self.km = 0
+        self.ultimo_inicio = self.inicio
+        self.rhs[self.fim] = 0
+        self._enfileirar(self.fim)
+
+    def _custo(self, idx: int) -> float:
+        """Custo de entrar na célula (infinito para paredes)."""
+        codigo = self.lab.celulas[idx]
+        if codigo == CEL_PAREDE:
+            return INFINITO
+        return CUSTO_BARREIRA if codigo == CEL_BARREIRA else CUSTO_NORMAL
+
+    def _vizinhos(self, idx: int) -> List[int]:
+        """Vizinhos dentro da grade, na ordem direita, baixo, esquerda, cima."""
+        largura = self.lab.largura
+        linha, coluna = divmod(idx, largura)
+        vizinhos = []
+        if coluna + 1 < largura:
+            vizinhos.append(idx + 1)
+        if linha + 1 < self.lab.altura:
+            vizinhos.append(idx + largura)
+        if coluna > 0:
+            vizinhos.append(idx - 1)
+        if linha > 0:
+            vizinhos.append(idx - largura)
+        return vizinhos
+
+    def _chave(self, idx: int) -> Tuple[float, float]:
+        largura = self.lab.largura
+        lin, col = divmod(idx, largura)
+        lin_inicio, col_inicio = divmod(self.inicio, largura)
+        menor = min(self.g[idx], self.rhs[idx])
+        return (menor + abs(lin - lin_inicio) + abs(col - col_inicio) + self.km, menor)
+
+    def _enfileirar(self, idx: int) -> None:
+        chave = self._chave(idx)
+        self.chaves[idx] = chave
+        heapq.heappush(self.fila, (chave[0], chave[1], idx))
+
+    def _topo(self) -> Optional[Tuple[float, float, int]]:
+        """Menor entrada válida da fila, descartando as obsoletas."""
+        fila, chaves = self.fila, self.chaves
+        while fila:
+            k1, k2, idx = fila[0]
+            if chaves.get(idx) == (k1, k2):
+                return fila[0]
+            heapq.heappop(fila)
+        return None
+
+    def _atualizar_vertice(self, idx: int, recalcular: bool = True) -> None:
+        """Recalcula rhs (se pedido) e põe ou tira a célula da fila conforme a consistência."""
+        if recalcular and idx != self.fim:
+            if self.lab.celulas[idx] == CEL_PAREDE:
+                self.rhs[idx] = INFINITO
+            else:
+                g = self.g
+                self.rhs[idx] = min((self._custo(w) + g[w] for w in self._vizinhos(idx)), default=INFINITO)
+            self.atualizados += 1
+        if self.g[idx] != self.rhs[idx]:
+            self._enfileirar(idx)
+        else:
+            self.chaves.pop(idx, None)
+
+    def _calcular(self) -> None:
+        """Expande células inconsistentes até o início ficar consistente e com a menor chave."""
+        g, rhs, fila, chaves = self.g, self.rhs, self.fila, self.chaves
+        inicio = self.inicio
+        while True:
+            topo = self._topo()
+            if topo is None:
+                break
+            k1, k2, u = topo
+            if (k1, k2) >= self._chave(inicio) and rhs[inicio] == g[inicio]:
+                break
+            chave_nova = self._chave(u)
+            if (k1, k2) < chave_nova:
+                # A chave envelheceu (o início andou): reinsere com a chave atual
+                chaves[u] = chave_nova
+                heapq.heapreplace(fila, (chave_nova[0], chave_nova[1], u))
+                continue
+            heapq.heappop(fila)
+            del chaves[u]
+            self.expandidos += 1
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                custo_u = self._custo(u)
+                for s in self._vizinhos(u):
+                    if s != self.fim and self.lab.celulas[s] != CEL_PAREDE and custo_u + g[u] < rhs[s]:
+                        rhs[s] = custo_u + g[u]
+                        self.atualizados += 1
+                        self._atualizar_vertice(s, recalcular=False)
+            else:
+                g[u] = INFINITO
+                self._atualizar_vertice(u)
+                for s in self._vizinhos(u):
+                    self._atualizar_vertice(s)
+
+    def mover_inicio(self, pos: Posicao) -> None:
+        """Troca o início (ex.: o jogador andou) mantendo o estado da busca."""
+        largura = self.lab.largura
+        novo = self.lab.indice(*pos)
+        (lin_a, col_a), (lin_b, col_b) = divmod(self.ultimo_inicio, largura), divmod(novo, largura)
+        self.km += abs(lin_a - lin_b) + abs(col_a - col_b)
+        self.ultimo_inicio = novo
+        self.inicio = novo
+
+    def sincronizar(self) -> None:
+        """Aplica as células alteradas na grade desde a última consulta."""
+        alteradas = self.lab.alteracoes_desde(self.versao)
+        self.versao = self.lab.versao
+        self.lab.esquecer_alteracoes(self.versao, self.leitor)
+        if alteradas is None:
+            self._reiniciar()
+            return
+        for v in alteradas:
+            # Mudou o custo de entrar em v (arestas dos vizinhos) e as saídas de v
+            self._atualizar_vertice(v)
+            for u in self._vizinhos(v):
+                self._atualizar_vertice(u)
+
+    def fechar(self) -> None:
+        """Deixa de registrar as alterações da grade para este planejador."""
+        self._fim_registro()
+
+    def _extrair_caminho(self) -> Tuple[Optional[Caminho], int]:
+        """Desce pelo g a partir do início, sempre para o vizinho de menor custo até o fim."""
+        g, largura = self.g, self.lab.largura
+        atual = self.inicio
+        if atual != self.fim and (self.lab.celulas[atual] == CEL_PAREDE or g[atual] == INFINITO):
+            return None, 0
+        caminho = [divmod(atual, largura)]
+        custo = 0
+        while atual != self.fim:
+            prox = min(self._vizinhos(atual), key=lambda w: self._custo(w) + g[w])
+            passo = self._custo(prox)
+            if passo + g[prox] == INFINITO:
+                return None, 0
+            custo += passo
+            atual = prox
+            caminho.append(divmod(atual, largura))
+        return caminho, custo
+
+    @instrumentado
+    def resolver(self) -> Tuple[Optional[Caminho], MetricasBusca]:
+        """
+        Aplica as alterações pendentes da grade, conserta a solução e retorna o caminho
+        e as métricas desta consulta: nos_visitados conta as células expandidas e
+        nos_atualizados as que tiveram rhs recalculado.
+        """
+        tempo_inicio = time.time()
+        self.expandidos = 0
+        self.atualizados = 0
+        self.sincronizar()
+        self._calcular()
+        caminho, custo = self._extrair_caminho()
+        tempo_fim = time.time()
+
+        largura = self.lab.largura
+        metricas = coletar_metricas(
+            caminho, custo, self.expandidos, tempo_inicio, tempo_fim,
+            divmod(self.inicio, largura), divmod(self.fim, largura), "D* Lite"
+        )
+        metricas.nos_atualizados = self.atualizados
+        return caminho, metricas
@@ -0,0 +1,210 @@
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+# Contadores copiados de MetricasBusca para o registro de cada busca
+CONTADORES_BUSCA = ("nos_visitados", "insercoes", "remocoes", "remocoes_obsoletas", "nos_atualizados", "pico_nos")
+
+@dataclass
+class RegistroMedicao:
+    """Medição de uma chamada de solucionador ou de uma geração de labirinto."""
+    tipo: str  # "busca" ou "geracao"
+    nome: str  # Algoritmo de busca ou de geração
+    fases_ns: Dict[str, int]  # Duração de cada fase (perf_counter_ns)
+    contadores: Dict[str, int]
+    memoria_pico: Dict[str, int] = field(default_factory=dict)  # Bytes por fase (só com memoria=True)
+    rotulos: Dict[str, str] = field(default_factory=dict)
+
+class CronometroFases:
+    """
+    Mede fases consecutivas: fechar(nome) encerra a fase em andamento com esse nome e
+    começa a próxima. Com memoria=True (e tracemalloc ligado), guarda também o pico de
+    memória alocada em cada fase.
+    """
+    __slots__ = ("duracoes", "picos_memoria", "memoria", "_inicio")
+
+    def __init__(self, memoria: bool = False):
+        self.duracoes: Dict[str, int] = {}
+        self.picos_memoria: Dict[str, int] = {}
+        self.memoria = memoria and tracemalloc.is_tracing()
+        if self.memoria:
+            tracemalloc.reset_peak()
+        self._inicio = time.perf_counter_ns()
+
+    def fechar(self, nome: str) -> None:
+        """Encerra a fase atual com o nome dado e começa a próxima."""
+        self.duracoes[nome] = time.perf_counter_ns() - self._inicio
+        if self.memoria:
+            self.picos_memoria[nome] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+        self._inicio = time.perf_counter_ns()
+
+class Instrumentacao:
+    """
+    Sessão de medição ligada por instrumentar(). Enquanto ela está ativa, cada
+    solucionador marcado com @instrumentado e cada gerar_labirinto publicam um
+    RegistroMedicao para os observadores (qualquer objeto com observar(registro)).
+    """
+    __slots__ = ("observadores", "memoria", "fronteiras", "medindo")
+
+    def __init__(self, observadores: List, memoria: bool = False):
+        self.observadores = observadores
+        self.memoria = memoria
+        self.fronteiras: List = []  # Fronteiras criadas durante a busca medida
+        self.medindo = False
+
+    def publicar(self, registro: RegistroMedicao) -> None:
+        """Entrega o registro a todos os observadores."""
+        for observador in self.observadores:
+            observador.observar(registro)
+
+# Sessão ativa no contexto atual (None: instrumentação desligada)
+_SESSAO: ContextVar[Optional[Instrumentacao]] = ContextVar("sessao_instrumentacao", default=None)
+
+def sessao_ativa() -> Optional[Instrumentacao]:
+    """Retorna a sessão de instrumentação ativa, ou None se estiver desligada."""
+    return _SESSAO.get()
+
+@contextmanager
+def instrumentar(*observadores, memoria: bool = False) -> Iterator[Instrumentacao]:
+    """
+    Liga a instrumentação para as chamadas feitas dentro do bloco.
+
+    Args:
+        observadores: Destinos dos registros (ObservadorMemoria, ObservadorJsonl, ObservadorPrometheus...)
+        memoria: Mede também o pico de memória de cada fase com tracemalloc (bem mais lento)
+    """
+    sessao = Instrumentacao(list(observadores), memoria)
+    ligou_tracemalloc = memoria and not tracemalloc.is_tracing()
+    if ligou_tracemalloc:
+        tracemalloc.start()
+    token = _SESSAO.set(sessao)
+    try:
+        yield sessao
+    finally:
+        _SESSAO.reset(token)
+        if ligou_tracemalloc:
+            tracemalloc.stop()
+
+def instrumentado(funcao: Callable) -> Callable:
+    """
+    Marca um solucionador (que retorna (caminho, MetricasBusca)) para ser medido quando
+    houver uma sessão ativa. Desligado, custa só a consulta à sessão. Chamadas aninhadas
+    (um solucionador que usa outro) são medidas uma vez, pela mais externa.
+    """
+    @functools.wraps(funcao)
+    def medir(*args, **kwargs):
+        sessao = _SESSAO.get()
+        if sessao is None or sessao.medindo:
+            return funcao(*args, **kwargs)
+        sessao.medindo = True
+        sessao.fronteiras = []
+        try:
+            cronometro = CronometroFases(sessao.memoria)
+            caminho, metricas = funcao(*args, **kwargs)
+            cronometro.fechar("busca")
+        finally:
+            sessao.medindo = False
+        contadores = {nome: getattr(metricas, nome) for nome in CONTADORES_BUSCA}
+        contadores["pico_fronteira"] = sum(f.pico for f in sessao.fronteiras)
+        contadores["reexpansoes"] = sum(f.reexpansoes for f in sessao.fronteiras)
+        sessao.fronteiras = []
+        sessao.publicar(RegistroMedicao(
+            "busca", metricas.algoritmo, cronometro.duracoes, contadores, cronometro.picos_memoria,
+            {"funcao": funcao.__name__, "caminho_encontrado": str(metricas.caminho_encontrado).lower()}
+        ))
+        return caminho, metricas
+    return medir
+
+class ObservadorMemoria:
+    """Guarda os registros numa lista (útil em testes e no console)."""
+
+    def __init__(self):
+        self.registros: List[RegistroMedicao] = []
+
+    def observar(self, registro: RegistroMedicao) -> None:
+        self.registros.append(registro)
+
+class ObservadorJsonl:
+    """Escreve cada registro como uma linha JSON num arquivo (acrescentando) ou stream."""
+
+    def __init__(self, destino: Union[str, TextIO]):
+        if isinstance(destino, str):
+            self.arquivo = open(destino, "a", encoding="utf-8")
+            self.proprio = True
+        else:
+            self.arquivo = destino
+            self.proprio = False
+
+    def observar(self, registro: RegistroMedicao) -> None:
+        self.arquivo.write(json.dumps(asdict(registro), ensure_ascii=False) + "\n")
+        self.arquivo.flush()
+
+    def fechar(self) -> None:
+        """Fecha o arquivo, se ele foi aberto por este observador."""
+        if self.proprio:
+            self.arquivo.close()
+
+def _escapar_rotulo(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+class ObservadorPrometheus:
+    """
+    Acumula os registros em métricas no formato de texto do Prometheus: execuções,
+    segundos por fase e contadores são somados; o pico de memória guarda o maior valor.
+    texto() monta o dump e escrever(caminho) o grava de forma atômica (ex.: para o
+    textfile collector do node_exporter).
+    """
+
+    def __init__(self, prefixo: str = "labirinto"):
+        self.prefixo = prefixo
+        self.execucoes: Dict[Tuple[str, str], int] = {}
+        self.segundos: Dict[Tuple[str, str, str], float] = {}
+        self.contadores: Dict[Tuple[str, str, str], int] = {}
+        self.memoria: Dict[Tuple[str, str, str], int] = {}
+
+    def observar(self, registro: RegistroMedicao) -> None:
+        chave = (registro.tipo, registro.nome)
+        self.execucoes[chave] = self.execucoes.get(chave, 0) + 1
+        for fase, duracao in registro.fases_ns.items():
+            self.segundos[chave + (fase,)] = self.segundos.get(chave + (fase,), 0.0) + duracao / 1e9
+        for nome, valor in registro.contadores.items():
+            self.contadores[chave + (nome,)] = self.contadores.get(chave + (nome,), 0) + valor
+        for fase, pico in registro.memoria_pico.items():
+            self.memoria[chave + (fase,)] = max(self.memoria.get(chave + (fase,), 0), pico)
+
+    def texto(self) -> str:
+        """Dump das métricas acumuladas no formato de exposição de texto."""
+        p = self.prefixo
+        linhas = []
+
+        def metrica(nome: str, tipo: str, ajuda: str, valores: Dict[Tuple, float], rotulos: Tuple[str, ...]) -> None:
+            if not valores:
+                return
+            linhas.append(f"# HELP {p}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {p}_{nome} {tipo}")
+            for chave, valor in sorted(valores.items()):
+                texto_rotulos = ",".join(f'{r}="{_escapar_rotulo(v)}"' for r, v in zip(rotulos, chave))
+                linhas.append(f"{p}_{nome}{{{texto_rotulos}}} {valor}")
+
+        metrica("execucoes_total", "counter", "Chamadas medidas.", self.execucoes, ("tipo", "nome"))
+        metrica("fase_segundos_total", "counter", "Tempo somado por fase.", self.segundos,
+                ("tipo", "nome", "fase"))
+        metrica("eventos_total", "counter", "Contadores somados (inserções, remoções, nós...).",
+                self.contadores, ("tipo", "nome", "contador"))
+        metrica("memoria_pico_bytes", "gauge", "Maior pico de memória alocada por fase.", self.memoria,
+                ("tipo", "nome", "fase"))
+        return "\n".join(linhas) + "\n" if linhas else ""
+
+    def escrever(self, caminho_arquivo: str) -> None:
+        """Grava o dump num arquivo, trocando-o de uma vez (sem leituras parciais)."""
+        temporario = caminho_arquivo + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.texto())
+        os.replace(temporario, caminho_arquivo)
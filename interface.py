@@ -2,11 +2,15 @@ import os
 import sys
 import termios
 import tty
-from typing import Optional, List, Tuple
+from contextlib import contextmanager
+from typing import Iterator, Optional, List, Tuple, Union
 
 from constantes import *
 from algoritmos import Labirinto, Posicao, MetricasBusca
+from grade import Caminho, GradeLabirinto, como_grade
+from janela import janela_do_terminal
 from labirinto import imprimir_labirinto
+from visualizacao import TelaGrade
 
 def limpar_tela() -> None:
     """Limpa a tela do terminal."""
@@ -23,6 +27,21 @@ def get_key() -> str:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
     return ch
 
+@contextmanager
+def modo_bruto() -> Iterator[None]:
+    """Deixa o terminal em modo bruto durante todo o bloco (restaura ao sair)."""
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setraw(fd)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+def ler_tecla() -> str:
+    """Lê uma tecla sem trocar o modo do terminal (use dentro de modo_bruto())."""
+    return sys.stdin.read(1)
+
 def imprimir_cabecalho_labirinto(numero_labirinto: int) -> None:
     """Imprime o cabeçalho do labirinto com cores."""
     print(f"\n{COR_TITULO}{'=' * 40}")
@@ -39,11 +58,32 @@ def imprimir_metricas(metricas) -> None:
     print(f"✓ Caminho encontrado: {encontrado}")
     print(f"✓ Comprimento do caminho: {COR_DESTAQUE}{metricas.comprimento_caminho} passos{RESET_COR}")
     print(f"✓ Nós visitados: {COR_INFO}{metricas.nos_visitados}{RESET_COR}")
-    print(f"✓ Tempo de execução: {COR_INFO}{metricas.tempo_execucao:.4f} segundos{RESET_COR}")
+    if metricas.insercoes:
+        print(f"✓ Fronteira: {COR_INFO}{metricas.insercoes} inserções, {metricas.remocoes} remoções "
+              f"({metricas.remocoes_obsoletas} obsoletas){RESET_COR}")
+    if metricas.pico_nos:
+        print(f"✓ Pico de nós na memória: {COR_INFO}{metricas.pico_nos}{RESET_COR}")
+    if metricas.nos_atualizados:
+        print(f"✓ Nós atualizados (replanejamento): {COR_INFO}{metricas.nos_atualizados}{RESET_COR}")
+    if metricas.do_cache:
+        print(f"✓ Tempo de execução: {COR_INFO}{metricas.tempo_execucao:.4f} segundos "
+              f"(resultado do cache; tempo da execução original){RESET_COR}")
+    else:
+        print(f"✓ Tempo de execução: {COR_INFO}{metricas.tempo_execucao:.4f} segundos{RESET_COR}")
     print(f"✓ Distância heurística (Manhattan): {COR_INFO}{metricas.distancia_heuristica}{RESET_COR}")
     
     print(f"{COR_TITULO}{'=' * 40}{RESET_COR}")
 
+def mostrar_labirinto(lab: Union[Labirinto, GradeLabirinto], caminho: Optional[Caminho] = None,
+                      foco: Optional[Posicao] = None) -> None:
+    """
+    Imprime o labirinto (e o caminho, se houver). Se não couber no terminal, imprime só
+    a janela em torno do foco (padrão: início do caminho) e um minimapa ao lado.
+    """
+    lab = como_grade(lab)
+    janela = janela_do_terminal(lab, linhas_reservadas=2)
+    imprimir_labirinto(lab, caminho, janela=janela, foco=foco, minimapa=True)
+
 def imprimir_placar(moedas_coletadas: int, total_moedas: int, passos: int) -> None:
     """Imprime o placar do jogo com cores."""
     print(f"\n{COR_TITULO}{'=' * 40}")
@@ -53,76 +93,85 @@ def imprimir_placar(moedas_coletadas: int, total_moedas: int, passos: int) -> No
     print(f"Passos: {COR_INFO}{passos}{RESET_COR}")
     print(f"{COR_TITULO}{'=' * 40}{RESET_COR}")
 
-def jogar_manualmente(lab: List[List[str]], pos_inicio: Tuple[int, int], 
+def jogar_manualmente(lab: Union[Labirinto, GradeLabirinto], pos_inicio: Tuple[int, int], 
                      pos_fim: Tuple[int, int], total_moedas: int) -> None:
-    """Permite jogar o labirinto manualmente."""
-    from copy import deepcopy
+    """
+    Permite jogar o labirinto manualmente. O labirinto é desenhado uma vez e cada tecla
+    redesenha só as células que mudaram (TelaGrade), com o terminal em modo bruto
+    durante toda a partida; o tempo por tecla não depende do tamanho do labirinto.
+    Se o labirinto não couber no terminal, a tela mostra uma janela que acompanha o
+    jogador, com um minimapa do labirinto inteiro ao lado.
+    """
+    lab = como_grade(lab)
     
-    # Inicializa o estado do jogo
-    lab_jogo = deepcopy(lab)
+    # Inicializa o estado do jogo (moedas coletadas ficam anotadas, sem copiar a grade)
     pos_atual = pos_inicio
     movimentos = 0
-    moedas_coletadas = 0
+    coletadas = set()
     historico_posicoes = [pos_inicio]
+    mensagem = "Use WASD para mover, Q para sair"
+    
+    def codigo_da_celula(pos: Tuple[int, int]) -> int:
+        codigo = lab[pos]
+        return CEL_CAMINHO if codigo == CEL_MOEDA and pos in coletadas else codigo
     
-    print("\nUse WASD para mover, Q para sair")
+    janela = janela_do_terminal(lab, linhas_reservadas=4)
+    tela = TelaGrade(lab, linhas_status=3, janela=janela, minimapa=janela is not None)
+    with modo_bruto():
+        try:
+            tela.desenhar_tudo()
+            while True:
+                # Atualiza o labirinto
+                if lab[pos_atual] == CEL_MOEDA and pos_atual not in coletadas:
+                    coletadas.add(pos_atual)
+                    mensagem = "Moeda coletada!"
+                tela.alterar(lab.indice(*pos_atual), CEL_JOGADOR)
+                tela.seguir(pos_atual)
+                
+                # Mostra o estado
+                tela.apresentar((f"Movimentos: {movimentos}",
+                                 f"Moedas: {len(coletadas)}/{total_moedas}", mensagem))
+                mensagem = ""
+                
+                # Verifica vitória
+                if pos_atual == pos_fim and len(coletadas) == total_moedas:
+                    final = f"Parabéns! Você venceu em {movimentos} movimentos!"
+                    break
+                
+                # Lê movimento
+                movimento = ler_tecla().lower()
+                
+                if movimento in ('q', '\x03'):
+                    final = "Jogo encerrado!"
+                    break
+                
+                # Processa movimento
+                nova_pos = pos_atual
+                if movimento == CIMA and pos_atual[0] > 0:
+                    nova_pos = (pos_atual[0] - 1, pos_atual[1])
+                elif movimento == BAIXO and pos_atual[0] < lab.altura - 1:
+                    nova_pos = (pos_atual[0] + 1, pos_atual[1])
+                elif movimento == ESQUERDA and pos_atual[1] > 0:
+                    nova_pos = (pos_atual[0], pos_atual[1] - 1)
+                elif movimento == DIREITA and pos_atual[1] < lab.largura - 1:
+                    nova_pos = (pos_atual[0], pos_atual[1] + 1)
+                
+                # Verifica movimento
+                if lab[nova_pos] != CEL_PAREDE:
+                    tela.alterar(lab.indice(*pos_atual), codigo_da_celula(pos_atual))
+                    pos_atual = nova_pos
+                    historico_posicoes.append(pos_atual)
+                    
+                    if lab[nova_pos] == CEL_BARREIRA:
+                        mensagem = "Barreira! Recuando..."
+                        recuo = min(RECUO_BARREIRA, len(historico_posicoes) - 1)
+                        for _ in range(recuo):
+                            historico_posicoes.pop()
+                        pos_atual = historico_posicoes[-1]
+                        movimentos += CUSTO_BARREIRA
+                    else:
+                        movimentos += CUSTO_NORMAL
+        finally:
+            tela.encerrar()
     
-    while True:
-        # Limpa a tela
-        os.system('cls' if os.name == 'nt' else 'clear')
-        
-        # Atualiza o labirinto
-        char_atual = lab_jogo[pos_atual[0]][pos_atual[1]]
-        if char_atual == MOEDA:
-            moedas_coletadas += 1
-            lab_jogo[pos_atual[0]][pos_atual[1]] = CAMINHO
-            print("\nMoeda coletada!")
-        
-        # Mostra o jogador
-        lab_jogo[pos_atual[0]][pos_atual[1]] = JOGADOR
-        
-        # Mostra o estado
-        print(f"\nMovimentos: {movimentos}")
-        print(f"Moedas: {moedas_coletadas}/{total_moedas}")
-        imprimir_labirinto(lab_jogo)
-        
-        # Restaura o estado
-        lab_jogo[pos_atual[0]][pos_atual[1]] = (CAMINHO if char_atual == MOEDA else char_atual)
-        
-        # Verifica vitória
-        if pos_atual == pos_fim and moedas_coletadas == total_moedas:
-            print(f"\nParabéns! Você venceu em {movimentos} movimentos!")
-            break
-        
-        # Lê movimento
-        movimento = get_key().lower()
-        
-        if movimento == 'q':
-            print("\nJogo encerrado!")
-            break
-        
-        # Processa movimento
-        nova_pos = pos_atual
-        if movimento == CIMA and pos_atual[0] > 0:
-            nova_pos = (pos_atual[0] - 1, pos_atual[1])
-        elif movimento == BAIXO and pos_atual[0] < len(lab) - 1:
-            nova_pos = (pos_atual[0] + 1, pos_atual[1])
-        elif movimento == ESQUERDA and pos_atual[1] > 0:
-            nova_pos = (pos_atual[0], pos_atual[1] - 1)
-        elif movimento == DIREITA and pos_atual[1] < len(lab[0]) - 1:
-            nova_pos = (pos_atual[0], pos_atual[1] + 1)
-        
-        # Verifica movimento
-        if lab[nova_pos[0]][nova_pos[1]] != PAREDE:
-            pos_atual = nova_pos
-            historico_posicoes.append(pos_atual)
-            
-            if lab[nova_pos[0]][nova_pos[1]] == BARREIRA:
-                print("\nBarreira! Recuando...")
-                recuo = min(RECUO_BARREIRA, len(historico_posicoes) - 1)
-                for _ in range(recuo):
-                    historico_posicoes.pop()
-                pos_atual = historico_posicoes[-1]
-                movimentos += CUSTO_BARREIRA
-            else:
-                movimentos += CUSTO_NORMAL 
\ No newline at end of file
+    print(f"\n{final}")
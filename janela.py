@@ -0,0 +1,158 @@
+import shutil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from colorama import Fore
+
+from constantes import *
+from grade import Posicao, Caminho, GradeLabirinto
+
+# Tons do minimapa, do bloco sem paredes ao bloco só de paredes
+TONS_MINIMAPA = " ░▒▓█"
+MARCA_FOCO = f"{COR_DESTAQUE}●"
+MARCA_FIM = f"{COR_ERRO}◆"
+MARCA_CAMINHO = f"{COR_ERRO}·"
+COR_DENTRO_JANELA = COR_TITULO  # Blocos que aparecem na janela
+COR_FORA_JANELA = Fore.BLUE
+
+# O minimapa ocupa no máximo 1/FRACAO_MINIMAPA das colunas, separado da janela por
+# ESPACO_MINIMAPA colunas (uma delas sobra para o emoji do fim, que tem largura dupla)
+FRACAO_MINIMAPA = 4
+ESPACO_MINIMAPA = 2
+
+def tamanho_terminal(linhas_reservadas: int = 0) -> Tuple[int, int]:
+    """Linhas e colunas do terminal que sobram para a grade."""
+    tamanho = shutil.get_terminal_size()
+    # Uma coluna a menos porque o emoji do fim ocupa duas
+    return max(1, tamanho.lines - linhas_reservadas), max(1, tamanho.columns - 1)
+
+def janela_do_terminal(grade: GradeLabirinto, linhas_reservadas: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Tamanho (altura, largura) da janela para mostrar a grade no terminal, ou None se a
+    grade inteira (com a borda de baixo) couber.
+    """
+    altura, largura = tamanho_terminal(linhas_reservadas)
+    if grade.altura + 1 <= altura and grade.largura <= largura:
+        return None
+    return altura - 1, largura
+
+def origem_janela(grade: GradeLabirinto, foco: Posicao, altura: int, largura: int) -> Posicao:
+    """Canto superior esquerdo de uma janela altura x largura centrada no foco, sem sair da grade."""
+    linha = min(max(foco[0] - altura // 2, 0), max(grade.altura - altura, 0))
+    coluna = min(max(foco[1] - largura // 2, 0), max(grade.largura - largura, 0))
+    return linha, coluna
+
+def codigos_janela(grade: GradeLabirinto, origem: Posicao, altura: int, largura: int,
+                   sobrepostas: Optional[Dict[int, int]] = None) -> bytearray:
+    """
+    Códigos das células visíveis na janela, linha a linha, com as sobreposições
+    (índice da grade -> código) aplicadas. Custa a área da janela mais o número de
+    sobreposições, não a área da grade.
+    """
+    linha0, coluna0 = origem
+    codigos = bytearray()
+    for linha in range(linha0, linha0 + altura):
+        inicio = linha * grade.largura + coluna0
+        codigos += grade.celulas[inicio:inicio + largura]
+    if sobrepostas:
+        for idx, codigo in sobrepostas.items():
+            linha, coluna = divmod(idx, grade.largura)
+            if linha0 <= linha < linha0 + altura and coluna0 <= coluna < coluna0 + largura:
+                codigos[(linha - linha0) * largura + coluna - coluna0] = codigo
+    return codigos
+
+def renderizar_codigos(codigos: Iterable[int]) -> str:
+    """Monta a string colorida de uma sequência de códigos."""
+    return "".join(CARACTERES_CELULA[c] for c in codigos)
+
+def destaques_do_caminho(grade: GradeLabirinto, caminho: Caminho,
+                         codigo: int = CEL_SOLUCAO) -> Dict[int, int]:
+    """Sobreposições que desenham o caminho (como marcar_caminho_no_labirinto, sem copiar a grade)."""
+    destaques = {}
+    for linha, coluna in caminho:
+        idx = linha * grade.largura + coluna
+        if grade.celulas[idx] not in (CEL_INICIO, CEL_FIM):
+            destaques[idx] = codigo
+    return destaques
+
+class Minimapa:
+    """
+    Visão reduzida da grade inteira: cada caractere resume um bloco de células pela
+    fração de paredes (TONS_MINIMAPA). Os resumos são calculados uma vez por versão da
+    grade; depois, desenhar o minimapa custa o tamanho dele, não a área do labirinto.
+    """
+    __slots__ = ("grade", "altura", "largura", "bloco_altura", "bloco_largura", "tons", "fins", "versao")
+
+    def __init__(self, grade: GradeLabirinto, altura_max: int, largura_max: int):
+        self.grade = grade
+        self.bloco_altura = -(-grade.altura // max(1, altura_max))
+        self.bloco_largura = -(-grade.largura // max(1, largura_max))
+        self.altura = -(-grade.altura // self.bloco_altura)
+        self.largura = -(-grade.largura // self.bloco_largura)
+        self.tons = bytearray(self.altura * self.largura)
+        self.fins: List[int] = []
+        self.versao = -1
+
+    @classmethod
+    def para_janela(cls, grade: GradeLabirinto, altura: int, largura: int) -> "Minimapa":
+        """Minimapa que cabe ao lado de uma janela altura x largura (em até 1/FRACAO_MINIMAPA das colunas)."""
+        return cls(grade, altura, max(1, largura // FRACAO_MINIMAPA))
+
+    def bloco(self, pos: Posicao) -> int:
+        """Índice do bloco que contém a posição."""
+        return (pos[0] // self.bloco_altura) * self.largura + pos[1] // self.bloco_largura
+
+    def _resumir(self) -> None:
+        """Conta as paredes de cada bloco (uma passada pela grade, só quando ela muda)."""
+        grade = self.grade
+        if self.versao == grade.versao:
+            return
+        bh, bw, largura = self.bloco_altura, self.bloco_largura, self.largura
+        paredes = [0] * (self.altura * largura)
+        parede = bytes([CEL_PAREDE])
+        for linha in range(grade.altura):
+            trecho = bytes(grade.celulas[linha * grade.largura:(linha + 1) * grade.largura])
+            base = (linha // bh) * largura
+            for bc in range(largura):
+                paredes[base + bc] += trecho.count(parede, bc * bw, (bc + 1) * bw)
+        ultimo_tom = len(TONS_MINIMAPA) - 1
+        for b in range(len(paredes)):
+            bl, bc = divmod(b, largura)
+            celulas = (min(bh, grade.altura - bl * bh) * min(bw, grade.largura - bc * bw))
+            self.tons[b] = round(paredes[b] * ultimo_tom / celulas)
+        self.fins = [self.bloco(pos) for pos in grade.posicoes_com(CEL_FIM)]
+        self.versao = grade.versao
+
+    def linhas(self, janela: Optional[Tuple[int, int, int, int]] = None, foco: Optional[Posicao] = None,
+               caminho: Caminho = ()) -> List[str]:
+        """
+        Linhas coloridas do minimapa.
+
+        Args:
+            janela: (linha, coluna, altura, largura) da parte visível, destacada em outra cor
+            foco: Posição marcada com MARCA_FOCO (ex.: o jogador)
+            caminho: Posições marcadas com MARCA_CAMINHO
+
+        Returns:
+            Uma string por linha do minimapa
+        """
+        self._resumir()
+        marcas = {self.bloco(pos): MARCA_CAMINHO for pos in caminho}
+        for b in self.fins:
+            marcas[b] = MARCA_FIM
+        if foco is not None:
+            marcas[self.bloco(foco)] = MARCA_FOCO
+        if janela is not None:
+            linha0, coluna0, altura, largura = janela
+            bl0, bl1 = linha0 // self.bloco_altura, (linha0 + altura - 1) // self.bloco_altura
+            bc0, bc1 = coluna0 // self.bloco_largura, (coluna0 + largura - 1) // self.bloco_largura
+        else:
+            bl0 = bl1 = bc0 = bc1 = -1
+        linhas = []
+        for bl in range(self.altura):
+            partes = []
+            for bc in range(self.largura):
+                b = bl * self.largura + bc
+                cor = COR_DENTRO_JANELA if bl0 <= bl <= bl1 and bc0 <= bc <= bc1 else COR_FORA_JANELA
+                partes.append(marcas.get(b) or f"{cor}{TONS_MINIMAPA[self.tons[b]]}")
+            linhas.append("".join(partes) + RESET_COR)
+        return linhas
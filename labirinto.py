@@ -1,220 +1,474 @@
+import itertools
 import random
-from typing import List, Tuple, Optional
+from array import array
+from collections import deque
+from typing import List, Tuple, Optional, Union
 
 from constantes import *
 from algoritmos import Labirinto, Posicao, Caminho, esta_dentro_limites
+from grade import GradeLabirinto, como_grade
+from geradores import ALGORITMOS_GERACAO, abrir_paredes_linha, sortear_celulas
+from instrumentacao import CronometroFases, RegistroMedicao, sessao_ativa
+from janela import (Minimapa, ESPACO_MINIMAPA, origem_janela, codigos_janela, renderizar_codigos,
+                    destaques_do_caminho)
 
-def imprimir_labirinto(lab: Labirinto) -> None:
-    """Imprime o labirinto no terminal."""
-    for linha in lab:
-        print("".join(linha))
-    print("█" * len(lab[0]))
+def imprimir_labirinto(lab: Union[Labirinto, GradeLabirinto], caminho: Optional[Caminho] = None,
+                       janela: Optional[Tuple[int, int]] = None, foco: Optional[Posicao] = None,
+                       minimapa: bool = False) -> None:
+    """
+    Imprime o labirinto no terminal.
+
+    Args:
+        lab: Labirinto a imprimir
+        caminho: Caminho desenhado por cima do labirinto (sem copiá-lo)
+        janela: (altura, largura) da parte mostrada; None imprime o labirinto inteiro
+        foco: Posição no centro da janela (padrão: início do caminho ou canto superior esquerdo)
+        minimapa: Mostra ao lado da janela um resumo do labirinto inteiro
+    """
+    lab = como_grade(lab)
+    sobrepostas = destaques_do_caminho(lab, caminho) if caminho else None
+    if janela is None:
+        if sobrepostas is None:
+            for i in range(lab.altura):
+                print(lab.renderizar_linha(i))
+            print("█" * lab.largura)
+            return
+        altura, largura, mapa = lab.altura, lab.largura, None
+    else:
+        altura, largura = janela
+        mapa = Minimapa.para_janela(lab, altura, largura) if minimapa else None
+        if mapa is not None:
+            largura -= mapa.largura + ESPACO_MINIMAPA
+        altura, largura = min(altura, lab.altura), max(1, min(largura, lab.largura))
+    if foco is None:
+        foco = caminho[0] if caminho else (0, 0)
+    origem = origem_janela(lab, foco, altura, largura)
+    codigos = codigos_janela(lab, origem, altura, largura, sobrepostas)
+    linhas_mapa = mapa.linhas((origem[0], origem[1], altura, largura), foco, caminho or ()) if mapa else []
+    for i in range(altura):
+        linha = renderizar_codigos(codigos[i * largura:(i + 1) * largura])
+        if i < len(linhas_mapa):
+            # O emoji do fim ocupa duas colunas e já consome um dos espaços
+            espacos = ESPACO_MINIMAPA - (CEL_FIM in codigos[i * largura:(i + 1) * largura])
+            linha += " " * espacos + linhas_mapa[i]
+        print(linha)
+    print("█" * largura)
 
-def existe_caminho(lab: Labirinto, inicio: Posicao, destino: Posicao, considerar_barreiras: bool = False) -> bool:
+def existe_caminho(lab: GradeLabirinto, inicio: Posicao, destino: Posicao, considerar_barreiras: bool = False) -> bool:
     """Verifica se existe um caminho entre dois pontos no labirinto."""
     if inicio == destino:
         return True
-        
-    visitados = {inicio}
-    fila = [inicio]
+    
+    altura, largura, celulas = lab.altura, lab.largura, lab.celulas
+    num_celulas = altura * largura
+    # Se estamos considerando barreiras, elas são tratadas como paredes
+    bloqueios = (CEL_PAREDE, CEL_BARREIRA) if considerar_barreiras else (CEL_PAREDE,)
+    origem, alvo = lab.indice(*inicio), lab.indice(*destino)
+    visitados = bytearray(num_celulas)
+    visitados[origem] = 1
+    fila = deque([origem])
     
     while fila:
-        atual = fila.pop(0)
-        
-        for dl, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # direita, baixo, esquerda, cima
-            prox_lin = atual[0] + dl
-            prox_col = atual[1] + dc
-            prox_pos = (prox_lin, prox_col)
-            
-            if (esta_dentro_limites(prox_pos, len(lab), len(lab[0])) and
-                prox_pos not in visitados):
-                
-                # Se estamos considerando barreiras, elas são tratadas como paredes
-                if considerar_barreiras:
-                    if lab[prox_lin][prox_col] in [PAREDE, BARREIRA]:
-                        continue
-                else:
-                    if lab[prox_lin][prox_col] == PAREDE:
-                        continue
-                
-                if prox_pos == destino:
+        atual = fila.popleft()
+        coluna = atual % largura
+        # direita, baixo, esquerda, cima
+        for prox, valido in ((atual + 1, coluna + 1 < largura), (atual + largura, atual + largura < num_celulas),
+                             (atual - 1, coluna > 0), (atual - largura, atual >= largura)):
+            if valido and not visitados[prox] and celulas[prox] not in bloqueios:
+                if prox == alvo:
                     return True
-                    
-                visitados.add(prox_pos)
-                fila.append(prox_pos)
+                visitados[prox] = 1
+                fila.append(prox)
     
     return False
 
-def adicionar_caminhos_extras(lab: Labirinto, chance_remover_parede: float = 0.3) -> None:
+def sortear_posicoes(lab: GradeLabirinto, codigo: int, quantidade: int, rng: random.Random) -> List[Posicao]:
+    """
+    Sorteia `quantidade` posições distintas com `codigo`, como
+    rng.sample(lab.posicoes_com(codigo), quantidade). Quando essas células são pelo menos
+    1/8 da grade, sorteia índices e rejeita os de outro código, sem listar a grade.
+    """
+    celulas = lab.celulas
+    num_celulas = len(celulas)
+    total = celulas.count(codigo)
+    if total < quantidade or 8 * total < num_celulas:
+        return rng.sample(lab.posicoes_com(codigo), quantidade)
+    escolhidos: List[int] = []
+    while len(escolhidos) < quantidade:
+        idx = rng.randrange(num_celulas)
+        if celulas[idx] == codigo and idx not in escolhidos:
+            escolhidos.append(idx)
+    return [divmod(idx, lab.largura) for idx in escolhidos]
+
+def marcar_alcancaveis(lab: GradeLabirinto, inicio: Posicao, considerar_barreiras: bool = False) -> bytearray:
+    """
+    Faz uma única busca em largura a partir de `inicio` e marca com 1 as células alcançáveis.
+    O resultado é indexado pelo índice linear da célula.
+    """
+    altura, largura, celulas = lab.altura, lab.largura, lab.celulas
+    bloqueios = (CEL_PAREDE, CEL_BARREIRA) if considerar_barreiras else (CEL_PAREDE,)
+    alcancaveis = bytearray(altura * largura)
+    origem = lab.indice(*inicio)
+    alcancaveis[origem] = 1
+    fila = deque([origem])
+    
+    while fila:
+        atual = fila.popleft()
+        coluna = atual % largura
+        for prox, valido in ((atual + 1, coluna + 1 < largura), (atual + largura, atual + largura < altura * largura),
+                             (atual - 1, coluna > 0), (atual - largura, atual >= largura)):
+            if valido and not alcancaveis[prox] and celulas[prox] not in bloqueios:
+                alcancaveis[prox] = 1
+                fila.append(prox)
+    
+    return alcancaveis
+
+def rota_mais_curta(lab: GradeLabirinto, origem: int, destino: int) -> Optional[List[int]]:
+    """
+    Busca em largura de `origem` a `destino` (índices lineares) tratando barreiras como
+    paredes e retorna a rota com menos passos, ou None se não houver.
+    """
+    if origem == destino:
+        return [origem]
+    altura, largura, celulas = lab.altura, lab.largura, lab.celulas
+    num_celulas = altura * largura
+    pai = array("i", [-1]) * num_celulas
+    pai[origem] = origem
+    fila = deque([origem])
+    
+    while fila:
+        atual = fila.popleft()
+        coluna = atual % largura
+        for prox, valido in ((atual + 1, coluna + 1 < largura), (atual + largura, atual + largura < num_celulas),
+                             (atual - 1, coluna > 0), (atual - largura, atual >= largura)):
+            if valido and pai[prox] == -1 and celulas[prox] not in (CEL_PAREDE, CEL_BARREIRA):
+                pai[prox] = atual
+                if prox == destino:
+                    rota = [destino]
+                    while rota[-1] != origem:
+                        rota.append(pai[rota[-1]])
+                    rota.reverse()
+                    return rota
+                fila.append(prox)
+    
+    return None
+
+def analisar_rota(lab: GradeLabirinto, inicio: Posicao, fim: Posicao) -> Tuple[bytearray, Optional[List[int]], int]:
+    """
+    Analisa a conectividade entre início e fim com uma DFS iterativa (Tarjan) e uma
+    busca em largura, tratando barreiras como paredes.
+    
+    Os valores `low` de Tarjan dão os pontos de articulação que separam início e fim:
+    as células por onde toda rota passa, que nunca podem receber barreira. Início e fim
+    também entram na máscara. A busca em largura dá a rota mais curta, usada como
+    rota de referência (mantê-la livre garante que o fim continua alcançável).
+    
+    Returns:
+        (separadores, rota, gargalos): máscara dos separadores indexada pelo índice linear,
+        a rota de referência em índices lineares (None se o fim não é alcançável) e o
+        número de pontos de articulação entre início e fim.
+    """
+    altura, largura, celulas = lab.altura, lab.largura, lab.celulas
+    num_celulas = altura * largura
+    origem, destino = lab.indice(*inicio), lab.indice(*fim)
+    
+    descoberta = array("i", bytes(4 * num_celulas))  # 0 = ainda não visitada
+    menor = array("i", bytes(4 * num_celulas))
+    pai = array("i", [-1]) * num_celulas
+    proxima_direcao = bytearray(num_celulas)
+    
+    contador = 1
+    descoberta[origem] = menor[origem] = contador
+    pilha = [origem]
+    
+    while pilha:
+        atual = pilha[-1]
+        direcao = proxima_direcao[atual]
+        if direcao < 4:
+            proxima_direcao[atual] = direcao + 1
+            coluna = atual % largura
+            # direita, baixo, esquerda, cima
+            if direcao == 0:
+                prox = atual + 1 if coluna + 1 < largura else -1
+            elif direcao == 1:
+                prox = atual + largura if atual + largura < num_celulas else -1
+            elif direcao == 2:
+                prox = atual - 1 if coluna > 0 else -1
+            else:
+                prox = atual - largura
+            if prox < 0 or celulas[prox] in (CEL_PAREDE, CEL_BARREIRA):
+                continue
+            if not descoberta[prox]:
+                contador += 1
+                descoberta[prox] = menor[prox] = contador
+                pai[prox] = atual
+                pilha.append(prox)
+            elif prox != pai[atual] and descoberta[prox] < menor[atual]:
+                menor[atual] = descoberta[prox]
+        else:
+            pilha.pop()
+            anterior = pai[atual]
+            if anterior != -1 and menor[atual] < menor[anterior]:
+                menor[anterior] = menor[atual]
+    
+    separadores = bytearray(num_celulas)
+    separadores[origem] = separadores[destino] = 1
+    gargalos = 0
+    if not descoberta[destino]:
+        return separadores, None, gargalos
+    
+    # Sobe da saída até o início pela árvore da DFS: um ancestral v da saída separa
+    # início e fim quando o filho dele nesse trajeto não alcança nada acima de v
+    filho = destino
+    atual = pai[destino]
+    while atual != -1:
+        if atual != origem and menor[filho] >= descoberta[atual]:
+            separadores[atual] = 1
+            gargalos += 1
+        filho = atual
+        atual = pai[atual]
+    
+    return separadores, rota_mais_curta(lab, origem, destino), gargalos
+
+def desviar_rota(lab: GradeLabirinto, rota: List[int], bloqueada: int) -> Optional[List[int]]:
+    """
+    Conserta a rota de referência depois que a célula `bloqueada` (da rota) recebeu
+    barreira: busca o desvio mais curto entre as vizinhas dela na rota e retorna a nova
+    rota, sem ciclos, ou None se o fim deixou de ser alcançável.
+    """
+    posicao = rota.index(bloqueada)
+    desvio = rota_mais_curta(lab, rota[posicao - 1], rota[posicao + 1])
+    if desvio is None:
+        return None
+    # Apaga os ciclos que o desvio possa formar com o resto da rota
+    nova_rota: List[int] = []
+    posicoes = {}
+    for celula in itertools.chain(rota[:posicao - 1], desvio, rota[posicao + 2:]):
+        if celula in posicoes:
+            for removida in nova_rota[posicoes[celula] + 1:]:
+                del posicoes[removida]
+            del nova_rota[posicoes[celula] + 1:]
+        else:
+            posicoes[celula] = len(nova_rota)
+            nova_rota.append(celula)
+    return nova_rota
+
+def adicionar_caminhos_extras(lab: GradeLabirinto, chance_remover_parede: float = 0.3,
+                              rng: Optional[random.Random] = None) -> None:
     """
     Adiciona caminhos extras ao labirinto removendo algumas paredes aleatoriamente.
     
     Args:
         lab: O labirinto a ser modificado
         chance_remover_parede: Probabilidade de remover uma parede (entre 0 e 1)
+        rng: Gerador aleatório a usar (por padrão, o módulo random global)
     """
-    altura = len(lab)
-    largura = len(lab[0])
-    
-    # Percorre o labirinto procurando paredes que podem ser removidas
-    for i in range(1, altura - 1):
-        for j in range(1, largura - 1):
-            if lab[i][j] == PAREDE:
-                # Conta quantos caminhos existem ao redor desta parede
-                caminhos_adjacentes = 0
-                paredes_adjacentes = 0
-                
-                for di, dj in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    if lab[i + di][j + dj] == CAMINHO:
-                        caminhos_adjacentes += 1
-                    elif lab[i + di][j + dj] == PAREDE:
-                        paredes_adjacentes += 1
-                
-                # Só remove a parede se:
-                # 1. Tiver pelo menos 2 paredes adjacentes (para manter estrutura)
-                # 2. Tiver no máximo 2 caminhos adjacentes (para evitar muito espaço aberto)
-                # 3. Passar no teste de probabilidade
-                if (paredes_adjacentes >= 2 and caminhos_adjacentes <= 2 and 
-                    random.random() < chance_remover_parede):
-                    lab[i][j] = CAMINHO
+    rng = rng or random
+    largura = lab.largura
+    celulas = memoryview(lab.celulas)
+    
+    # Percorre o labirinto linha a linha procurando paredes que podem ser removidas.
+    # Só remove a parede se:
+    # 1. Tiver pelo menos 2 paredes adjacentes (para manter estrutura)
+    # 2. Tiver no máximo 2 caminhos adjacentes (para evitar muito espaço aberto)
+    # 3. Passar no teste de probabilidade
+    # Cada linha é processada inteira de uma vez (ver abrir_paredes_linha)
+    for i in range(1, lab.altura - 1):
+        inicio = i * largura
+        abrir_paredes_linha(
+            celulas[inicio - largura:inicio], celulas[inicio:inicio + largura],
+            celulas[inicio + largura:inicio + 2 * largura], chance_remover_parede, rng
+        )
+    lab.marcar_modificada()
 
-def marcar_caminho_no_labirinto(lab_original: Labirinto, caminho: Caminho, char_caminho: str = CAMINHO_SOLUCAO) -> Labirinto:
+def marcar_caminho_no_labirinto(lab_original: Union[Labirinto, GradeLabirinto], caminho: Caminho,
+                                codigo_caminho: int = CEL_SOLUCAO) -> GradeLabirinto:
     """Marca o caminho encontrado no labirinto."""
-    lab_copia = [linha[:] for linha in lab_original]
+    lab_copia = como_grade(lab_original).copiar()
     
-    for l, c in caminho:
-        if lab_copia[l][c] not in {INICIO, FIM}:
-            lab_copia[l][c] = char_caminho
+    for pos in caminho:
+        if lab_copia[pos] not in (CEL_INICIO, CEL_FIM):
+            lab_copia[pos] = codigo_caminho
     
     return lab_copia
 
-def gerar_labirinto_prim(altura: int, largura: int, num_moedas: int = 5) -> Tuple[Labirinto, Posicao, Posicao, List[Posicao]]:
+def gerar_labirinto(altura: int, largura: int, num_moedas: int = 5, algoritmo: str = "prim",
+                    semente: Optional[int] = None, chance_remover_parede: float = 0.4,
+                    chance_barreira: float = 0.05,
+                    verboso: bool = True) -> Tuple[GradeLabirinto, Posicao, Posicao, List[Posicao]]:
     """
-    Gera um labirinto usando o algoritmo de Prim modificado.
-    Retorna o labirinto, as posições de início e fim e as posições das moedas.
+    Gera um labirinto com o algoritmo de escavação escolhido e aplica o pós-processamento
+    comum (caminhos extras, início e fim, barreiras e moedas).
+    Retorna o labirinto (como GradeLabirinto), as posições de início e fim e as posições das moedas.
+    Com a instrumentação ligada, publica o tempo de cada fase e os contadores da geração.
     
     Args:
         altura: Altura do labirinto
         largura: Largura do labirinto
         num_moedas: Número de moedas a serem colocadas
+        algoritmo: Nome do algoritmo em ALGORITMOS_GERACAO (prim, kruskal, backtracking,
+            arvore_binaria ou sidewinder)
+        semente: Semente do gerador aleatório; a mesma semente reproduz o mesmo labirinto
+        chance_remover_parede: Probabilidade usada em adicionar_caminhos_extras
+        chance_barreira: Probabilidade de cada caminho sorteado receber uma barreira
+        verboso: Imprime o relatório da geração (semente, barreiras e tempo por fase)
     """
-    # Inicializa o labirinto com paredes
-    lab = [[PAREDE for _ in range(largura)] for _ in range(altura)]
-    
-    # Escolhe uma célula inicial (sempre em posição ímpar para manter a estrutura)
-    lin_atual = random.randrange(1, altura - 1, 2)
-    col_atual = random.randrange(1, largura - 1, 2)
-    lab[lin_atual][col_atual] = CAMINHO
-    
-    # Lista de muros fronteira (muro, célula_adjacente)
-    muros_fronteira = []
-    
-    def adicionar_muros_fronteira(lin: int, col: int) -> None:
-        """Adiciona muros adjacentes à célula atual à lista de fronteira."""
-        direcoes = [(0, 2), (2, 0), (0, -2), (-2, 0)]  # direita, baixo, esquerda, cima
-        for dl, dc in direcoes:
-            lin_adj = lin + dl
-            col_adj = col + dc
-            if esta_dentro_limites((lin_adj, col_adj), altura, largura):
-                # O muro está entre a célula atual e a adjacente
-                lin_muro = lin + dl // 2
-                col_muro = col + dc // 2
-                muros_fronteira.append((lin_muro, col_muro, lin_adj, col_adj))
-    
-    # Adiciona os muros iniciais
-    adicionar_muros_fronteira(lin_atual, col_atual)
-    
-    # Enquanto houver muros na fronteira
-    while muros_fronteira:
-        # Escolhe um muro aleatório
-        idx_muro = random.randrange(len(muros_fronteira))
-        lin_m, col_m, lin_a, col_a = muros_fronteira.pop(idx_muro)
-        
-        # Se a célula adjacente ainda for parede
-        if lab[lin_a][col_a] == PAREDE:
-            # Remove o muro (transforma em caminho)
-            lab[lin_m][col_m] = CAMINHO
-            lab[lin_a][col_a] = CAMINHO
-            # Adiciona os novos muros fronteira
-            adicionar_muros_fronteira(lin_a, col_a)
+    if algoritmo not in ALGORITMOS_GERACAO:
+        raise ValueError(
+            f"Algoritmo de geração desconhecido: {algoritmo!r} "
+            f"(disponíveis: {', '.join(ALGORITMOS_GERACAO)})"
+        )
+    if altura < 3 or largura < 3:
+        raise ValueError("O labirinto precisa ter pelo menos 3x3 células")
+    
+    # Gerador próprio: não depende nem altera o estado global do módulo random
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+    rng = random.Random(semente)
+    
+    sessao = sessao_ativa()
+    fases = CronometroFases(memoria=sessao is not None and sessao.memoria)
+    
+    # Inicializa o labirinto com paredes e escava as passagens
+    lab = GradeLabirinto(altura, largura, preenchimento=CEL_PAREDE)
+    ALGORITMOS_GERACAO[algoritmo](lab, rng)
+    
+    fases.fechar("Escavação")
     
     # Adiciona caminhos extras para tornar o labirinto mais aberto
-    adicionar_caminhos_extras(lab, chance_remover_parede=0.4)  # Aumentei a chance de remover paredes
+    adicionar_caminhos_extras(lab, chance_remover_parede, rng)
+    fases.fechar("Caminhos extras")
     
     # Escolhe pontos de início e fim aleatoriamente entre os caminhos disponíveis
-    caminhos_disponiveis = [(i, j) for i in range(altura) for j in range(largura) 
-                           if lab[i][j] == CAMINHO]
-    
     # Tenta encontrar pontos de início e fim que tenham um caminho válido entre eles
     max_tentativas = 50
     for _ in range(max_tentativas):
-        inicio, fim = random.sample(caminhos_disponiveis, 2)
+        inicio, fim = sortear_posicoes(lab, CEL_CAMINHO, 2, rng)
         if existe_caminho(lab, inicio, fim):
             break
     else:
         # Se não encontrou após várias tentativas, cria um caminho direto
-        inicio = random.choice(caminhos_disponiveis)
-        fim = random.choice(caminhos_disponiveis)
+        inicio, = sortear_posicoes(lab, CEL_CAMINHO, 1, rng)
+        fim, = sortear_posicoes(lab, CEL_CAMINHO, 1, rng)
         caminho_direto = criar_caminho_direto(lab, inicio, fim)
+    fases.fechar("Início e fim")
+    
+    # Uma única análise de conectividade dá os separadores (nunca recebem barreira) e
+    # uma rota de referência; só barreiras nessa rota exigem procurar um desvio
+    separadores, rota, gargalos = analisar_rota(lab, inicio, fim)
+    na_rota = bytearray(altura * largura)
+    for celula in rota or ():
+        na_rota[celula] = 1
     
     # Adiciona barreiras com menor frequência e conta colisões
     colisoes_barreiras = 0
-    chance_barreira = 0.05  # Reduzido ainda mais
     max_barreiras = (altura * largura) // 40  # Limita o número máximo de barreiras
     barreiras_adicionadas = 0
     
-    caminhos_para_barreiras = [(i, j) for i in range(altura) for j in range(largura) 
-                              if lab[i][j] == CAMINHO]
-    random.shuffle(caminhos_para_barreiras)
+    # Sorteia de uma vez (por blocos de bytes) quais caminhos tentam receber barreira e
+    # embaralha só esses, em vez de listar e embaralhar todos os caminhos
+    candidatas = sortear_celulas(lab, CEL_CAMINHO, chance_barreira, rng)
+    rng.shuffle(candidatas)
     
-    for i, j in caminhos_para_barreiras:
+    for idx in candidatas:
         if barreiras_adicionadas >= max_barreiras:
             break
-            
-        if random.random() < chance_barreira:
-            # Testa se ainda existe caminho considerando barreiras como bloqueios
-            lab[i][j] = BARREIRA
-            if not existe_caminho(lab, inicio, fim, considerar_barreiras=True):
-                # Se não existir caminho, desfaz a barreira e conta colisão
-                lab[i][j] = CAMINHO
+        
+        # Barreira num separador (ou sem rota) fecharia a passagem: conta colisão
+        if rota is None or separadores[idx]:
+            colisoes_barreiras += 1
+            continue
+        i, j = divmod(idx, largura)
+        lab[i, j] = CEL_BARREIRA
+        if na_rota[idx]:
+            nova_rota = desviar_rota(lab, rota, idx)
+            if nova_rota is None:
+                # A barreira tornou a célula um separador
+                lab[i, j] = CEL_CAMINHO
+                separadores[idx] = 1
                 colisoes_barreiras += 1
-            else:
-                barreiras_adicionadas += 1
+                continue
+            for celula in rota:
+                na_rota[celula] = 0
+            for celula in nova_rota:
+                na_rota[celula] = 1
+            rota = nova_rota
+        barreiras_adicionadas += 1
     
-    print(f"Total de colisões de barreiras: {colisoes_barreiras}")
-    print(f"Total de barreiras adicionadas: {barreiras_adicionadas}")
+    fases.fechar("Barreiras")
+    if verboso:
+        print(f"Semente do labirinto ({algoritmo}): {semente}")
+        print(f"Total de colisões de barreiras: {colisoes_barreiras}")
+        print(f"Total de barreiras adicionadas: {barreiras_adicionadas}")
+        print(f"Total de gargalos entre início e fim: {gargalos}")
     
     # Marca início e fim no labirinto
-    lab[inicio[0]][inicio[1]] = INICIO
-    lab[fim[0]][fim[1]] = FIM
+    lab[inicio] = CEL_INICIO
+    lab[fim] = CEL_FIM
     
     # Gerar moedas em posições acessíveis
     posicoes_moedas = []
-    caminhos_disponiveis = [(i, j) for i in range(altura) for j in range(largura) 
-                           if lab[i][j] == CAMINHO]
-    random.shuffle(caminhos_disponiveis)
-    
-    # Tenta colocar moedas garantindo que todas sejam acessíveis
-    for _ in range(min(num_moedas, len(caminhos_disponiveis))):
-        for pos_candidata in caminhos_disponiveis[:]:
-            # Verifica se é possível alcançar a moeda do início
-            if existe_caminho(lab, inicio, pos_candidata):
-                lab[pos_candidata[0]][pos_candidata[1]] = MOEDA
-                posicoes_moedas.append(pos_candidata)
-                caminhos_disponiveis.remove(pos_candidata)
+    # Uma única busca a partir do início diz quais candidatas são acessíveis
+    alcancaveis = marcar_alcancaveis(lab, inicio)
+    # Sorteia candidatas por rejeição; se as acessíveis forem raras, embaralha a lista toda
+    celulas = lab.celulas
+    for _ in range(64 * num_moedas):
+        if len(posicoes_moedas) >= num_moedas:
+            break
+        idx = rng.randrange(len(celulas))
+        if celulas[idx] == CEL_CAMINHO and alcancaveis[idx]:
+            pos_candidata = divmod(idx, largura)
+            lab[pos_candidata] = CEL_MOEDA
+            posicoes_moedas.append(pos_candidata)
+    if len(posicoes_moedas) < num_moedas:
+        caminhos_disponiveis = lab.posicoes_com(CEL_CAMINHO)
+        rng.shuffle(caminhos_disponiveis)
+        for pos_candidata in caminhos_disponiveis:
+            if len(posicoes_moedas) >= num_moedas:
                 break
+            if alcancaveis[pos_candidata[0] * largura + pos_candidata[1]]:
+                lab[pos_candidata] = CEL_MOEDA
+                posicoes_moedas.append(pos_candidata)
+    fases.fechar("Moedas")
+    
+    if verboso:
+        print("Tempo por fase da geração: " + " | ".join(
+            f"{fase}: {duracao / 1e9:.4f}s" for fase, duracao in fases.duracoes.items()))
+    if sessao is not None:
+        sessao.publicar(RegistroMedicao(
+            "geracao", algoritmo, fases.duracoes,
+            {"colisoes_barreiras": colisoes_barreiras, "barreiras_adicionadas": barreiras_adicionadas,
+             "gargalos": gargalos, "moedas": len(posicoes_moedas)},
+            fases.picos_memoria,
+            {"altura": str(altura), "largura": str(largura), "semente": str(semente)}
+        ))
     
     return lab, inicio, fim, posicoes_moedas
 
-def criar_caminho_direto(lab: Labirinto, inicio: Posicao, fim: Posicao) -> None:
+def gerar_labirinto_prim(altura: int, largura: int, num_moedas: int = 5, semente: Optional[int] = None,
+                         verboso: bool = True) -> Tuple[GradeLabirinto, Posicao, Posicao, List[Posicao]]:
+    """
+    Gera um labirinto usando o algoritmo de Prim modificado.
+    Retorna o labirinto (como GradeLabirinto), as posições de início e fim e as posições das moedas.
+    
+    Args:
+        altura: Altura do labirinto
+        largura: Largura do labirinto
+        num_moedas: Número de moedas a serem colocadas
+        semente: Semente do gerador aleatório (opcional)
+        verboso: Imprime o relatório da geração
+    """
+    return gerar_labirinto(altura, largura, num_moedas, "prim", semente, verboso=verboso)
+
+def criar_caminho_direto(lab: GradeLabirinto, inicio: Posicao, fim: Posicao) -> None:
     """Cria um caminho direto entre dois pontos no labirinto."""
     x1, y1 = inicio
     x2, y2 = fim
     
     # Primeiro move horizontalmente
     for y in range(min(y1, y2), max(y1, y2) + 1):
-        lab[x1][y] = CAMINHO
+        lab[x1, y] = CEL_CAMINHO
     
     # Depois move verticalmente
     for x in range(min(x1, x2), max(x1, x2) + 1):
-        lab[x][y2] = CAMINHO 
\ No newline at end of file
+        lab[x, y2] = CEL_CAMINHO 
\ No newline at end of file
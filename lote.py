@@ -0,0 +1,196 @@
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import threading
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from grafo import compilar_grafo
+from labirinto import gerar_labirinto
+from arquivo import carregar_labirinto
+from servico import SOLUCIONADORES, posicao_valida
+
+Trabalho = Dict[str, Any]
+
+def executar_trabalho(numero: int, trabalho: Trabalho, algoritmos_padrao: Tuple[str, ...]) -> Tuple[List[str], int]:
+    """
+    Executa um trabalho (gera ou carrega o labirinto e roda cada algoritmo) e retorna as
+    linhas JSONL dos resultados, uma por algoritmo, e quantas delas são de erro. Um algoritmo
+    que falha vira uma linha com "erro" sem impedir os outros; uma falha ao montar o
+    labirinto vira uma única linha.
+    """
+    base: Dict[str, Any] = {"trabalho": numero}
+    if "id" in trabalho:
+        base["id"] = trabalho["id"]
+    try:
+        if "arquivo" in trabalho:
+            base["arquivo"] = trabalho["arquivo"]
+            lab, inicio, fim, _ = carregar_labirinto(trabalho["arquivo"])
+        else:
+            semente = trabalho.get("semente")
+            base["semente"] = semente
+            lab, inicio, fim, _ = gerar_labirinto(
+                int(trabalho["altura"]), int(trabalho["largura"]), int(trabalho.get("moedas", 5)),
+                str(trabalho.get("gerador", "prim")), None if semente is None else int(semente),
+                float(trabalho.get("chance_remover_parede", 0.4)), float(trabalho.get("chance_barreira", 0.05)),
+                verboso=False
+            )
+        inicio = posicao_valida(lab, trabalho["inicio"], "inicio") if "inicio" in trabalho else inicio
+        fim = posicao_valida(lab, trabalho["fim"], "fim") if "fim" in trabalho else fim
+        base.update(altura=lab.altura, largura=lab.largura, inicio=list(inicio), fim=list(fim))
+        algoritmos = trabalho.get("algoritmos", algoritmos_padrao)
+        if isinstance(algoritmos, str):
+            algoritmos = [algoritmos]
+        if not isinstance(algoritmos, (list, tuple)) or not all(isinstance(nome, str) for nome in algoritmos):
+            raise ValueError("'algoritmos' deve ser um nome ou uma lista de nomes")
+        incluir_caminho = bool(trabalho.get("incluir_caminho", False))
+        grafo = compilar_grafo(lab)
+    except Exception as erro:
+        return [json.dumps({**base, "erro": _descrever(erro)}, ensure_ascii=False)], 1
+
+    linhas = []
+    falhas = 0
+    for nome in algoritmos:
+        registro = {**base, "solucionador": nome}
+        try:
+            if nome not in SOLUCIONADORES:
+                raise ValueError(f"Algoritmo desconhecido: {nome}")
+            caminho, metricas = SOLUCIONADORES[nome](grafo, inicio, fim)
+        except Exception as erro:
+            registro["erro"] = _descrever(erro)
+        else:
+            registro.update(dataclasses.asdict(metricas))
+            if incluir_caminho:
+                registro["caminho"] = None if caminho is None else [list(pos) for pos in caminho]
+        falhas += "erro" in registro
+        linhas.append(json.dumps(registro, ensure_ascii=False))
+    return linhas, falhas
+
+def _descrever(erro: BaseException) -> str:
+    if isinstance(erro, KeyError):
+        return f"Campo obrigatório ausente: {erro.args[0]}"
+    return f"{type(erro).__name__}: {erro}"
+
+class SaidaLote:
+    """Escreve as linhas de resultado (de qualquer thread) e conta registros e falhas."""
+
+    def __init__(self, destino: IO[str]):
+        self.destino = destino
+        self.trava = threading.Lock()
+        self.registros = 0
+        self.falhas = 0
+
+    def escrever(self, linhas: List[str], falhas: int = 0) -> None:
+        with self.trava:
+            for linha in linhas:
+                self.destino.write(linha + "\n")
+            self.destino.flush()
+            self.registros += len(linhas)
+            self.falhas += falhas
+
+    def escrever_erro(self, numero: int, erro: str) -> None:
+        self.escrever([json.dumps({"trabalho": numero, "erro": erro}, ensure_ascii=False)], 1)
+
+def ler_trabalhos(entrada: Iterable[str]) -> Iterable[Tuple[int, Optional[Trabalho], Optional[str]]]:
+    """Lê a entrada linha a linha: (número da linha, trabalho, erro de leitura). Linhas vazias são puladas."""
+    for numero, linha in enumerate(entrada, 1):
+        if not linha.strip():
+            continue
+        try:
+            trabalho = json.loads(linha)
+        except ValueError as erro:
+            yield numero, None, f"JSON inválido: {erro}"
+            continue
+        if not isinstance(trabalho, dict):
+            yield numero, None, "O trabalho deve ser um objeto JSON"
+            continue
+        yield numero, trabalho, None
+
+def executar_lote(entrada: Iterable[str], saida: SaidaLote, algoritmos_padrao: Tuple[str, ...],
+                  trabalhadores: Optional[int] = None, max_pendentes: Optional[int] = None) -> None:
+    """
+    Executa os trabalhos da entrada em fluxo. A entrada só é lida quando há vaga (no máximo
+    max_pendentes trabalhos em andamento), então a memória não cresce com o tamanho do lote;
+    cada resultado é escrito assim que o trabalho termina, fora da ordem da entrada.
+    Com trabalhadores=0 tudo roda no próprio processo.
+    """
+    if trabalhadores == 0:
+        for numero, trabalho, erro in ler_trabalhos(entrada):
+            if erro is not None:
+                saida.escrever_erro(numero, erro)
+                continue
+            try:
+                resultado = executar_trabalho(numero, trabalho, algoritmos_padrao)
+            except Exception as erro_trabalho:
+                saida.escrever_erro(numero, _descrever(erro_trabalho))
+            else:
+                saida.escrever(*resultado)
+        return
+
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    vagas = threading.BoundedSemaphore(max_pendentes or 4 * trabalhadores)
+
+    def ao_terminar(numero: int, futuro: Future) -> None:
+        try:
+            try:
+                saida.escrever(*futuro.result())
+            except BaseException as erro:
+                # O processo que rodava o trabalho morreu
+                saida.escrever_erro(numero, _descrever(erro))
+        except Exception:
+            traceback.print_exc()
+        finally:
+            vagas.release()
+
+    executor = ProcessPoolExecutor(max_workers=trabalhadores)
+    try:
+        for numero, trabalho, erro in ler_trabalhos(entrada):
+            if erro is not None:
+                saida.escrever_erro(numero, erro)
+                continue
+            vagas.acquire()
+            try:
+                futuro = executor.submit(executar_trabalho, numero, trabalho, algoritmos_padrao)
+            except BrokenProcessPool:
+                # Um worker morreu: os trabalhos dele já saíram como falha; segue com um pool novo
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=trabalhadores)
+                futuro = executor.submit(executar_trabalho, numero, trabalho, algoritmos_padrao)
+            futuro.add_done_callback(lambda f, numero=numero: ao_terminar(numero, f))
+    finally:
+        executor.shutdown(wait=True)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando. Retorna 1 se algum trabalho falhou."""
+    parser = argparse.ArgumentParser(
+        description="Executa trabalhos de labirinto em lote: JSON por linha na entrada, um resultado JSON por linha na saída."
+    )
+    parser.add_argument("entrada", nargs="?", default="-", help="Arquivo de trabalhos (padrão: entrada padrão)")
+    parser.add_argument("-o", "--saida", default="-", help="Arquivo de resultados (padrão: saída padrão)")
+    parser.add_argument("--trabalhadores", type=int, default=None,
+                        help="Processos de trabalho (padrão: nº de CPUs; 0 roda no próprio processo)")
+    parser.add_argument("--pendentes", type=int, default=None,
+                        help="Trabalhos em andamento ao mesmo tempo (padrão: 4 por processo)")
+    parser.add_argument("--algoritmos", nargs="+", choices=sorted(SOLUCIONADORES), default=list(SOLUCIONADORES),
+                        help="Algoritmos dos trabalhos que não dizem quais rodar")
+    args = parser.parse_args(argv)
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    destino = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    saida = SaidaLote(destino)
+    try:
+        executar_lote(entrada, saida, tuple(args.algoritmos), args.trabalhadores, args.pendentes)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if destino is not sys.stdout:
+            destino.close()
+    print(f"{saida.registros} registros, {saida.falhas} com erro", file=sys.stderr)
+    return 1 if saida.falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
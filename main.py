@@ -1,45 +1,40 @@
-from typing import Optional, List, Dict
+import random
+from typing import Callable, Optional, List, Dict, Tuple, Union
 from tabulate import tabulate
 from colorama import Fore, Style, init
 
 from constantes import *
-from algoritmos import Labirinto, Posicao, MetricasBusca
-from labirinto import (
-    gerar_labirinto_prim, 
-    marcar_caminho_no_labirinto, 
-    imprimir_labirinto
-)
+from algoritmos import Labirinto, Posicao, Caminho, MetricasBusca
+from grade import GradeLabirinto
+from grafo import GrafoLabirinto, compilar_grafo, impressao_digital
+from cache_resultados import CacheResultados
+from arquivo import salvar_labirinto, carregar_labirinto
+from paralelo import resolver_em_paralelo, resolver_varios_em_paralelo
+from rota_moedas import resolver_rota_moedas
+from memoria_limitada import resolver_ida_estrela, resolver_sma_estrela
+from labirinto import gerar_labirinto_prim
 from algoritmos import (
     resolver_guloso, 
     resolver_dfs, 
     resolver_a_estrela,
     resolver_dijkstra,
-    resolver_best_first_search
+    resolver_best_first_search,
+    resolver_a_estrela_bidirecional,
+    resolver_dijkstra_bidirecional,
+    resolver_jps
 )
 from interface import (
     imprimir_cabecalho_labirinto, 
     imprimir_metricas,
-    jogar_manualmente
+    jogar_manualmente,
+    mostrar_labirinto
 )
 
-def comparar_algoritmos(lab: Labirinto, inicio: Posicao, fim: Posicao) -> None:
-    """Compara todos os algoritmos disponíveis e mostra uma tabela com os resultados."""
-    # Inicializa o colorama para funcionar em todos os sistemas
-    init()
-    
-    algoritmos = {
-        f"{Fore.CYAN}A*{Style.RESET_ALL}": resolver_a_estrela,
-        f"{Fore.BLUE}Dijkstra{Style.RESET_ALL}": resolver_dijkstra,
-        f"{Fore.YELLOW}DFS{Style.RESET_ALL}": resolver_dfs,
-        f"{Fore.GREEN}Guloso{Style.RESET_ALL}": resolver_guloso,
-        f"{Fore.RED}Best-First{Style.RESET_ALL}": resolver_best_first_search
-    }
-    
+def imprimir_comparacao(resultados_busca: Dict[str, Tuple[Optional[Caminho], MetricasBusca]],
+                        titulo: str = "Comparação dos Algoritmos:") -> None:
+    """Mostra a tabela de comparação a partir dos resultados de cada algoritmo."""
     resultados = []
-    
-    # Executa cada algoritmo
-    for nome, func in algoritmos.items():
-        caminho, metricas = func(lab, inicio, fim)
+    for nome, (caminho, metricas) in resultados_busca.items():
         encontrou = f"{Fore.GREEN}Sim{Style.RESET_ALL}" if metricas.caminho_encontrado else f"{Fore.RED}Não{Style.RESET_ALL}"
         resultados.append({
             "Algoritmo": nome,
@@ -61,9 +56,62 @@ def comparar_algoritmos(lab: Labirinto, inicio: Posicao, fim: Posicao) -> None:
     ]
     table = [[r[h.replace(f"{Fore.WHITE}{Style.BRIGHT}", "").replace(Style.RESET_ALL, "")] for h in headers] for r in resultados]
     
-    print(f"\n{Fore.WHITE}{Style.BRIGHT}Comparação dos Algoritmos:{Style.RESET_ALL}")
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}{titulo}{Style.RESET_ALL}")
     print(tabulate(table, headers=headers, tablefmt="grid"))
 
+def algoritmos_comparados() -> Dict[str, Callable]:
+    """Algoritmos usados na comparação, com o nome colorido usado na tabela."""
+    return {
+        f"{Fore.CYAN}A*{Style.RESET_ALL}": resolver_a_estrela,
+        f"{Fore.BLUE}Dijkstra{Style.RESET_ALL}": resolver_dijkstra,
+        f"{Fore.YELLOW}DFS{Style.RESET_ALL}": resolver_dfs,
+        f"{Fore.GREEN}Guloso{Style.RESET_ALL}": resolver_guloso,
+        f"{Fore.RED}Best-First{Style.RESET_ALL}": resolver_best_first_search,
+        f"{Fore.CYAN}A* Bidirecional{Style.RESET_ALL}": resolver_a_estrela_bidirecional,
+        f"{Fore.BLUE}Dijkstra Bidirecional{Style.RESET_ALL}": resolver_dijkstra_bidirecional,
+        f"{Fore.MAGENTA}JPS{Style.RESET_ALL}": resolver_jps,
+        f"{Fore.CYAN}IDA*{Style.RESET_ALL}": resolver_ida_estrela,
+        f"{Fore.CYAN}SMA*{Style.RESET_ALL}": resolver_sma_estrela
+    }
+
+def comparar_algoritmos(lab: Union[Labirinto, GradeLabirinto], inicio: Posicao, fim: Posicao,
+                        paralelo: bool = False, cache: Optional[CacheResultados] = None,
+                        grafo: Optional[GrafoLabirinto] = None) -> None:
+    """
+    Compara todos os algoritmos disponíveis e mostra uma tabela com os resultados.
+    Com paralelo=True, o labirinto vai para memória compartilhada e cada algoritmo
+    roda em um processo próprio. A comparação mede tempo, então sempre executa todos
+    os algoritmos; com `cache`, os resultados são guardados para as soluções avulsas.
+    `grafo` é o grafo já compilado de `lab`, se quem chama o tiver.
+    """
+    # Inicializa o colorama para funcionar em todos os sistemas
+    init()
+    
+    algoritmos = algoritmos_comparados()
+    
+    if paralelo:
+        resultados_busca = resolver_em_paralelo(lab, inicio, fim, algoritmos)
+    else:
+        # Compila o grafo uma única vez e reutiliza em todos os algoritmos
+        if grafo is None:
+            grafo = compilar_grafo(lab)
+        resultados_busca = {nome: func(grafo, inicio, fim) for nome, func in algoritmos.items()}
+    if cache is not None:
+        impressao = impressao_digital(lab)
+        for nome, (caminho, metricas) in resultados_busca.items():
+            cache.guardar(impressao, algoritmos[nome], inicio, fim, caminho, metricas)
+    
+    imprimir_comparacao(resultados_busca)
+
+def comparar_varios_labirintos(labirintos: List[Tuple[Union[Labirinto, GradeLabirinto], Posicao, Posicao]],
+                               processos: Optional[int] = None) -> None:
+    """Compara todos os algoritmos em vários labirintos de uma vez, usando um único pool de processos."""
+    init()
+    
+    resultados = resolver_varios_em_paralelo(labirintos, algoritmos_comparados(), processos)
+    for numero, resultados_busca in enumerate(resultados, start=1):
+        imprimir_comparacao(resultados_busca, f"Comparação dos Algoritmos - Labirinto {numero}:")
+
 def mostrar_menu_algoritmos() -> None:
     """Mostra o menu de algoritmos disponíveis."""
     print("\nAlgoritmos Disponíveis:")
@@ -72,15 +120,25 @@ def mostrar_menu_algoritmos() -> None:
     print("3. DFS (Busca em Profundidade)")
     print("4. Busca Gulosa")
     print("5. Best-First Search")
-    print("6. Voltar")
+    print("6. A* Bidirecional")
+    print("7. Dijkstra Bidirecional")
+    print("8. Jump Point Search (JPS)")
+    print("9. IDA* (memória limitada)")
+    print("10. SMA* (memória limitada)")
+    print("11. Voltar")
 
 def main() -> None:
     """Função principal do jogo."""
-    labirinto_atual: Optional[Labirinto] = None
+    labirinto_atual: Optional[GradeLabirinto] = None
+    grafo_atual: Optional[GrafoLabirinto] = None
+    impressao_atual: Optional[str] = None
     pos_inicio: Optional[Posicao] = None
     pos_fim: Optional[Posicao] = None
     total_moedas: int = 0
     contador_labirintos: int = 0
+    semente_atual: Optional[int] = None
+    # Resultados já calculados (o mesmo labirinto costuma ser resolvido várias vezes)
+    cache = CacheResultados()
 
     while True:
         print("\n" + "=" * 80)  # Linha separadora
@@ -94,19 +152,38 @@ def main() -> None:
 
         print("Opções disponíveis:")
         print("1. Gerar Novo Labirinto")
-        print("2. Sair")
+        print("2. Carregar Labirinto de Arquivo")
+        print("3. Sair")
 
         escolha = input("\nEscolha uma opção: ")
         print("\n" + "-" * 80)  # Linha separadora
 
-        if escolha == "1":
-            contador_labirintos += 1
-            imprimir_cabecalho_labirinto(contador_labirintos)
-            print("\nGerando novo labirinto...")
-            labirinto_atual, pos_inicio, pos_fim, posicoes_moedas = gerar_labirinto_prim(ALTURA_LAB, LARGURA_LAB, 5)
+        if escolha in ("1", "2"):
+            if escolha == "1":
+                contador_labirintos += 1
+                imprimir_cabecalho_labirinto(contador_labirintos)
+                print("\nGerando novo labirinto...")
+                semente_atual = random.randrange(2 ** 32)
+                labirinto_atual, pos_inicio, pos_fim, posicoes_moedas = gerar_labirinto_prim(
+                    ALTURA_LAB, LARGURA_LAB, 5, semente_atual
+                )
+                print("\nLabirinto gerado:")
+            else:
+                caminho_arquivo = input("\nArquivo do labirinto: ").strip()
+                try:
+                    labirinto_atual, pos_inicio, pos_fim, posicoes_moedas = carregar_labirinto(caminho_arquivo)
+                except (OSError, ValueError) as erro:
+                    print(f"\n{COR_ERRO}Não foi possível carregar o labirinto: {erro}{RESET_COR}")
+                    continue
+                semente_atual = None
+                contador_labirintos += 1
+                imprimir_cabecalho_labirinto(contador_labirintos)
+                print("\nLabirinto carregado:")
             total_moedas = len(posicoes_moedas)
-            print("\nLabirinto gerado:")
-            imprimir_labirinto(labirinto_atual)
+            # Compila o grafo uma vez por labirinto para as soluções avulsas (o JPS lê a grade)
+            grafo_atual = compilar_grafo(labirinto_atual)
+            impressao_atual = labirinto_atual.impressao_digital()
+            mostrar_labirinto(labirinto_atual, foco=pos_inicio)
 
             # Submenu após gerar labirinto
             while True:
@@ -114,7 +191,10 @@ def main() -> None:
                 print("1. Jogar Manualmente")
                 print("2. Ver Algoritmos Disponíveis")
                 print("3. Comparar Todos os Algoritmos")
-                print("4. Voltar ao Menu Principal")
+                print("4. Comparar Todos os Algoritmos em Paralelo")
+                print("5. Salvar Labirinto em Arquivo")
+                print("6. Rota com Todas as Moedas")
+                print("7. Voltar ao Menu Principal")
 
                 sub_escolha = input("\nEscolha uma opção: ")
 
@@ -126,69 +206,124 @@ def main() -> None:
                 elif sub_escolha == "2":
                     while True:
                         mostrar_menu_algoritmos()
-                        alg_escolha = input("\nEscolha um algoritmo (ou 6 para voltar): ")
+                        alg_escolha = input("\nEscolha um algoritmo (ou 11 para voltar): ")
                         
                         if alg_escolha == "1" and labirinto_atual:
                             print("\nResolvendo com A*...")
-                            caminho, metricas = resolver_a_estrela(labirinto_atual, pos_inicio, pos_fim)
+                            caminho, metricas = cache.resolver(resolver_a_estrela, grafo_atual, pos_inicio, pos_fim, impressao_atual)
                             imprimir_metricas(metricas)
                             if caminho:
                                 print("\nSolução encontrada:")
-                                lab_resolvido = marcar_caminho_no_labirinto(labirinto_atual, caminho)
-                                imprimir_labirinto(lab_resolvido)
+                                mostrar_labirinto(labirinto_atual, caminho)
                         
                         elif alg_escolha == "2" and labirinto_atual:
                             print("\nResolvendo com Dijkstra...")
-                            caminho, metricas = resolver_dijkstra(labirinto_atual, pos_inicio, pos_fim)
+                            caminho, metricas = cache.resolver(resolver_dijkstra, grafo_atual, pos_inicio, pos_fim, impressao_atual)
                             imprimir_metricas(metricas)
                             if caminho:
                                 print("\nSolução encontrada:")
-                                lab_resolvido = marcar_caminho_no_labirinto(labirinto_atual, caminho)
-                                imprimir_labirinto(lab_resolvido)
+                                mostrar_labirinto(labirinto_atual, caminho)
                         
                         elif alg_escolha == "3" and labirinto_atual:
                             print("\nResolvendo com DFS...")
-                            caminho, metricas = resolver_dfs(labirinto_atual, pos_inicio, pos_fim)
+                            caminho, metricas = cache.resolver(resolver_dfs, grafo_atual, pos_inicio, pos_fim, impressao_atual)
                             imprimir_metricas(metricas)
                             if caminho:
                                 print("\nSolução encontrada:")
-                                lab_resolvido = marcar_caminho_no_labirinto(labirinto_atual, caminho)
-                                imprimir_labirinto(lab_resolvido)
+                                mostrar_labirinto(labirinto_atual, caminho)
                         
                         elif alg_escolha == "4" and labirinto_atual:
                             print("\nResolvendo com Busca Gulosa...")
-                            caminho, metricas = resolver_guloso(labirinto_atual, pos_inicio, pos_fim)
+                            caminho, metricas = cache.resolver(resolver_guloso, grafo_atual, pos_inicio, pos_fim, impressao_atual)
                             imprimir_metricas(metricas)
                             if caminho:
                                 print("\nSolução encontrada:")
-                                lab_resolvido = marcar_caminho_no_labirinto(labirinto_atual, caminho)
-                                imprimir_labirinto(lab_resolvido)
+                                mostrar_labirinto(labirinto_atual, caminho)
                         
                         elif alg_escolha == "5" and labirinto_atual:
                             print("\nResolvendo com Best-First Search...")
-                            caminho, metricas = resolver_best_first_search(labirinto_atual, pos_inicio, pos_fim)
+                            caminho, metricas = cache.resolver(resolver_best_first_search, grafo_atual, pos_inicio, pos_fim, impressao_atual)
+                            imprimir_metricas(metricas)
+                            if caminho:
+                                print("\nSolução encontrada:")
+                                mostrar_labirinto(labirinto_atual, caminho)
+                        
+                        elif alg_escolha == "6" and labirinto_atual:
+                            print("\nResolvendo com A* Bidirecional...")
+                            caminho, metricas = cache.resolver(resolver_a_estrela_bidirecional, grafo_atual, pos_inicio, pos_fim, impressao_atual)
+                            imprimir_metricas(metricas)
+                            if caminho:
+                                print("\nSolução encontrada:")
+                                mostrar_labirinto(labirinto_atual, caminho)
+                        
+                        elif alg_escolha == "7" and labirinto_atual:
+                            print("\nResolvendo com Dijkstra Bidirecional...")
+                            caminho, metricas = cache.resolver(resolver_dijkstra_bidirecional, grafo_atual, pos_inicio, pos_fim, impressao_atual)
+                            imprimir_metricas(metricas)
+                            if caminho:
+                                print("\nSolução encontrada:")
+                                mostrar_labirinto(labirinto_atual, caminho)
+                        
+                        elif alg_escolha == "8" and labirinto_atual:
+                            print("\nResolvendo com Jump Point Search...")
+                            caminho, metricas = cache.resolver(resolver_jps, labirinto_atual, pos_inicio, pos_fim, impressao_atual)
+                            imprimir_metricas(metricas)
+                            if caminho:
+                                print("\nSolução encontrada:")
+                                mostrar_labirinto(labirinto_atual, caminho)
+                        
+                        elif alg_escolha == "9" and labirinto_atual:
+                            print("\nResolvendo com IDA*...")
+                            caminho, metricas = cache.resolver(resolver_ida_estrela, grafo_atual, pos_inicio, pos_fim, impressao_atual)
+                            imprimir_metricas(metricas)
+                            if caminho:
+                                print("\nSolução encontrada:")
+                                mostrar_labirinto(labirinto_atual, caminho)
+                        
+                        elif alg_escolha == "10" and labirinto_atual:
+                            print("\nResolvendo com SMA*...")
+                            caminho, metricas = cache.resolver(resolver_sma_estrela, grafo_atual, pos_inicio, pos_fim, impressao_atual)
                             imprimir_metricas(metricas)
                             if caminho:
                                 print("\nSolução encontrada:")
-                                lab_resolvido = marcar_caminho_no_labirinto(labirinto_atual, caminho)
-                                imprimir_labirinto(lab_resolvido)
+                                mostrar_labirinto(labirinto_atual, caminho)
                         
-                        elif alg_escolha == "6":
+                        elif alg_escolha == "11":
                             break
                         
                         else:
                             print("\nOpção inválida!")
                 
                 elif sub_escolha == "3" and labirinto_atual:
-                    comparar_algoritmos(labirinto_atual, pos_inicio, pos_fim)
+                    comparar_algoritmos(labirinto_atual, pos_inicio, pos_fim, cache=cache, grafo=grafo_atual)
+                
+                elif sub_escolha == "4" and labirinto_atual:
+                    comparar_algoritmos(labirinto_atual, pos_inicio, pos_fim, paralelo=True, cache=cache)
+                
+                elif sub_escolha == "5" and labirinto_atual:
+                    caminho_arquivo = input("\nSalvar em: ").strip()
+                    try:
+                        salvar_labirinto(caminho_arquivo, labirinto_atual, pos_inicio, pos_fim,
+                                         posicoes_moedas, semente_atual)
+                        print(f"\n{COR_SUCESSO}Labirinto salvo em {caminho_arquivo}{RESET_COR}")
+                    except OSError as erro:
+                        print(f"\n{COR_ERRO}Não foi possível salvar o labirinto: {erro}{RESET_COR}")
+                
+                elif sub_escolha == "6" and labirinto_atual:
+                    print(f"\nPlanejando a rota pelas {total_moedas} moedas...")
+                    caminho, metricas = resolver_rota_moedas(labirinto_atual, pos_inicio, pos_fim, posicoes_moedas)
+                    imprimir_metricas(metricas)
+                    if caminho:
+                        print("\nRota encontrada:")
+                        mostrar_labirinto(labirinto_atual, caminho)
                 
-                elif sub_escolha == "4":
+                elif sub_escolha == "7":
                     break
                 
                 else:
                     print("\nOpção inválida!")
 
-        elif escolha == "2":
+        elif escolha == "3":
             print("\nSaindo...")
             break
         else:
@@ -0,0 +1,196 @@
+import mmap
+import random
+import struct
+import zlib
+from array import array
+from typing import Callable, List, Optional, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, GradeLabirinto
+from arquivo import alinhar
+from grafo import GrafoLabirinto, como_grafo, custos_de_entrada, distancias_a_partir, tipo_indice
+
+# Arquivo de marcos: assinatura, versão, typecode das distâncias, dimensões, número de marcos
+# e CRC32 dos custos das células (identifica o labirinto a que as tabelas pertencem)
+ASSINATURA_MARCOS = b"LMRK"
+VERSAO_MARCOS = 1
+FORMATO_CABECALHO_MARCOS = struct.Struct("<4sHcxQQII")
+
+class TabelaMarcos:
+    """
+    Tabelas do ALT (A*, Landmarks e desigualdade Triangular) para um labirinto.
+
+    distancias[i][v] é o custo mínimo do marco i até a célula v (-1 se inalcançável).
+    Como o custo é pago ao entrar na célula, d(v, L) = d(L, v) + c(L) - c(v), onde c é
+    custo_celula; assim uma única busca por marco dá as distâncias nos dois sentidos.
+    """
+    __slots__ = ("altura", "largura", "marcos", "custo_celula", "distancias")
+
+    def __init__(self, altura: int, largura: int, marcos: List[int], custo_celula, distancias: List):
+        self.altura = altura
+        self.largura = largura
+        self.marcos = marcos
+        self.custo_celula = custo_celula
+        self.distancias = distancias
+
+    @property
+    def tamanho_bytes(self) -> int:
+        """Memória ocupada pelas tabelas (custos das células e distâncias)."""
+        return len(self.custo_celula) + sum(len(d) * d.itemsize for d in self.distancias)
+
+    def posicoes(self) -> List[Posicao]:
+        """Retorna as posições (linha, coluna) dos marcos."""
+        return [divmod(marco, self.largura) for marco in self.marcos]
+
+    def confere(self, grafo: GrafoLabirinto) -> bool:
+        """Verifica se as tabelas foram calculadas para este grafo (lê o grafo inteiro)."""
+        return (grafo.altura == self.altura and grafo.largura == self.largura
+                and custos_de_entrada(grafo) == self.custo_celula)
+
+    def estimador(self, destino: int) -> Callable[[int], int]:
+        """
+        Retorna h(v), limite inferior do custo de v até destino: o maior entre a
+        distância de Manhattan e, para cada marco L,
+            d(L, destino) - d(L, v)   e   d(v, L) - d(destino, L).
+        Cada termo é consistente, então o máximo também é e o A* continua ótimo.
+        """
+        largura, custo_celula = self.largura, self.custo_celula
+        lin_fim, col_fim = divmod(destino, largura)
+        custo_destino = custo_celula[destino]
+        termos = [(dist, dist[destino]) for dist in self.distancias if dist[destino] >= 0]
+
+        def estimar(celula: int) -> int:
+            lin, col = divmod(celula, largura)
+            h = abs(lin - lin_fim) + abs(col - col_fim)
+            ajuste = custo_destino - custo_celula[celula]
+            for dist, ate_destino in termos:
+                ate_celula = dist[celula]
+                if ate_celula >= 0:
+                    if ate_destino - ate_celula > h:
+                        h = ate_destino - ate_celula
+                    if ate_celula - ate_destino + ajuste > h:
+                        h = ate_celula - ate_destino + ajuste
+            return h
+
+        return estimar
+
+def preprocessar_marcos(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], num_marcos: int = 8,
+                        orcamento_bytes: Optional[int] = None,
+                        semente: Optional[int] = None) -> TabelaMarcos:
+    """
+    Escolhe os marcos por seleção do ponto mais distante e calcula as distâncias
+    exatas de cada um até todas as células.
+
+    Args:
+        lab: O labirinto (grade, forma antiga ou grafo já compilado)
+        num_marcos: Número desejado de marcos
+        orcamento_bytes: Memória máxima das tabelas; reduz o número de marcos se preciso
+        semente: Semente da célula inicial da seleção (reprodutibilidade)
+
+    Returns:
+        A TabelaMarcos pronta para resolver_a_estrela(..., marcos=tabela)
+    """
+    grafo = como_grafo(lab)
+    num_celulas = grafo.num_celulas
+    custo_celula = custos_de_entrada(grafo)
+    abertas = [idx for idx in range(num_celulas) if custo_celula[idx]]
+    if not abertas:
+        # Sem arestas não há o que medir: a tabela fica sem marcos (só Manhattan) e as
+        # buscas simplesmente não encontram caminho
+        return TabelaMarcos(grafo.altura, grafo.largura, [], custo_celula, [])
+
+    itemsize = array(tipo_indice(CUSTO_BARREIRA * num_celulas)).itemsize
+    if orcamento_bytes is not None:
+        cabem = (orcamento_bytes - num_celulas) // (num_celulas * itemsize)
+        if cabem < 1:
+            raise ValueError(
+                f"Orçamento de {orcamento_bytes} bytes não comporta nenhum marco "
+                f"({num_celulas * (itemsize + 1)} bytes por marco neste labirinto)"
+            )
+        num_marcos = min(num_marcos, cabem)
+
+    # O primeiro marco é a célula mais distante de uma célula sorteada; os seguintes
+    # maximizam a menor distância até os marcos já escolhidos.
+    rng = random.Random(semente)
+    referencia = distancias_a_partir(grafo, rng.choice(abertas))
+    menor_distancia = referencia
+    marcos: List[int] = []
+    distancias = []
+    for _ in range(num_marcos):
+        candidato = max(abertas, key=menor_distancia.__getitem__)
+        if candidato in marcos or menor_distancia[candidato] <= 0:
+            break  # Não há mais células distintas a acrescentar
+        dist = distancias_a_partir(grafo, candidato)
+        marcos.append(candidato)
+        distancias.append(dist)
+        if menor_distancia is referencia:
+            menor_distancia = array(dist.typecode, dist)
+        else:
+            for idx in abertas:
+                d = dist[idx]
+                if 0 <= d < menor_distancia[idx] or menor_distancia[idx] < 0:
+                    menor_distancia[idx] = d
+
+    return TabelaMarcos(grafo.altura, grafo.largura, marcos, custo_celula, distancias)
+
+def salvar_marcos(caminho_arquivo: str, tabela: TabelaMarcos) -> None:
+    """Grava as tabelas de marcos num arquivo binário (lido com carregar_marcos)."""
+    if tabela.distancias:
+        tipo = tabela.distancias[0].typecode
+    else:
+        tipo = tipo_indice(CUSTO_BARREIRA * len(tabela.custo_celula))
+    with open(caminho_arquivo, "wb") as arquivo:
+        arquivo.write(FORMATO_CABECALHO_MARCOS.pack(
+            ASSINATURA_MARCOS, VERSAO_MARCOS, tipo.encode(), tabela.altura, tabela.largura,
+            len(tabela.marcos), zlib.crc32(tabela.custo_celula)
+        ))
+        arquivo.write(array("q", tabela.marcos).tobytes())
+        arquivo.write(tabela.custo_celula)
+        arquivo.write(bytes(alinhar(arquivo.tell()) - arquivo.tell()))
+        for dist in tabela.distancias:
+            arquivo.write(memoryview(dist).cast("B"))
+
+def carregar_marcos(caminho_arquivo: str, grafo: Optional[GrafoLabirinto] = None) -> TabelaMarcos:
+    """
+    Abre as tabelas de marcos via mmap, sem copiar as distâncias.
+
+    Args:
+        caminho_arquivo: Arquivo gravado por salvar_marcos
+        grafo: Se informado, confere se as tabelas pertencem a este labirinto
+    """
+    with open(caminho_arquivo, "rb") as arquivo:
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapa) < FORMATO_CABECALHO_MARCOS.size:
+        raise ValueError("Arquivo de marcos truncado: cabeçalho incompleto")
+    assinatura, versao, tipo, altura, largura, num_marcos, checksum = \
+        FORMATO_CABECALHO_MARCOS.unpack_from(mapa, 0)
+    if assinatura != ASSINATURA_MARCOS:
+        raise ValueError("Arquivo não contém marcos (assinatura inválida)")
+    if versao != VERSAO_MARCOS:
+        raise ValueError(f"Versão de formato de marcos não suportada: {versao}")
+
+    tipo = tipo.decode()
+    num_celulas = altura * largura
+    tamanho_distancia = num_celulas * array(tipo).itemsize
+    pos = FORMATO_CABECALHO_MARCOS.size
+    marcos = list(struct.unpack_from(f"<{num_marcos}q", mapa, pos))
+    pos += 8 * num_marcos
+    inicio_distancias = alinhar(pos + num_celulas)
+    if len(mapa) < inicio_distancias + num_marcos * tamanho_distancia:
+        raise ValueError("Arquivo de marcos truncado: faltam distâncias")
+
+    # As memoryviews mantêm o mmap vivo enquanto a tabela existir
+    dados = memoryview(mapa)
+    custo_celula = dados[pos:pos + num_celulas]
+    if zlib.crc32(custo_celula) != checksum:
+        raise ValueError("Checksum dos custos não confere: arquivo de marcos corrompido")
+    distancias = []
+    for k in range(num_marcos):
+        inicio = inicio_distancias + k * tamanho_distancia
+        distancias.append(dados[inicio:inicio + tamanho_distancia].cast(tipo))
+
+    tabela = TabelaMarcos(altura, largura, marcos, custo_celula, distancias)
+    if grafo is not None and not tabela.confere(grafo):
+        raise ValueError("As tabelas de marcos não correspondem a este labirinto")
+    return tabela
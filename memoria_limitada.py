@@ -0,0 +1,327 @@
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto, como_grade
+from grafo import GrafoLabirinto
+from algoritmos import MetricasBusca, coletar_metricas, heuristica_manhattan
+from instrumentacao import instrumentado
+
+INFINITO = float("inf")
+
+# Entradas da tabela de transposição do IDA* (cada uma guarda célula, custo e geração)
+TAMANHO_TABELA_PADRAO = 1 << 16
+# Nós que o SMA* pode manter na árvore de busca ao mesmo tempo
+MAX_NOS_PADRAO = 10_000
+
+# Vizinhos de uma célula: lista de (célula, custo de entrar nela)
+Sucessores = Callable[[int], List[Tuple[int, int]]]
+
+def funcao_sucessores(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto]) -> Tuple[int, Sucessores]:
+    """
+    Retorna a largura e a função de vizinhos usada pelas buscas com memória limitada.
+    Um GrafoLabirinto é lido pelo CSR; uma grade é lida direto das células, sem compilar
+    o grafo, então um labirinto mapeado de arquivo (arquivo.carregar_labirinto) não é
+    copiado para a memória. A ordem é a mesma do grafo: direita, baixo, esquerda, cima.
+    """
+    if isinstance(lab, GrafoLabirinto):
+        inicio_vizinhos, vizinhos, custos = lab.inicio_vizinhos, lab.vizinhos, lab.custos
+
+        def sucessores_grafo(celula: int) -> List[Tuple[int, int]]:
+            return [(vizinhos[k], custos[k]) for k in range(inicio_vizinhos[celula], inicio_vizinhos[celula + 1])]
+        return lab.largura, sucessores_grafo
+
+    grade = como_grade(lab)
+    altura, largura, celulas = grade.altura, grade.largura, grade.celulas
+
+    def sucessores_grade(celula: int) -> List[Tuple[int, int]]:
+        linha, coluna = divmod(celula, largura)
+        resultado = []
+        for viz, valido in ((celula + 1, coluna + 1 < largura), (celula + largura, linha + 1 < altura),
+                            (celula - 1, coluna > 0), (celula - largura, linha > 0)):
+            if valido:
+                codigo = celulas[viz]
+                if codigo != CEL_PAREDE:
+                    resultado.append((viz, CUSTO_BARREIRA if codigo == CEL_BARREIRA else CUSTO_NORMAL))
+        return resultado
+    return largura, sucessores_grade
+
+@instrumentado
+def resolver_ida_estrela(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                         tamanho_tabela: int = TAMANHO_TABELA_PADRAO) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    IDA*: buscas em profundidade sucessivas limitadas por f = g + h, cada uma com o
+    limite igual ao menor f que estourou o limite anterior. Só o caminho atual fica na
+    memória (pilha explícita), mais uma tabela de transposição de tamanho fixo.
+
+    A tabela é endereçada diretamente (célula % tamanho_tabela) e guarda o menor g com
+    que a célula foi alcançada na iteração atual; chegar de novo com g maior ou igual é
+    podado, pois aquela subárvore já foi explorada com folga maior. Colisões só
+    sobrescrevem a entrada, e a geração (uma por iteração) invalida a tabela inteira
+    em O(1), como no ContextoBusca. O custo continua ótimo (Manhattan é consistente).
+    nos_visitados conta todas as células geradas, inclusive as repetidas entre iterações;
+    pico_nos é a maior soma de células no caminho atual e entradas ocupadas da tabela.
+    """
+    if tamanho_tabela < 1:
+        raise ValueError("A tabela de transposição precisa de pelo menos uma entrada")
+    tempo_inicio = time.time()
+    largura, sucessores = funcao_sucessores(lab)
+    origem, destino = inicio[0] * largura + inicio[1], fim[0] * largura + fim[1]
+    lin_fim, col_fim = fim
+
+    tabela_celula = [-1] * tamanho_tabela
+    tabela_custo = [0] * tamanho_tabela
+    tabela_geracao = [0] * tamanho_tabela
+    geracao = 0
+
+    visitados = 1
+    pico = 1
+    limite = heuristica_manhattan(inicio, fim)
+    caminho_encontrado = [inicio] if origem == destino else None
+    custo = 0
+
+    while caminho_encontrado is None:
+        geracao += 1
+        ocupadas = 0
+        proximo_limite = INFINITO
+        # Pilha do caminho atual: célula, g e vizinhos ainda por tentar (invertidos)
+        celulas, custos_g, pendentes = [origem], [0], [sucessores(origem)[::-1]]
+        no_caminho = {origem}
+
+        while celulas:
+            if not pendentes[-1]:
+                no_caminho.discard(celulas.pop())
+                custos_g.pop()
+                pendentes.pop()
+                continue
+            prox, custo_passo = pendentes[-1].pop()
+            if prox in no_caminho:
+                continue
+            novo_g = custos_g[-1] + custo_passo
+            lin, col = divmod(prox, largura)
+            f = novo_g + abs(lin - lin_fim) + abs(col - col_fim)
+            if f > limite:
+                if f < proximo_limite:
+                    proximo_limite = f
+                continue
+
+            entrada = prox % tamanho_tabela
+            if tabela_geracao[entrada] == geracao:
+                if tabela_celula[entrada] == prox and tabela_custo[entrada] <= novo_g:
+                    continue
+            else:
+                tabela_geracao[entrada] = geracao
+                ocupadas += 1
+            tabela_celula[entrada] = prox
+            tabela_custo[entrada] = novo_g
+            visitados += 1
+
+            celulas.append(prox)
+            custos_g.append(novo_g)
+            pendentes.append(sucessores(prox)[::-1])
+            no_caminho.add(prox)
+            if len(celulas) + ocupadas > pico:
+                pico = len(celulas) + ocupadas
+
+            if prox == destino:
+                caminho_encontrado = [divmod(idx, largura) for idx in celulas]
+                custo = novo_g
+                break
+
+        if proximo_limite == INFINITO:
+            break
+        limite = proximo_limite
+
+    tempo_fim = time.time()
+    metricas = coletar_metricas(
+        caminho_encontrado, custo, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, "IDA*"
+    )
+    metricas.pico_nos = pico
+    return caminho_encontrado, metricas
+
+class NoSMA:
+    """Nó da árvore de busca do SMA*."""
+    __slots__ = ("celula", "g", "f", "profundidade", "pai", "filhos", "esquecidos", "versao", "aberto")
+
+    def __init__(self, celula: int, g: int, f: float, profundidade: int, pai: Optional["NoSMA"]):
+        self.celula = celula
+        self.g = g
+        self.f = f
+        self.profundidade = profundidade
+        self.pai = pai
+        self.filhos: Dict[int, "NoSMA"] = {}  # Célula -> filho na memória
+        self.esquecidos: Dict[int, float] = {}  # Célula -> melhor f de um filho descartado
+        self.versao = 0  # Invalida as entradas antigas dos heaps de abertos
+        self.aberto = False
+
+    def menor_esquecido(self) -> float:
+        """Menor f entre os filhos descartados (infinito se não houver)."""
+        return min(self.esquecidos.values(), default=INFINITO)
+
+    def no_caminho(self, celula: int) -> bool:
+        """Verifica se a célula é deste nó ou de um ancestral (evita ciclos na árvore)."""
+        no = self
+        while no is not None:
+            if no.celula == celula:
+                return True
+            no = no.pai
+        return False
+
+@instrumentado
+def resolver_sma_estrela(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                         max_nos: int = MAX_NOS_PADRAO) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    SMA* (Simplified Memory-bounded A*): A* em árvore que nunca guarda mais que cerca
+    de max_nos nós (a expansão de um nó pode passar do limite por até 4 filhos, que
+    são descartados em seguida).
+
+    Ao passar do limite, a pior folha (maior f, mais rasa) é descartada e o pai guarda o
+    f dela em `esquecidos`. O f de cada nó é o mínimo entre os filhos na memória e os
+    esquecidos, atualizado nos ancestrais a cada mudança. Abertos são as folhas (pelo
+    próprio f) e os nós com filhos esquecidos (pelo menor esquecido), ordenados do menor
+    para o maior e, no empate, do mais profundo; abrir um nó regenera os filhos que
+    faltam com f = max(f do pai, g + h, valor esquecido). Um nó na profundidade máxima
+    que não é o fim, ou sem filhos, recebe f infinito.
+
+    Para não repetir células, `na_memoria` guarda o nó de menor g de cada célula presente
+    na árvore: um filho não é gerado se a célula dele já está na memória com g menor ou
+    igual (o que também exclui os ancestrais). A tabela só cobre os nós na memória;
+    quando o nó de uma célula é descartado, ela sai da tabela e pode ser gerada de novo
+    por outro pai. Verificado contra o A* em labirintos com barreiras: o custo é ótimo
+    sempre que o limite comporta o caminho até o fim. pico_nos é o maior número de nós
+    da árvore ao mesmo tempo.
+    """
+    if max_nos < 2:
+        raise ValueError("O SMA* precisa de pelo menos 2 nós de memória")
+    tempo_inicio = time.time()
+    largura, sucessores = funcao_sucessores(lab)
+    origem, destino = inicio[0] * largura + inicio[1], fim[0] * largura + fim[1]
+    lin_fim, col_fim = fim
+
+    # Dois heaps com remoção preguiçosa: abertos pelo melhor valor e folhas pelo pior
+    melhores: List[Tuple[float, int, int, int, NoSMA]] = []
+    piores: List[Tuple[float, int, int, int, NoSMA]] = []
+    sequencia = 0
+
+    def abrir(no: NoSMA) -> None:
+        """Coloca (ou recoloca, com os valores atuais) o nó entre os abertos."""
+        nonlocal sequencia
+        no.versao += 1
+        no.aberto = True
+        sequencia += 1
+        if no.filhos:
+            heapq.heappush(melhores, (no.menor_esquecido(), -no.profundidade, sequencia, no.versao, no))
+        else:
+            heapq.heappush(melhores, (no.f, -no.profundidade, sequencia, no.versao, no))
+            heapq.heappush(piores, (-no.f, no.profundidade, sequencia, no.versao, no))
+
+    def fechar(no: NoSMA) -> None:
+        no.versao += 1
+        no.aberto = False
+
+    def topo(heap: List) -> Optional[Tuple[float, int, int, int, NoSMA]]:
+        """Remove as entradas obsoletas e retorna a entrada do topo (sem remover)."""
+        while heap:
+            entrada = heap[0]
+            no = entrada[4]
+            if no.aberto and entrada[3] == no.versao:
+                return entrada
+            heapq.heappop(heap)
+        return None
+
+    def atualizar_ancestrais(no: Optional[NoSMA]) -> None:
+        """Refaz f = mínimo entre filhos e esquecidos, subindo enquanto algo mudar."""
+        while no is not None:
+            novo_f = min(min((filho.f for filho in no.filhos.values()), default=INFINITO),
+                         no.menor_esquecido())
+            if novo_f == no.f:
+                return
+            no.f = novo_f
+            if no.aberto:
+                abrir(no)
+            no = no.pai
+
+    raiz = NoSMA(origem, 0, heuristica_manhattan(inicio, fim), 0, None)
+    na_memoria: Dict[int, NoSMA] = {origem: raiz}  # Nó de menor g de cada célula na árvore
+    abrir(raiz)
+    nos = 1
+    pico = 1
+    visitados = 1
+
+    caminho = None
+    custo = 0
+    while True:
+        entrada = topo(melhores)
+        if entrada is None or entrada[0] == INFINITO:
+            break
+        no = entrada[4]
+        if no.celula == destino:
+            caminho = []
+            custo = no.g
+            while no is not None:
+                caminho.append(divmod(no.celula, largura))
+                no = no.pai
+            caminho.reverse()
+            break
+
+        # Gera os filhos que não estão na memória (todos, numa folha nova)
+        fechar(no)
+        for prox, custo_passo in sucessores(no.celula):
+            if prox in no.filhos:
+                continue
+            esquecido = no.esquecidos.pop(prox, None)
+            if esquecido == INFINITO:
+                no.esquecidos[prox] = INFINITO
+                continue
+            novo_g = no.g + custo_passo
+            existente = na_memoria.get(prox)
+            if existente is not None and existente.g <= novo_g:
+                continue
+            profundidade = no.profundidade + 1
+            if prox != destino and profundidade >= max_nos - 1:
+                f = INFINITO
+            else:
+                lin, col = divmod(prox, largura)
+                f = max(no.f, novo_g + abs(lin - lin_fim) + abs(col - col_fim))
+                if esquecido is not None and esquecido > f:
+                    f = esquecido
+            filho = NoSMA(prox, novo_g, f, profundidade, no)
+            no.filhos[prox] = filho
+            na_memoria[prox] = filho
+            abrir(filho)
+            nos += 1
+            visitados += 1
+        if nos > pico:
+            pico = nos
+
+        atualizar_ancestrais(no)
+        if not no.filhos:
+            # Sem saída: vira uma folha de f infinito, a primeira a ser descartada
+            abrir(no)
+
+        # Descarta as piores folhas até voltar ao limite de memória
+        while nos > max_nos:
+            entrada = topo(piores)
+            if entrada is None or entrada[4] is raiz:
+                break
+            folha = entrada[4]
+            fechar(folha)
+            pai = folha.pai
+            del pai.filhos[folha.celula]
+            pai.esquecidos[folha.celula] = min(pai.esquecidos.get(folha.celula, INFINITO), folha.f)
+            if na_memoria.get(folha.celula) is folha:
+                del na_memoria[folha.celula]
+            nos -= 1
+            atualizar_ancestrais(pai)
+            if pai.menor_esquecido() != INFINITO or not pai.filhos:
+                abrir(pai)
+
+    tempo_fim = time.time()
+    metricas = coletar_metricas(
+        caminho, custo, visitados, tempo_inicio, tempo_fim,
+        inicio, fim, "SMA*"
+    )
+    metricas.pico_nos = pico
+    return caminho, metricas
@@ -0,0 +1,125 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto
+from grafo import GrafoLabirinto, como_grafo, tipo_indice
+from algoritmos import MetricasBusca
+from arquivo import alinhar
+
+Resolvedor = Callable[..., Tuple[Optional[Caminho], MetricasBusca]]
+ResultadoBusca = Tuple[Optional[Caminho], MetricasBusca]
+
+# Descrição picklável de um grafo em memória compartilhada:
+# (nome do bloco, altura, largura, typecode dos índices, nº de offsets, nº de arestas)
+DescritorGrafo = Tuple[str, int, int, str, int, int]
+
+# Grafos já anexados neste processo (cada worker anexa cada bloco uma única vez)
+GRAFOS_ANEXADOS: Dict[str, Tuple[shared_memory.SharedMemory, GrafoLabirinto]] = {}
+
+def layout_grafo(tipo: str, num_offsets: int, num_arestas: int) -> Tuple[int, int, int, int]:
+    """Retorna os deslocamentos de offsets, vizinhos e custos no bloco e o tamanho total."""
+    tamanho_indice = 4 if tipo == "i" else 8
+    inicio_vizinhos = 0
+    inicio_arestas = alinhar(num_offsets * tamanho_indice)
+    inicio_custos = alinhar(inicio_arestas + num_arestas * tamanho_indice)
+    return inicio_vizinhos, inicio_arestas, inicio_custos, max(1, inicio_custos + num_arestas)
+
+def exportar_grafo(grafo: GrafoLabirinto) -> Tuple[shared_memory.SharedMemory, DescritorGrafo]:
+    """
+    Copia os arrays CSR do grafo para um bloco de memória compartilhada (uma única cópia).
+    Quem chama é responsável por close() e unlink() do bloco ao terminar.
+    """
+    tipo = tipo_indice(grafo.num_celulas)
+    num_offsets, num_arestas = len(grafo.inicio_vizinhos), len(grafo.vizinhos)
+    pos_offsets, pos_arestas, pos_custos, tamanho = layout_grafo(tipo, num_offsets, num_arestas)
+
+    bloco = shared_memory.SharedMemory(create=True, size=tamanho)
+    try:
+        buf = bloco.buf
+        for deslocamento, dados in ((pos_offsets, grafo.inicio_vizinhos),
+                                    (pos_arestas, grafo.vizinhos),
+                                    (pos_custos, grafo.custos)):
+            origem = memoryview(dados).cast("B")
+            buf[deslocamento:deslocamento + len(origem)] = origem
+            origem.release()
+    except BaseException:
+        bloco.close()
+        bloco.unlink()
+        raise
+    return bloco, (bloco.name, grafo.altura, grafo.largura, tipo, num_offsets, num_arestas)
+
+def anexar_grafo(descritor: DescritorGrafo) -> GrafoLabirinto:
+    """Reconstrói, sem copiar, um GrafoLabirinto sobre o bloco compartilhado descrito."""
+    nome, altura, largura, tipo, num_offsets, num_arestas = descritor
+    if nome in GRAFOS_ANEXADOS:
+        return GRAFOS_ANEXADOS[nome][1]
+
+    bloco = shared_memory.SharedMemory(name=nome)
+    pos_offsets, pos_arestas, pos_custos, _ = layout_grafo(tipo, num_offsets, num_arestas)
+    tamanho_indice = 4 if tipo == "i" else 8
+    buf = bloco.buf
+    grafo = GrafoLabirinto(
+        altura, largura,
+        buf[pos_offsets:pos_offsets + num_offsets * tamanho_indice].cast(tipo),
+        buf[pos_arestas:pos_arestas + num_arestas * tamanho_indice].cast(tipo),
+        buf[pos_custos:pos_custos + num_arestas].cast("B"),
+    )
+    GRAFOS_ANEXADOS[nome] = (bloco, grafo)
+    return grafo
+
+def resolver_no_processo(descritor: DescritorGrafo, resolver: Resolvedor,
+                         inicio: Posicao, fim: Posicao) -> ResultadoBusca:
+    """Tarefa executada no worker: anexa o grafo compartilhado e roda o algoritmo."""
+    return resolver(anexar_grafo(descritor), inicio, fim)
+
+def resolver_varios_em_paralelo(
+    labirintos: List[Tuple[Union[Labirinto, GradeLabirinto, GrafoLabirinto], Posicao, Posicao]],
+    algoritmos: Dict[str, Resolvedor],
+    processos: Optional[int] = None
+) -> List[Dict[str, ResultadoBusca]]:
+    """
+    Roda todos os algoritmos em todos os labirintos usando um único pool de processos.
+    Cada labirinto é compilado e colocado em memória compartilhada uma vez; os workers
+    leem o grafo direto do bloco, sem cópia por worker.
+
+    Args:
+        labirintos: Lista de (labirinto, início, fim)
+        algoritmos: Nome -> função resolver_* a executar
+        processos: Número de processos (padrão: um por tarefa, até o número de CPUs)
+
+    Returns:
+        Para cada labirinto, um dicionário nome -> (caminho, métricas) na ordem de `algoritmos`.
+    """
+    blocos = []
+    try:
+        descritores = []
+        for lab, _, _ in labirintos:
+            bloco, descritor = exportar_grafo(como_grafo(lab))
+            blocos.append(bloco)
+            descritores.append(descritor)
+
+        num_tarefas = len(labirintos) * len(algoritmos)
+        if processos is None:
+            processos = max(1, min(num_tarefas, os.cpu_count() or 1))
+
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [
+                {
+                    nome: executor.submit(resolver_no_processo, descritor, resolver, inicio, fim)
+                    for nome, resolver in algoritmos.items()
+                }
+                for descritor, (_, inicio, fim) in zip(descritores, labirintos)
+            ]
+            return [{nome: futuro.result() for nome, futuro in por_nome.items()} for por_nome in futuros]
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+
+def resolver_em_paralelo(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                         algoritmos: Dict[str, Resolvedor],
+                         processos: Optional[int] = None) -> Dict[str, ResultadoBusca]:
+    """Roda todos os algoritmos no mesmo labirinto em paralelo (ver resolver_varios_em_paralelo)."""
+    return resolver_varios_em_paralelo([(lab, inicio, fim)], algoritmos, processos)[0]
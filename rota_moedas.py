@@ -0,0 +1,332 @@
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto
+from grafo import GrafoLabirinto, como_grafo, custos_de_entrada
+from algoritmos import MetricasBusca, coletar_metricas
+from instrumentacao import instrumentado
+
+# Até quantas moedas a ordem é exata (Held-Karp, O(2^n * n^2)); acima disso é heurística
+LIMITE_HELD_KARP = 12
+# Pontos mais próximos guardados por ponto na heurística (listas de candidatos)
+VIZINHOS_CANDIDATOS = 10
+
+class MatrizRota:
+    """
+    Distâncias entre os pontos da rota: o ponto 0 é o início, os pontos 1..n são as
+    moedas e o último é o fim. Cada busca é um Dijkstra de múltiplos alvos a partir de
+    um ponto, que para ao fixar os alvos pedidos e guarda a árvore de caminhos para
+    montar os trechos depois.
+
+    Como o custo é pago ao entrar na célula, d(j, i) = d(i, j) + c(i) - c(j); por isso
+    basta medir cada par em um sentido.
+    """
+    __slots__ = ("grafo", "pontos", "custo_ponto", "medidas", "arvores", "candidatos", "nos_visitados")
+
+    def __init__(self, grafo: GrafoLabirinto, pontos: List[Posicao]):
+        self.grafo = grafo
+        self.pontos = [grafo.indice(pos) for pos in pontos]
+        custo_celula = custos_de_entrada(grafo)
+        self.custo_ponto = [custo_celula[celula] for celula in self.pontos]
+        self.medidas: Dict[Tuple[int, int], int] = {}  # (i, j) -> d(i, j), medida a partir de i
+        self.arvores: List[Optional[Dict[int, int]]] = [None] * len(pontos)
+        self.candidatos: List[List[int]] = [[] for _ in pontos]
+        self.nos_visitados = 0
+
+    def buscar(self, origem: int, alvos: Iterable[int], limite: Optional[int] = None) -> List[int]:
+        """
+        Dijkstra a partir do ponto origem até fixar todos os alvos, ou só os `limite`
+        mais próximos. Retorna os alvos fixados, do mais próximo ao mais distante.
+        """
+        inicio_vizinhos, vizinhos, custos = self.grafo.inicio_vizinhos, self.grafo.vizinhos, self.grafo.custos
+        pendentes: Dict[int, List[int]] = {}
+        for alvo in alvos:
+            pendentes.setdefault(self.pontos[alvo], []).append(alvo)
+        restantes = limite if limite is not None else sum(map(len, pendentes.values()))
+
+        celula = self.pontos[origem]
+        distancia = {celula: 0}
+        veio_de = {celula: -1}
+        fila = [(0, celula)]
+        fixados: List[int] = []
+        visitados = 0
+        while fila and restantes > 0:
+            d, atual = heapq.heappop(fila)
+            if d > distancia[atual]:
+                continue  # Entrada desatualizada
+            visitados += 1
+            if atual in pendentes:
+                for alvo in pendentes.pop(atual):
+                    self.medidas[(origem, alvo)] = d
+                    fixados.append(alvo)
+                    restantes -= 1
+                if restantes <= 0:
+                    break
+            for k in range(inicio_vizinhos[atual], inicio_vizinhos[atual + 1]):
+                prox = vizinhos[k]
+                nova = d + custos[k]
+                if nova < distancia.get(prox, nova + 1):
+                    distancia[prox] = nova
+                    veio_de[prox] = atual
+                    heapq.heappush(fila, (nova, prox))
+
+        # Uma busca mais longa a partir da mesma origem estende a anterior (mesma ordem
+        # de expansão), então as medidas já guardadas continuam valendo na nova árvore
+        if self.arvores[origem] is None or len(veio_de) > len(self.arvores[origem]):
+            self.arvores[origem] = veio_de
+        self.nos_visitados += visitados
+        return fixados
+
+    def distancia(self, i: int, j: int) -> Optional[int]:
+        """Custo de ir do ponto i ao ponto j, ou None se o par ainda não foi medido."""
+        d = self.medidas.get((i, j))
+        if d is not None:
+            return d
+        d = self.medidas.get((j, i))
+        if d is not None:
+            return d + self.custo_ponto[j] - self.custo_ponto[i]
+        return None
+
+    def dobro(self, i: int, j: int) -> Optional[int]:
+        """d(i, j) + d(j, i): custo simétrico usado nas trocas de 2-opt e Or-opt."""
+        d = self.distancia(i, j)
+        return None if d is None else 2 * d + self.custo_ponto[i] - self.custo_ponto[j]
+
+    def trecho(self, i: int, j: int) -> List[int]:
+        """Células de um caminho mínimo do ponto i ao ponto j (o par precisa estar medido)."""
+        if (i, j) in self.medidas:
+            celulas = subir_arvore(self.arvores[i], self.pontos[j])
+            celulas.reverse()
+            return celulas
+        # Medido a partir de j: o caminho de j até i, percorrido ao contrário, também é mínimo
+        return subir_arvore(self.arvores[j], self.pontos[i])
+
+def subir_arvore(veio_de: Dict[int, int], celula: int) -> List[int]:
+    """Segue os pais da célula até a raiz da árvore (-1 marca a raiz)."""
+    celulas = []
+    while celula != -1:
+        celulas.append(celula)
+        celula = veio_de[celula]
+    return celulas
+
+def ordem_held_karp(matriz: MatrizRota) -> Optional[List[int]]:
+    """
+    Ordem ótima das moedas por programação dinâmica sobre subconjuntos (Held-Karp):
+    custo[mascara][j] é o menor custo saindo do início, pegando as moedas de mascara
+    e parando na moeda j. Exige a matriz completa.
+    """
+    n = len(matriz.pontos) - 2
+    fim = n + 1
+    infinito = float("inf")
+    d = [[infinito if x is None else x for x in (matriz.distancia(i, j) for j in range(n + 2))]
+         for i in range(n + 2)]
+    if n == 0:
+        return [0, fim] if d[0][fim] < infinito else None
+
+    custo = [[infinito] * n for _ in range(1 << n)]
+    pai = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        custo[1 << j][j] = d[0][j + 1]
+    for mascara in range(1, 1 << n):
+        linha = custo[mascara]
+        for j in range(n):
+            atual = linha[j]
+            if atual == infinito or not mascara >> j & 1:
+                continue
+            saidas = d[j + 1]
+            for k in range(n):
+                if mascara >> k & 1:
+                    continue
+                novo = atual + saidas[k + 1]
+                proxima = mascara | 1 << k
+                if novo < custo[proxima][k]:
+                    custo[proxima][k] = novo
+                    pai[proxima][k] = j
+
+    completa = (1 << n) - 1
+    ultima = min(range(n), key=lambda j: custo[completa][j] + d[j + 1][fim])
+    if custo[completa][ultima] + d[ultima + 1][fim] == infinito:
+        return None
+    ordem = [fim]
+    mascara, j = completa, ultima
+    while j != -1:
+        ordem.append(j + 1)
+        mascara, j = mascara ^ 1 << j, pai[mascara][j]
+    ordem.append(0)
+    ordem.reverse()
+    return ordem
+
+def ordem_vizinho_mais_proximo(matriz: MatrizRota) -> Optional[List[int]]:
+    """
+    Ordem gulosa: sempre vai à moeda mais próxima ainda não pega. Usa as listas de
+    candidatos e, quando todas já foram pegas, busca a partir do ponto atual até a
+    moeda pendente mais próxima.
+    """
+    fim = len(matriz.pontos) - 1
+    pegas = [False] * (fim + 1)
+    pegas[0] = True
+    ordem = [0]
+    atual = 0
+    for _ in range(fim - 1):
+        proxima = next((j for j in matriz.candidatos[atual] if not pegas[j] and j != fim), None)
+        if proxima is None:
+            achadas = matriz.buscar(atual, [j for j in range(1, fim) if not pegas[j]], limite=1)
+            if not achadas:
+                return None  # Moedas inalcançáveis
+            proxima = achadas[0]
+        pegas[proxima] = True
+        ordem.append(proxima)
+        atual = proxima
+    if matriz.distancia(atual, fim) is None and not matriz.buscar(atual, [fim]):
+        return None
+    ordem.append(fim)
+    return ordem
+
+def melhorar_2opt(matriz: MatrizRota, ordem: List[int]) -> bool:
+    """
+    2-opt restrito às listas de candidatos: troca as arestas (a, b) e (c, e) por
+    (a, c) e (b, e), invertendo o trecho entre elas. Início e fim ficam nas pontas.
+    Pares não medidos não são considerados. Retorna se houve melhora.
+    """
+    dobro, candidatos = matriz.dobro, matriz.candidatos
+    posicao = [0] * len(ordem)
+    for i, ponto in enumerate(ordem):
+        posicao[ponto] = i
+    ultimo = len(ordem) - 1
+    melhorou = False
+    for i in range(ultimo):
+        a, b = ordem[i], ordem[i + 1]
+        ab = dobro(a, b)
+        for c in candidatos[a]:
+            j = posicao[c]
+            if i + 1 < j < ultimo:
+                # ... a b ... c e ...  ->  ... a c ... b e ...
+                e = ordem[j + 1]
+                inicio_trecho, fim_trecho = i + 1, j
+                trocas = (dobro(a, c), dobro(b, e), dobro(c, e))
+            elif j < i:
+                # ... c e ... a b ...  ->  ... c a ... e b ...
+                e = ordem[j + 1]
+                inicio_trecho, fim_trecho = j + 1, i
+                trocas = (dobro(c, a), dobro(e, b), dobro(c, e))
+            else:
+                continue
+            if None in trocas or trocas[0] + trocas[1] >= ab + trocas[2]:
+                continue
+            ordem[inicio_trecho:fim_trecho + 1] = reversed(ordem[inicio_trecho:fim_trecho + 1])
+            for k in range(inicio_trecho, fim_trecho + 1):
+                posicao[ordem[k]] = k
+            melhorou = True
+            break
+    return melhorou
+
+def melhorar_or_opt(matriz: MatrizRota, ordem: List[int], tamanho_maximo: int = 3) -> bool:
+    """
+    Or-opt: move trechos de até tamanho_maximo moedas (em qualquer sentido) para entre
+    dois pontos vizinhos de uma das pontas do trecho. Retorna se houve melhora.
+    """
+    dobro, candidatos = matriz.dobro, matriz.candidatos
+    melhorou = False
+    for tamanho in range(1, tamanho_maximo + 1):
+        i = 1
+        while i + tamanho < len(ordem):
+            ultimo = len(ordem) - 1
+            anterior, seguinte = ordem[i - 1], ordem[i + tamanho]
+            primeira, ultima = ordem[i], ordem[i + tamanho - 1]
+            partes = (dobro(anterior, primeira), dobro(ultima, seguinte), dobro(anterior, seguinte))
+            if None in partes:
+                i += 1
+                continue
+            ganho = partes[0] + partes[1] - partes[2]
+            posicao = {ponto: k for k, ponto in enumerate(ordem)}
+
+            melhor = None
+            for c in set(candidatos[primeira]) | set(candidatos[ultima]):
+                j = posicao[c]
+                for k in (j - 1, j):  # Aresta (ordem[k], ordem[k + 1]) onde o trecho entraria
+                    if k < 0 or k + 1 > ultimo or i - 1 <= k <= i + tamanho - 1:
+                        continue
+                    u, v = ordem[k], ordem[k + 1]
+                    uv = dobro(u, v)
+                    for invertido, (x, y) in ((False, (primeira, ultima)), (True, (ultima, primeira))):
+                        ux, yv = dobro(u, x), dobro(y, v)
+                        if uv is None or ux is None or yv is None:
+                            continue
+                        custo = ux + yv - uv
+                        if custo < ganho and (melhor is None or custo < melhor[0]):
+                            melhor = (custo, k, invertido)
+
+            if melhor is None:
+                i += 1
+                continue
+            _, k, invertido = melhor
+            trecho = ordem[i:i + tamanho]
+            if invertido:
+                trecho.reverse()
+            del ordem[i:i + tamanho]
+            if k > i:
+                k -= tamanho
+            ordem[k + 1:k + 1] = trecho
+            melhorou = True
+    return melhorou
+
+@instrumentado
+def resolver_rota_moedas(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], inicio: Posicao, fim: Posicao,
+                         moedas: Iterable[Posicao], limite_exato: int = LIMITE_HELD_KARP,
+                         vizinhos_candidatos: int = VIZINHOS_CANDIDATOS) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Planeja a rota do objetivo completo do jogo: sair do início, pegar todas as moedas
+    e chegar ao fim.
+
+    Com até limite_exato moedas, mede todos os pares (um Dijkstra de múltiplos alvos por
+    ponto, cada par medido uma vez) e acha a ordem ótima com Held-Karp. Acima disso,
+    cada Dijkstra para nos vizinhos_candidatos pontos mais próximos, e a ordem vem do
+    vizinho mais próximo refinado com 2-opt e Or-opt.
+
+    Args:
+        lab: O labirinto (grade, forma antiga ou grafo já compilado)
+        inicio: Posição de início
+        fim: Posição de fim
+        moedas: Posições das moedas (como retornadas por gerar_labirinto)
+        limite_exato: Maior número de moedas resolvido com Held-Karp
+        vizinhos_candidatos: Tamanho das listas de candidatos da heurística
+
+    Returns:
+        O caminho célula a célula (None se alguma moeda ou o fim for inalcançável) e as
+        métricas; nos_visitados soma as células fixadas por todas as buscas
+    """
+    tempo_inicio = time.time()
+    grafo = como_grafo(lab)
+    pontos = [inicio, *moedas, fim]
+    matriz = MatrizRota(grafo, pontos)
+    num_pontos = len(pontos)
+    num_moedas = num_pontos - 2
+
+    if num_moedas <= limite_exato:
+        for i in range(num_pontos - 1):
+            matriz.buscar(i, range(i + 1, num_pontos))
+        ordem = ordem_held_karp(matriz)
+        algoritmo = "Rota das Moedas (Held-Karp)"
+    else:
+        for i in range(num_pontos):
+            matriz.candidatos[i] = matriz.buscar(i, (j for j in range(num_pontos) if j != i), vizinhos_candidatos)
+        ordem = ordem_vizinho_mais_proximo(matriz)
+        if ordem is not None:
+            while melhorar_2opt(matriz, ordem) or melhorar_or_opt(matriz, ordem):
+                pass
+        algoritmo = "Rota das Moedas (2-opt + Or-opt)"
+
+    caminho = None
+    custo = 0
+    if ordem is not None:
+        largura = grafo.largura
+        caminho = [inicio]
+        for de, para in zip(ordem, ordem[1:]):
+            custo += matriz.distancia(de, para)
+            caminho.extend(divmod(celula, largura) for celula in matriz.trecho(de, para)[1:])
+
+    tempo_fim = time.time()
+    return caminho, coletar_metricas(caminho, custo, matriz.nos_visitados, tempo_inicio, tempo_fim,
+                                     inicio, fim, algoritmo)
@@ -0,0 +1,504 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from constantes import CEL_PAREDE
+from grade import Posicao, Caminho, GradeLabirinto
+from grafo import GrafoLabirinto, compilar_grafo
+from labirinto import gerar_labirinto
+from arquivo import carregar_labirinto
+from cache_resultados import CacheResultados
+from algoritmos import (
+    MetricasBusca,
+    resolver_a_estrela,
+    resolver_dijkstra,
+    resolver_dfs,
+    resolver_guloso,
+    resolver_best_first_search,
+    resolver_a_estrela_bidirecional,
+    resolver_dijkstra_bidirecional,
+    resolver_jps
+)
+from memoria_limitada import resolver_ida_estrela, resolver_sma_estrela
+
+# Algoritmos aceitos nos pedidos (nome no protocolo -> função)
+SOLUCIONADORES: Dict[str, Callable] = {
+    "a_estrela": resolver_a_estrela,
+    "dijkstra": resolver_dijkstra,
+    "dfs": resolver_dfs,
+    "guloso": resolver_guloso,
+    "best_first": resolver_best_first_search,
+    "a_estrela_bidirecional": resolver_a_estrela_bidirecional,
+    "dijkstra_bidirecional": resolver_dijkstra_bidirecional,
+    "jps": resolver_jps,
+    "ida_estrela": resolver_ida_estrela,
+    "sma_estrela": resolver_sma_estrela,
+}
+
+Pedido = Dict[str, Any]
+Resposta = Dict[str, Any]
+
+class ErroPedido(Exception):
+    """Pedido inválido ou que não pode ser atendido; a mensagem vai na resposta."""
+
+# --- Lado do worker: cada processo guarda os labirintos que gerou ou carregou ---
+
+# Labirinto guardado no worker: grade, grafo compilado e impressão digital
+LabirintoGuardado = Tuple[GradeLabirinto, GrafoLabirinto, str]
+_LABIRINTOS: "OrderedDict[str, LabirintoGuardado]" = OrderedDict()
+_CACHE = CacheResultados()
+
+def _guardar_labirinto(id_labirinto: str, lab: GradeLabirinto, inicio: Posicao, fim: Posicao,
+                       moedas: List[Posicao], max_labirintos: int) -> Dict[str, Any]:
+    """Compila e guarda o labirinto no worker, descartando os mais antigos acima do limite."""
+    _LABIRINTOS[id_labirinto] = (lab, compilar_grafo(lab), lab.impressao_digital())
+    descartados = []
+    while len(_LABIRINTOS) > max_labirintos:
+        descartados.append(_LABIRINTOS.popitem(last=False)[0])
+    return {
+        "labirinto": id_labirinto,
+        "altura": lab.altura,
+        "largura": lab.largura,
+        "inicio": list(inicio),
+        "fim": list(fim),
+        "moedas": [list(pos) for pos in moedas],
+        "descartados": descartados,
+    }
+
+def trabalho_gerar(id_labirinto: str, max_labirintos: int, altura: int, largura: int, num_moedas: int,
+                   algoritmo: str, semente: Optional[int]) -> Dict[str, Any]:
+    """Gera um labirinto no worker e o guarda com o id dado."""
+    lab, inicio, fim, moedas = gerar_labirinto(altura, largura, num_moedas, algoritmo, semente, verboso=False)
+    return _guardar_labirinto(id_labirinto, lab, inicio, fim, moedas, max_labirintos)
+
+def trabalho_carregar(id_labirinto: str, max_labirintos: int, caminho_arquivo: str) -> Dict[str, Any]:
+    """Abre um labirinto salvo (via mmap) no worker e o guarda com o id dado."""
+    lab, inicio, fim, moedas = carregar_labirinto(caminho_arquivo)
+    return _guardar_labirinto(id_labirinto, lab, inicio, fim, moedas, max_labirintos)
+
+def posicao_valida(lab: GradeLabirinto, valor: Any, campo: str) -> Posicao:
+    """Converte o [linha, coluna] de um pedido, recusando posições fora da grade ou em paredes."""
+    try:
+        pos = int(valor[0]), int(valor[1])
+    except (TypeError, ValueError, IndexError):
+        raise ValueError(f"'{campo}' deve ser [linha, coluna]") from None
+    if not lab.dentro_limites(pos):
+        raise ValueError(f"'{campo}' {list(pos)} está fora do labirinto {lab.altura}x{lab.largura}")
+    if lab[pos] == CEL_PAREDE:
+        raise ValueError(f"'{campo}' {list(pos)} é uma parede")
+    return pos
+
+def _labirinto(id_labirinto: str) -> LabirintoGuardado:
+    try:
+        guardado = _LABIRINTOS[id_labirinto]
+    except KeyError:
+        raise ErroPedido(f"Labirinto desconhecido: {id_labirinto}") from None
+    _LABIRINTOS.move_to_end(id_labirinto)
+    return guardado
+
+def _resultado(caminho: Optional[Caminho], metricas: MetricasBusca, incluir_caminho: bool) -> Dict[str, Any]:
+    resultado = {"metricas": dataclasses.asdict(metricas)}
+    if incluir_caminho:
+        resultado["caminho"] = None if caminho is None else [list(pos) for pos in caminho]
+    return resultado
+
+def trabalho_resolver(id_labirinto: str, algoritmo: str, inicio: Posicao, fim: Posicao,
+                      incluir_caminho: bool) -> Dict[str, Any]:
+    """Resolve uma consulta num labirinto guardado (passando pelo cache do worker)."""
+    lab, grafo, impressao = _labirinto(id_labirinto)
+    inicio, fim = posicao_valida(lab, inicio, "inicio"), posicao_valida(lab, fim, "fim")
+    caminho, metricas = _CACHE.resolver(SOLUCIONADORES[algoritmo], grafo, inicio, fim, impressao)
+    return _resultado(caminho, metricas, incluir_caminho)
+
+def trabalho_comparar(id_labirinto: str, algoritmos: Tuple[str, ...], inicio: Posicao, fim: Posicao,
+                      incluir_caminho: bool) -> Dict[str, Any]:
+    """Roda vários algoritmos na mesma consulta e retorna os resultados por nome."""
+    lab, grafo, impressao = _labirinto(id_labirinto)
+    inicio, fim = posicao_valida(lab, inicio, "inicio"), posicao_valida(lab, fim, "fim")
+    resultados = {}
+    for nome in algoritmos:
+        caminho, metricas = _CACHE.resolver(SOLUCIONADORES[nome], grafo, inicio, fim, impressao)
+        resultados[nome] = _resultado(caminho, metricas, incluir_caminho)
+    return {"resultados": resultados}
+
+def trabalho_descartar(id_labirinto: str) -> Dict[str, Any]:
+    """Esquece um labirinto guardado."""
+    return {"descartado": _LABIRINTOS.pop(id_labirinto, None) is not None}
+
+# --- Lado do servidor ---
+
+class Trabalhador:
+    """
+    Um processo de trabalho (ProcessPoolExecutor de um só processo, para que os
+    labirintos guardados nele continuem lá) com uma fila limitada de tarefas.
+    As tarefas rodam uma de cada vez; as canceladas enquanto esperavam na fila são
+    puladas sem chegar ao processo.
+    """
+
+    def __init__(self, indice: int, tamanho_fila: int):
+        self.indice = indice
+        self.executor = ProcessPoolExecutor(max_workers=1)
+        self.fila: asyncio.Queue = asyncio.Queue(tamanho_fila)
+        self.labirintos: Set[str] = set()
+        self.consumidor: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        self.consumidor = asyncio.get_running_loop().create_task(self._consumir())
+
+    async def submeter(self, funcao: Callable, *args, concluir: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Enfileira a tarefa (esperando vaga se a fila estiver cheia) e espera o resultado.
+        Cancelar quem espera cancela a tarefa se ela ainda não começou. `concluir` é
+        chamado com o resultado sempre que a tarefa roda até o fim, mesmo que ninguém
+        espere mais por ela (para registrar o que ela deixou no processo).
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        await self.fila.put((futuro, funcao, args, concluir))
+        return await futuro
+
+    async def _consumir(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            futuro, funcao, args, concluir = await self.fila.get()
+            if futuro.done():
+                continue  # Cancelada enquanto esperava na fila
+            try:
+                resultado = await loop.run_in_executor(self.executor, funcao, *args)
+            except BrokenProcessPool:
+                # O processo morreu: recomeça com um novo, sem os labirintos guardados
+                self.executor = ProcessPoolExecutor(max_workers=1)
+                self.labirintos.clear()
+                if not futuro.done():
+                    futuro.set_exception(ErroPedido("O processo de trabalho foi reiniciado"))
+            except Exception as erro:
+                if not futuro.done():
+                    futuro.set_exception(erro)
+            else:
+                if concluir is not None:
+                    concluir(resultado)
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    def carga(self) -> Tuple[int, int]:
+        return self.fila.qsize(), len(self.labirintos)
+
+    async def encerrar(self) -> None:
+        if self.consumidor is not None:
+            self.consumidor.cancel()
+            try:
+                await self.consumidor
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=False)
+
+class ServicoLabirintos:
+    """
+    Serviço local de labirintos: JSON delimitado por linhas sobre socket Unix ou TCP.
+
+    Cada linha recebida é um pedido {"id": ..., "op": ..., ...} e cada resposta é uma
+    linha {"id": ..., "ok": true, ...} ou {"id": ..., "ok": false, "erro": "..."}, na
+    ordem em que ficarem prontas (vários pedidos podem estar em andamento na mesma
+    conexão). Operações:
+    - gerar (altura, largura, moedas, algoritmo, semente): gera um labirinto num worker
+      e responde com o id dele, início, fim e moedas;
+    - carregar (arquivo): abre um labirinto salvo num worker;
+    - resolver (labirinto, algoritmo, inicio, fim, incluir_caminho): caminho e métricas;
+    - comparar (labirinto, algoritmos, inicio, fim, incluir_caminho): um resultado por algoritmo;
+    - descartar (labirinto), cancelar (alvo: id de um pedido desta conexão) e estado.
+
+    O trabalho pesado vai para os processos de trabalho; cada labirinto fica no worker
+    que o gerou e os pedidos sobre ele são enviados para lá. As filas dos workers são
+    limitadas (quem chega com a fila cheia espera) e cada conexão tem no máximo
+    max_pendentes pedidos em andamento, depois disso o servidor para de ler dela.
+    Linhas maiores que tamanho_max_pedido bytes são descartadas com uma resposta de erro,
+    e um id repetido enquanto o pedido anterior com ele está em andamento é recusado
+    (o id é o alvo de "cancelar"). Cada pedido tem um prazo ("prazo", em segundos, ou prazo_padrao); pedidos
+    resolver/comparar idênticos em andamento são atendidos por uma única execução, que
+    só é cancelada quando nenhum dos interessados espera mais por ela.
+    """
+
+    def __init__(self, trabalhadores: Optional[int] = None, tamanho_fila: int = 64,
+                 prazo_padrao: float = 30.0, max_pendentes: int = 32, max_labirintos: int = 64,
+                 tamanho_max_pedido: int = 2 ** 20):
+        self.num_trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.tamanho_max_pedido = tamanho_max_pedido
+        self.tamanho_fila = tamanho_fila
+        self.prazo_padrao = prazo_padrao
+        self.max_pendentes = max_pendentes
+        self.max_labirintos = max_labirintos
+        self.trabalhadores: List[Trabalhador] = []
+        self.dono: Dict[str, Trabalhador] = {}  # id do labirinto -> worker que o guarda
+        # Execuções compartilhadas em andamento e quantos pedidos esperam por cada uma
+        self.em_andamento: Dict[Tuple, asyncio.Task] = {}
+        self.interessados: Dict[Tuple, int] = {}
+        self.servidor: Optional[asyncio.AbstractServer] = None
+        self.contadores = {"pedidos": 0, "erros": 0, "prazos_esgotados": 0, "agrupados": 0, "cancelados": 0}
+
+    async def iniciar(self, caminho_socket: Optional[str] = None, host: str = "127.0.0.1",
+                      porta: int = 0) -> asyncio.AbstractServer:
+        """Sobe os workers e começa a aceitar conexões (socket Unix se caminho_socket for dado)."""
+        self.trabalhadores = [Trabalhador(i, self.tamanho_fila) for i in range(self.num_trabalhadores)]
+        for trabalhador in self.trabalhadores:
+            trabalhador.iniciar()
+        if caminho_socket is not None:
+            self.servidor = await asyncio.start_unix_server(self.tratar_conexao, path=caminho_socket,
+                                                            limit=self.tamanho_max_pedido)
+        else:
+            self.servidor = await asyncio.start_server(self.tratar_conexao, host, porta,
+                                                       limit=self.tamanho_max_pedido)
+        return self.servidor
+
+    async def encerrar(self) -> None:
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+        for trabalhador in self.trabalhadores:
+            await trabalhador.encerrar()
+
+    async def tratar_conexao(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """Lê pedidos da conexão e responde cada um assim que terminar."""
+        vagas = asyncio.Semaphore(self.max_pendentes)
+        ativas: Set[asyncio.Task] = set()  # Todos os pedidos em andamento
+        tarefas: Dict[Any, asyncio.Task] = {}  # Os que têm id, para "cancelar"
+        trava_escrita = asyncio.Lock()
+
+        async def responder(resposta: Resposta) -> None:
+            async with trava_escrita:
+                if escritor.is_closing():
+                    return
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode() + b"\n")
+                await escritor.drain()
+
+        async def atender(pedido: Pedido) -> None:
+            try:
+                try:
+                    resposta = await self.processar(pedido, tarefas)
+                except asyncio.CancelledError:
+                    resposta = {"id": pedido.get("id"), "ok": False, "erro": "Pedido cancelado"}
+                await responder(resposta)
+            except ConnectionError:
+                pass
+            finally:
+                ativas.discard(asyncio.current_task())
+                if tarefas.get(pedido.get("id")) is asyncio.current_task():
+                    del tarefas[pedido["id"]]
+                vagas.release()
+
+        async def recusar(id_pedido: Any, mensagem: str) -> None:
+            vagas.release()
+            self.contadores["erros"] += 1
+            await responder({"id": id_pedido, "ok": False, "erro": mensagem})
+
+        try:
+            while True:
+                await vagas.acquire()
+                try:
+                    linha = await leitor.readuntil(b"\n")
+                except asyncio.IncompleteReadError as erro:
+                    linha = erro.partial  # Última linha sem quebra antes do fim da conexão
+                except asyncio.LimitOverrunError:
+                    await self._descartar_linha(leitor)
+                    await recusar(None, f"Pedido maior que {self.tamanho_max_pedido} bytes")
+                    continue
+                if not linha:
+                    vagas.release()
+                    break
+                try:
+                    pedido = json.loads(linha)
+                    if not isinstance(pedido, dict):
+                        raise ValueError("o pedido deve ser um objeto JSON")
+                except ValueError as erro:
+                    await recusar(None, f"JSON inválido: {erro}")
+                    continue
+                id_pedido = pedido.get("id")
+                try:
+                    repetido = id_pedido in tarefas
+                except TypeError:
+                    await recusar(None, "O id do pedido deve ser um número ou texto")
+                    continue
+                if repetido:
+                    await recusar(id_pedido, f"Já existe um pedido em andamento com o id {id_pedido!r}")
+                    continue
+                tarefa = asyncio.get_running_loop().create_task(atender(pedido))
+                ativas.add(tarefa)
+                if id_pedido is not None:
+                    tarefas[id_pedido] = tarefa
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            # Conexão fechada: os pedidos dela, com ou sem id, deixam de interessar
+            for tarefa in list(ativas):
+                tarefa.cancel()
+            escritor.close()
+
+    @staticmethod
+    async def _descartar_linha(leitor: asyncio.StreamReader) -> None:
+        """Descarta o resto de uma linha grande demais, sem guardá-la inteira na memória."""
+        while True:
+            try:
+                await leitor.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as erro:
+                await leitor.readexactly(erro.consumed)
+            except asyncio.IncompleteReadError:
+                return
+
+    async def processar(self, pedido: Pedido, tarefas: Optional[Dict[Any, asyncio.Task]] = None) -> Resposta:
+        """Atende um pedido dentro do prazo e monta a resposta (nunca levanta ErroPedido)."""
+        self.contadores["pedidos"] += 1
+        id_pedido = pedido.get("id")
+        prazo = pedido.get("prazo", self.prazo_padrao)
+        try:
+            if pedido.get("op") == "cancelar":
+                tarefa = (tarefas or {}).get(pedido.get("alvo"))
+                if tarefa is not None:
+                    tarefa.cancel()
+                    self.contadores["cancelados"] += 1
+                return {"id": id_pedido, "ok": True, "cancelado": tarefa is not None}
+            dados = await asyncio.wait_for(self._executar(pedido), prazo)
+        except asyncio.TimeoutError:
+            self.contadores["prazos_esgotados"] += 1
+            return {"id": id_pedido, "ok": False, "erro": f"Prazo de {prazo} s esgotado"}
+        except KeyError as erro:
+            self.contadores["erros"] += 1
+            return {"id": id_pedido, "ok": False, "erro": f"Campo obrigatório ausente: {erro.args[0]}"}
+        except Exception as erro:
+            self.contadores["erros"] += 1
+            return {"id": id_pedido, "ok": False, "erro": str(erro) or type(erro).__name__}
+        return {"id": id_pedido, "ok": True, **dados}
+
+    def _escolher_trabalhador(self) -> Trabalhador:
+        """Worker com a fila mais curta (e, no empate, com menos labirintos)."""
+        return min(self.trabalhadores, key=Trabalhador.carga)
+
+    def _dono(self, id_labirinto: Any) -> Trabalhador:
+        trabalhador = self.dono.get(id_labirinto)
+        if trabalhador is None or id_labirinto not in trabalhador.labirintos:
+            raise ErroPedido(f"Labirinto desconhecido: {id_labirinto}")
+        return trabalhador
+
+    async def _guardar(self, trabalhador: Trabalhador, funcao: Callable, *args) -> Dict[str, Any]:
+        """
+        Roda gerar/carregar no worker e registra o labirinto novo (e os descartados).
+        O registro acontece quando o worker termina, mesmo que o pedido já tenha
+        desistido (prazo, cancelamento): o labirinto fica guardado no worker de qualquer
+        jeito, e os descartados saíram de lá.
+        """
+        id_labirinto = uuid.uuid4().hex[:16]
+
+        def registrar(dados: Dict[str, Any]) -> None:
+            trabalhador.labirintos.add(id_labirinto)
+            self.dono[id_labirinto] = trabalhador
+            for descartado in dados["descartados"]:
+                trabalhador.labirintos.discard(descartado)
+                self.dono.pop(descartado, None)
+
+        dados = await trabalhador.submeter(funcao, id_labirinto, self.max_labirintos, *args, concluir=registrar)
+        return {chave: valor for chave, valor in dados.items() if chave != "descartados"}
+
+    async def _executar(self, pedido: Pedido) -> Dict[str, Any]:
+        op = pedido.get("op")
+        if op == "gerar":
+            semente = pedido.get("semente")
+            return await self._guardar(
+                self._escolher_trabalhador(), trabalho_gerar,
+                int(pedido["altura"]), int(pedido["largura"]), int(pedido.get("moedas", 5)),
+                str(pedido.get("algoritmo", "prim")), None if semente is None else int(semente)
+            )
+        if op == "carregar":
+            return await self._guardar(self._escolher_trabalhador(), trabalho_carregar, str(pedido["arquivo"]))
+        if op == "descartar":
+            trabalhador = self._dono(pedido["labirinto"])
+            trabalhador.labirintos.discard(pedido["labirinto"])
+            del self.dono[pedido["labirinto"]]
+            return await trabalhador.submeter(trabalho_descartar, pedido["labirinto"])
+        if op == "estado":
+            return {
+                "contadores": dict(self.contadores),
+                "trabalhadores": [{"fila": t.fila.qsize(), "labirintos": len(t.labirintos)}
+                                  for t in self.trabalhadores],
+            }
+        if op in ("resolver", "comparar"):
+            id_labirinto = pedido["labirinto"]
+            inicio = (int(pedido["inicio"][0]), int(pedido["inicio"][1]))
+            fim = (int(pedido["fim"][0]), int(pedido["fim"][1]))
+            incluir_caminho = bool(pedido.get("incluir_caminho", True))
+            if op == "resolver":
+                algoritmos = [pedido.get("algoritmo", "a_estrela")]
+            else:
+                algoritmos = list(pedido.get("algoritmos", SOLUCIONADORES))
+            for nome in algoritmos:
+                if nome not in SOLUCIONADORES:
+                    raise ErroPedido(f"Algoritmo desconhecido: {nome}")
+            trabalhador = self._dono(id_labirinto)
+            if op == "resolver":
+                funcao, args = trabalho_resolver, (id_labirinto, algoritmos[0], inicio, fim, incluir_caminho)
+            else:
+                funcao, args = trabalho_comparar, (id_labirinto, tuple(algoritmos), inicio, fim, incluir_caminho)
+            return await self._agrupar((op,) + args, trabalhador, funcao, args)
+        raise ErroPedido(f"Operação desconhecida: {op}")
+
+    async def _agrupar(self, chave: Tuple, trabalhador: Trabalhador, funcao: Callable, args: Tuple) -> Dict[str, Any]:
+        """
+        Pedidos idênticos em andamento compartilham uma única execução. Quem desiste
+        (prazo, cancelamento) só deixa de esperar; a execução é cancelada quando o
+        último interessado desiste.
+        """
+        tarefa = self.em_andamento.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.get_running_loop().create_task(trabalhador.submeter(funcao, *args))
+            self.em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self.em_andamento.pop(chave, None))
+        else:
+            self.contadores["agrupados"] += 1
+        self.interessados[chave] = self.interessados.get(chave, 0) + 1
+        try:
+            return await asyncio.shield(tarefa)
+        finally:
+            self.interessados[chave] -= 1
+            if not self.interessados[chave]:
+                del self.interessados[chave]
+                if not tarefa.done():
+                    tarefa.cancel()
+
+async def servir(caminho_socket: Optional[str], host: str, porta: int, **opcoes) -> None:
+    """Sobe o serviço e atende até ser interrompido."""
+    servico = ServicoLabirintos(**opcoes)
+    servidor = await servico.iniciar(caminho_socket, host, porta)
+    enderecos = ", ".join(str(s.getsockname()) for s in servidor.sockets)
+    print(f"Serviço de labirintos ouvindo em {enderecos} com {servico.num_trabalhadores} workers", flush=True)
+    try:
+        await servidor.serve_forever()
+    finally:
+        await servico.encerrar()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serviço local de geração e resolução de labirintos (JSON por linha).")
+    parser.add_argument("--socket", help="Caminho do socket Unix (senão, usa TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--trabalhadores", type=int, default=None, help="Processos de trabalho (padrão: nº de CPUs)")
+    parser.add_argument("--fila", type=int, default=64, help="Tarefas esperando por worker antes de segurar os pedidos")
+    parser.add_argument("--prazo", type=float, default=30.0, help="Prazo padrão de cada pedido, em segundos")
+    parser.add_argument("--pendentes", type=int, default=32, help="Pedidos em andamento por conexão")
+    parser.add_argument("--labirintos", type=int, default=64, help="Labirintos guardados por worker")
+    parser.add_argument("--tamanho-pedido", type=int, default=2 ** 20, help="Tamanho máximo de um pedido, em bytes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(args.socket, args.host, args.porta, trabalhadores=args.trabalhadores,
+                           tamanho_fila=args.fila, prazo_padrao=args.prazo,
+                           max_pendentes=args.pendentes, max_labirintos=args.labirintos,
+                           tamanho_max_pedido=args.tamanho_pedido))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
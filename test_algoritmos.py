@@ -0,0 +1,174 @@
+import dataclasses
+import functools
+import itertools
+import random
+
+import pytest
+
+from constantes import *
+from grade import GradeLabirinto
+from grafo import compilar_grafo, impressao_digital
+from labirinto import gerar_labirinto
+from algoritmos import (resolver_a_estrela, resolver_dijkstra, resolver_dfs, resolver_guloso,
+                        resolver_best_first_search, resolver_a_estrela_bidirecional,
+                        resolver_dijkstra_bidirecional, resolver_jps, executar_busca, passos_a_estrela,
+                        passos_dijkstra, passos_dfs, passos_guloso, passos_best_first_search,
+                        passos_a_estrela_bidirecional, passos_dijkstra_bidirecional, passos_jps)
+from fronteira import FRONTEIRAS
+from marcos import preprocessar_marcos
+from contracao import contrair_grafo, resolver_contraido
+from campos import CacheCampos, resolver_por_campo
+from memoria_limitada import resolver_ida_estrela, resolver_sma_estrela
+
+# (altura, largura, gerador, semente); chance de barreira alta para exercitar o custo 6
+CASOS = [(h, w, gerador, semente)
+         for h, w in ((21, 41), (31, 31))
+         for gerador in ("prim", "kruskal", "arvore_binaria")
+         for semente in range(3)]
+
+@functools.lru_cache(maxsize=None)
+def labirinto(altura, largura, gerador, semente):
+    lab, inicio, fim, _ = gerar_labirinto(altura, largura, 0, gerador, semente,
+                                          chance_barreira=0.2, verboso=False)
+    return lab, compilar_grafo(lab), inicio, fim
+
+def custo_do_caminho(lab: GradeLabirinto, caminho) -> int:
+    """Confere que o caminho é contínuo e sem paredes e retorna o custo de percorrê-lo."""
+    custo = 0
+    for anterior, atual in zip(caminho, caminho[1:]):
+        assert abs(anterior[0] - atual[0]) + abs(anterior[1] - atual[1]) == 1
+        assert lab[atual] != CEL_PAREDE
+        custo += CUSTO_BARREIRA if lab[atual] == CEL_BARREIRA else CUSTO_NORMAL
+    return custo
+
+def resolver_com_marcos(grafo, inicio, fim):
+    return resolver_a_estrela(grafo, inicio, fim, marcos=preprocessar_marcos(grafo, 4, semente=1))
+
+def resolver_pelo_contraido(grafo, inicio, fim):
+    return resolver_contraido(contrair_grafo(grafo), inicio, fim)
+
+def resolver_pelo_campo(grafo, inicio, fim):
+    return resolver_por_campo(CacheCampos(), grafo, inicio, fim)
+
+OTIMOS = {
+    **{f"a_estrela_{tipo}": functools.partial(resolver_a_estrela, tipo_fronteira=tipo) for tipo in FRONTEIRAS},
+    "a_estrela_alt": resolver_com_marcos,
+    "a_estrela_bidirecional": resolver_a_estrela_bidirecional,
+    "dijkstra_bidirecional": resolver_dijkstra_bidirecional,
+    "jps": resolver_jps,
+    "ida_estrela": resolver_ida_estrela,
+    "sma_estrela": resolver_sma_estrela,
+    "contraido": resolver_pelo_contraido,
+    "campo": resolver_pelo_campo,
+}
+
+NAO_OTIMOS = {
+    "dfs": resolver_dfs,
+    "guloso": resolver_guloso,
+    "best_first": resolver_best_first_search,
+}
+
+@pytest.mark.parametrize("caso", CASOS)
+@pytest.mark.parametrize("nome", sorted(OTIMOS))
+def test_custo_igual_ao_dijkstra(nome, caso):
+    lab, grafo, inicio, fim = labirinto(*caso)
+    esperado, metricas_dijkstra = resolver_dijkstra(grafo, inicio, fim)
+    caminho, metricas = OTIMOS[nome](grafo, inicio, fim)
+    assert caminho[0] == inicio and caminho[-1] == fim
+    assert custo_do_caminho(lab, caminho) == metricas.custo_total == metricas_dijkstra.custo_total
+    assert metricas.comprimento_caminho == len(caminho)
+
+@pytest.mark.parametrize("caso", CASOS)
+@pytest.mark.parametrize("nome", sorted(NAO_OTIMOS))
+def test_caminho_valido(nome, caso):
+    lab, grafo, inicio, fim = labirinto(*caso)
+    caminho, metricas = NAO_OTIMOS[nome](grafo, inicio, fim)
+    assert caminho[0] == inicio and caminho[-1] == fim
+    assert custo_do_caminho(lab, caminho) == metricas.custo_total
+    assert metricas.custo_total >= resolver_dijkstra(grafo, inicio, fim)[1].custo_total
+
+@pytest.mark.parametrize("nome", sorted(OTIMOS) + sorted(NAO_OTIMOS))
+def test_sem_caminho(nome):
+    # O fim fica isolado por paredes
+    lab = GradeLabirinto(5, 7, preenchimento=CEL_PAREDE)
+    for coluna in range(1, 4):
+        lab[1, coluna] = CEL_CAMINHO
+    lab[3, 5] = CEL_CAMINHO
+    resolver = {**OTIMOS, **NAO_OTIMOS}[nome]
+    caminho, metricas = resolver(compilar_grafo(lab), (1, 1), (3, 5))
+    assert caminho is None
+    assert not metricas.caminho_encontrado
+
+def test_grade_e_grafo_dao_o_mesmo_resultado():
+    lab, grafo, inicio, fim = labirinto(21, 41, "prim", 0)
+    assert resolver_a_estrela(lab, inicio, fim)[0] == resolver_a_estrela(grafo, inicio, fim)[0]
+
+def test_grafo_de_juncoes_menor_que_o_da_grade():
+    _, grafo, _, _ = labirinto(31, 31, "prim", 0)
+    juncoes = contrair_grafo(grafo)
+    assert juncoes.num_nos < grafo.num_nos
+    assert len(juncoes.vizinhos) < len(grafo.vizinhos)
+
+def test_contraido_emenda_qualquer_par_de_celulas():
+    lab, _, _, _ = labirinto(21, 41, "kruskal", 1)
+    lab = GradeLabirinto(lab.altura, lab.largura, bytearray(lab.celulas))
+    # Abre paredes para criar laços e corredores paralelos entre as mesmas junções
+    sorteio = random.Random(3)
+    for _ in range(12):
+        lab[sorteio.randrange(1, lab.altura - 1), sorteio.randrange(1, lab.largura - 1)] = CEL_CAMINHO
+    grafo = compilar_grafo(lab)
+    juncoes = contrair_grafo(grafo)
+    impressao = impressao_digital(juncoes)
+    abertas = [(l, c) for l in range(lab.altura) for c in range(lab.largura) if lab[l, c] != CEL_PAREDE]
+    for _ in range(60):
+        inicio, fim = sorteio.choice(abertas), sorteio.choice(abertas)
+        esperado = resolver_dijkstra(grafo, inicio, fim)[1].custo_total
+        for resolver in (resolver_a_estrela, resolver_dijkstra, resolver_a_estrela_bidirecional):
+            caminho, metricas = resolver_contraido(juncoes, inicio, fim, resolver)
+            assert caminho[0] == inicio and caminho[-1] == fim
+            assert custo_do_caminho(lab, caminho) == metricas.custo_total == esperado
+        # As arestas emendadas são desfeitas ao fim de cada consulta
+        assert impressao_digital(juncoes) == impressao
+    with pytest.raises(ValueError):
+        resolver_contraido(juncoes, abertas[0], abertas[-1], resolver_ida_estrela)
+
+PASSOS = {
+    "a_estrela": (passos_a_estrela, resolver_a_estrela),
+    "dijkstra": (passos_dijkstra, resolver_dijkstra),
+    "dfs": (passos_dfs, resolver_dfs),
+    "guloso": (passos_guloso, resolver_guloso),
+    "best_first": (passos_best_first_search, resolver_best_first_search),
+    "a_estrela_bidirecional": (passos_a_estrela_bidirecional, resolver_a_estrela_bidirecional),
+    "dijkstra_bidirecional": (passos_dijkstra_bidirecional, resolver_dijkstra_bidirecional),
+    "jps": (passos_jps, resolver_jps),
+}
+
+def sem_tempo(resultado):
+    caminho, metricas = resultado
+    return caminho, dataclasses.replace(metricas, tempo_execucao=0)
+
+@pytest.mark.parametrize("caso", CASOS[::4])
+@pytest.mark.parametrize("nome", sorted(PASSOS))
+def test_passos_igual_ao_resolver(nome, caso):
+    lab, grafo, inicio, fim = labirinto(*caso)
+    passos, resolver = PASSOS[nome]
+    alvo = lab if nome == "jps" else grafo
+    assert sem_tempo(executar_busca(passos(alvo, inicio, fim))) == sem_tempo(resolver(alvo, inicio, fim))
+
+@pytest.mark.parametrize("nome", sorted(PASSOS))
+def test_passos_interrompido_e_retomado(nome):
+    lab, grafo, inicio, fim = labirinto(21, 41, "kruskal", 2)
+    passos, resolver = PASSOS[nome]
+    alvo = lab if nome == "jps" else grafo
+    esperado = sem_tempo(resolver(alvo, inicio, fim))
+
+    # Uma busca parada no meio não atrapalha outra, intercalada, nem a própria retomada
+    pausada = passos(alvo, inicio, fim)
+    eventos = list(itertools.islice(pausada, 10))
+    assert len(eventos) == 10 and all(evento.inseridas is not None for evento in eventos)
+    abandonada = passos(alvo, inicio, fim)
+    next(abandonada)
+    abandonada.close()
+    assert sem_tempo(executar_busca(passos(alvo, inicio, fim))) == esperado
+    assert sem_tempo(executar_busca(pausada)) == esperado
+    assert sem_tempo(resolver(alvo, inicio, fim)) == esperado
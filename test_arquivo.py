@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from constantes import *
+from arquivo import (FORMATO_CABECALHO, salvar_labirinto, carregar_labirinto, converter_para_labirinto,
+                     escrever_linhas)
+from labirinto import gerar_labirinto
+
+@pytest.fixture
+def labirinto_salvo(tmp_path):
+    lab, inicio, fim, moedas = gerar_labirinto(21, 41, 3, "prim", 5, verboso=False)
+    caminho_arquivo = str(tmp_path / "lab.bin")
+    salvar_labirinto(caminho_arquivo, lab, inicio, fim, moedas, semente=5)
+    return caminho_arquivo, lab, inicio, fim, moedas
+
+def test_salvar_e_carregar(labirinto_salvo):
+    caminho_arquivo, lab, inicio, fim, moedas = labirinto_salvo
+    carregado, inicio_lido, fim_lido, moedas_lidas = carregar_labirinto(caminho_arquivo, verificar=True)
+    assert (carregado.altura, carregado.largura) == (lab.altura, lab.largura)
+    assert bytes(carregado.celulas) == bytes(lab.celulas)
+    assert (inicio_lido, fim_lido) == (inicio, fim)
+    assert [tuple(moeda) for moeda in moedas_lidas] == moedas
+
+def test_forma_antiga(labirinto_salvo):
+    caminho_arquivo, lab, *_ = labirinto_salvo
+    antigo, *_ = converter_para_labirinto(caminho_arquivo)
+    assert antigo == lab.para_labirinto()
+
+def test_carregado_gravavel_nao_altera_o_arquivo(labirinto_salvo):
+    caminho_arquivo, lab, inicio, *_ = labirinto_salvo
+    carregado, *_ = carregar_labirinto(caminho_arquivo, gravavel=True)
+    carregado[inicio] = CEL_BARREIRA
+    relido, *_ = carregar_labirinto(caminho_arquivo, verificar=True)
+    assert bytes(relido.celulas) == bytes(lab.celulas)
+
+def test_checksum_rejeita_celula_corrompida(labirinto_salvo):
+    caminho_arquivo, lab, *_ = labirinto_salvo
+    with open(caminho_arquivo, "r+b") as arquivo:
+        dados = bytearray(arquivo.read())
+        # Inverte a última célula (depois do cabeçalho e das moedas)
+        dados[-1] ^= 1
+        arquivo.seek(0)
+        arquivo.write(dados)
+    with pytest.raises(ValueError, match="Checksum"):
+        carregar_labirinto(caminho_arquivo, verificar=True)
+    # Sem verificar, o arquivo abre mesmo assim
+    carregado, *_ = carregar_labirinto(caminho_arquivo)
+    assert carregado.celulas[-1] != lab.celulas[-1]
+
+def test_rejeita_assinatura_e_truncamento(labirinto_salvo, tmp_path):
+    caminho_arquivo, *_ = labirinto_salvo
+    with open(caminho_arquivo, "rb") as arquivo:
+        dados = arquivo.read()
+    
+    outro = tmp_path / "outro.bin"
+    outro.write_bytes(b"XXXX" + dados[4:])
+    with pytest.raises(ValueError, match="assinatura"):
+        carregar_labirinto(str(outro))
+    
+    outro.write_bytes(dados[:-1])
+    with pytest.raises(ValueError, match="faltam células"):
+        carregar_labirinto(str(outro))
+    
+    outro.write_bytes(dados[:FORMATO_CABECALHO.size - 1])
+    with pytest.raises(ValueError, match="cabeçalho incompleto"):
+        carregar_labirinto(str(outro))
+
+def test_escrever_linhas_confere_o_total(tmp_path):
+    with pytest.raises(ValueError):
+        escrever_linhas(str(tmp_path / "curto.bin"), 3, 3, [bytes(3), bytes(3)], (1, 1), (1, 1))
+
+def test_salvar_no_arquivo_de_onde_foi_carregado(labirinto_salvo):
+    caminho_arquivo, lab, inicio, fim, moedas = labirinto_salvo
+    carregado, inicio_lido, fim_lido, moedas_lidas = carregar_labirinto(caminho_arquivo, gravavel=True)
+    carregado[inicio] = CEL_BARREIRA
+    salvar_labirinto(caminho_arquivo, carregado, inicio_lido, fim_lido, moedas_lidas, semente=5)
+    # A grade carregada continua legível (lê do arquivo antigo, que não foi truncado)
+    assert carregado[fim] == lab[fim]
+    relido, *_ = carregar_labirinto(caminho_arquivo, verificar=True)
+    esperado = lab.copiar()
+    esperado[inicio] = CEL_BARREIRA
+    assert bytes(relido.celulas) == bytes(esperado.celulas)
+    assert not [nome for nome in os.listdir(os.path.dirname(caminho_arquivo)) if nome.endswith(".tmp")]
+
+def test_falha_na_gravacao_preserva_o_destino(labirinto_salvo):
+    caminho_arquivo, *_ = labirinto_salvo
+    with open(caminho_arquivo, "rb") as arquivo:
+        antes = arquivo.read()
+    with pytest.raises(ValueError):
+        escrever_linhas(caminho_arquivo, 3, 3, [bytes(3)], (1, 1), (1, 1))
+    with open(caminho_arquivo, "rb") as arquivo:
+        assert arquivo.read() == antes
+    assert not [nome for nome in os.listdir(os.path.dirname(caminho_arquivo)) if nome.endswith(".tmp")]
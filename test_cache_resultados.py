@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from constantes import *
+from grafo import compilar_grafo, impressao_digital
+from labirinto import gerar_labirinto
+from algoritmos import resolver_a_estrela, resolver_dijkstra
+from cache_resultados import (SEM_CAMINHO, CAMINHO_PASSOS, CAMINHO_POSICOES, CacheResultados,
+                              codificar_caminho, decodificar_caminho)
+
+@pytest.mark.parametrize("caminho", [
+    None,
+    [(3, 4)],
+    [(1, 1), (1, 2)],
+    [(5, 5), (5, 6), (6, 6), (6, 5), (5, 5), (4, 5)],
+    [(0, 0)] + [(0, j) for j in range(1, 10)] + [(i, 9) for i in range(1, 10)],
+])
+def test_codificar_caminho_ida_e_volta(caminho):
+    dados = codificar_caminho(caminho)
+    assert decodificar_caminho(dados) == caminho
+    assert dados[0] == (SEM_CAMINHO if caminho is None else CAMINHO_PASSOS)
+
+def test_passos_ocupam_dois_bits():
+    caminho = [(2, 2)] + [(2, 2 + j) for j in range(1, 101)]
+    curto = codificar_caminho(caminho[:97])
+    assert len(codificar_caminho(caminho)) - len(curto) == 1  # 4 passos a mais, 1 byte a mais
+
+def test_caminho_com_saltos_guarda_as_posicoes():
+    caminho = [(1, 1), (1, 3), (10 ** 9, 2 ** 40)]
+    dados = codificar_caminho(caminho)
+    assert dados[0] == CAMINHO_POSICOES
+    assert decodificar_caminho(dados) == caminho
+
+@pytest.fixture
+def consulta():
+    lab, inicio, fim, _ = gerar_labirinto(21, 41, 0, "prim", 2, verboso=False)
+    return compilar_grafo(lab), inicio, fim
+
+def test_acerto_marca_do_cache_e_devolve_copia(consulta):
+    grafo, inicio, fim = consulta
+    cache = CacheResultados()
+    caminho, metricas = cache.resolver(resolver_a_estrela, grafo, inicio, fim)
+    assert not metricas.do_cache
+    caminho.clear()
+    repetido, metricas_repetidas = cache.resolver(resolver_a_estrela, grafo, inicio, fim)
+    assert metricas_repetidas.do_cache
+    assert repetido == resolver_a_estrela(grafo, inicio, fim)[0]
+    assert metricas_repetidas.custo_total == metricas.custo_total
+    assert (cache.acertos_memoria, cache.falhas) == (1, 1)
+    # Outro algoritmo é outra chave
+    cache.resolver(resolver_dijkstra, grafo, inicio, fim)
+    assert cache.falhas == 2
+
+def test_grade_alterada_nao_recebe_resultado_antigo():
+    lab, inicio, fim, _ = gerar_labirinto(21, 41, 0, "prim", 2, verboso=False)
+    cache = CacheResultados()
+    cache.resolver(resolver_a_estrela, lab, inicio, fim)
+    antes = impressao_digital(lab)
+    celula = next(pos for pos in lab.posicoes_com(CEL_CAMINHO))
+    lab[celula] = CEL_BARREIRA
+    assert impressao_digital(lab) != antes
+    _, metricas = cache.resolver(resolver_a_estrela, lab, inicio, fim)
+    assert not metricas.do_cache
+
+def test_camada_em_disco_sobrevive_entre_execucoes(consulta, tmp_path):
+    grafo, inicio, fim = consulta
+    arquivo = tmp_path / "cache.sqlite"
+    cache = CacheResultados(arquivo=arquivo)
+    caminho, metricas = cache.resolver(resolver_a_estrela, grafo, inicio, fim)
+    cache.fechar()
+    
+    reaberto = CacheResultados(arquivo=arquivo)
+    resultado = reaberto.obter(impressao_digital(grafo), resolver_a_estrela, inicio, fim)
+    assert resultado is not None
+    assert resultado[0] == caminho
+    assert resultado[1].do_cache and resultado[1].custo_total == metricas.custo_total
+    assert reaberto.acertos_disco == 1
+    reaberto.limpar()
+    assert reaberto.obter(impressao_digital(grafo), resolver_a_estrela, inicio, fim) is None
+    reaberto.fechar()
+
+@pytest.mark.parametrize("mudar", [
+    lambda metricas: {**metricas, "campo_novo": 1},
+    lambda metricas: {nome: valor for nome, valor in metricas.items() if nome != "pico_nos"},
+])
+def test_metricas_de_outra_versao_contam_como_falha(consulta, tmp_path, mudar):
+    grafo, inicio, fim = consulta
+    arquivo = tmp_path / "cache.sqlite"
+    cache = CacheResultados(arquivo=arquivo)
+    cache.resolver(resolver_a_estrela, grafo, inicio, fim)
+    # Simula uma entrada gravada por uma versão com outros campos em MetricasBusca
+    conexao = cache.disco.conexao
+    for chave, texto in conexao.execute("SELECT chave, metricas FROM resultados").fetchall():
+        conexao.execute("UPDATE resultados SET metricas = ? WHERE chave = ?", (json.dumps(mudar(json.loads(texto))), chave))
+    cache.fechar()
+    
+    reaberto = CacheResultados(arquivo=arquivo)
+    assert reaberto.obter(impressao_digital(grafo), resolver_a_estrela, inicio, fim) is None
+    _, metricas = reaberto.resolver(resolver_a_estrela, grafo, inicio, fim)
+    assert not metricas.do_cache and reaberto.falhas == 2
+    assert reaberto.obter(impressao_digital(grafo), resolver_a_estrela, inicio, fim) is not None
+    reaberto.fechar()
@@ -0,0 +1,55 @@
+import gc
+
+from constantes import *
+from grade import GradeLabirinto
+from grafo import compilar_grafo, impressao_digital
+from labirinto import gerar_labirinto
+from algoritmos import resolver_dijkstra
+from campos import CacheCampos, resolver_por_campo
+
+def test_campo_reaproveitado_e_com_custo_otimo():
+    lab, inicio, fim, _ = gerar_labirinto(21, 41, 0, "prim", 6, chance_barreira=0.2, verboso=False)
+    grafo = compilar_grafo(lab)
+    cache = CacheCampos()
+    otimo = resolver_dijkstra(grafo, inicio, fim)[1].custo_total
+    for origem in (inicio, *lab.posicoes_com(CEL_CAMINHO)[:20]):
+        caminho, metricas = resolver_por_campo(cache, grafo, origem, fim)
+        assert caminho[0] == origem and caminho[-1] == fim
+        assert metricas.custo_total == resolver_dijkstra(grafo, origem, fim)[1].custo_total
+    assert resolver_por_campo(cache, lab, inicio, fim)[1].custo_total == otimo
+    # Um campo para o grafo e um para a grade (impressões diferentes); o resto são acertos
+    assert (cache.falhas, cache.acertos) == (2, 20)
+
+def test_impressao_do_grafo_guardada_ate_modificar():
+    lab, *_ = gerar_labirinto(21, 41, 0, "prim", 6, verboso=False)
+    grafo = compilar_grafo(lab)
+    impressao = impressao_digital(grafo)
+    assert grafo._impressao == impressao
+    assert impressao_digital(compilar_grafo(lab)) == impressao
+    grafo.custos[0] = CUSTO_BARREIRA if grafo.custos[0] != CUSTO_BARREIRA else CUSTO_NORMAL
+    grafo.marcar_modificado()
+    assert impressao_digital(grafo) != impressao
+
+def test_impressao_incremental_da_grade():
+    lab, *_ = gerar_labirinto(101, 101, 0, "prim", 2, verboso=False)
+    lab.impressao_digital()
+    for k, pos in enumerate(lab.posicoes_com(CEL_CAMINHO)[:50]):
+        lab[pos] = CEL_BARREIRA if k % 2 else CEL_MOEDA
+        # Só os blocos sujos são refeitos, e o resultado é o de uma grade nova
+        assert lab.impressao_digital() == lab.copiar().impressao_digital()
+
+def test_grade_alterada_descarta_campos_e_grade_coletada_sai_da_tabela():
+    lab, inicio, fim, _ = gerar_labirinto(21, 41, 0, "prim", 6, verboso=False)
+    cache = CacheCampos()
+    cache.campo(lab, fim)
+    lab[inicio] = CEL_BARREIRA
+    cache.campo(lab, fim)
+    # O campo da versão anterior foi descartado ao notar a mudança
+    assert len(cache.campos) == 1 and cache.falhas == 2
+    
+    outra = GradeLabirinto(5, 5, preenchimento=CEL_CAMINHO)
+    cache.campo(outra, (0, 0))
+    assert len(cache.ultima_impressao) == 2
+    del outra
+    gc.collect()
+    assert len(cache.ultima_impressao) == 1
@@ -0,0 +1,43 @@
+import contexto
+from contexto import ContextoBusca, obter_contexto, devolver_contexto, liberar_contextos
+from labirinto import gerar_labirinto
+from algoritmos import resolver_a_estrela, resolver_dijkstra
+
+def test_contexto_reaproveitado_sem_vazar_estado():
+    liberar_contextos()
+    lab, inicio, fim, _ = gerar_labirinto(21, 41, 0, "prim", 1, verboso=False)
+    primeiro = resolver_a_estrela(lab, inicio, fim)
+    outro, *_ = gerar_labirinto(31, 31, 0, "kruskal", 2, verboso=False)
+    resolver_dijkstra(outro, (1, 1), (29, 29))
+    assert resolver_a_estrela(lab, inicio, fim)[0] == primeiro[0]
+
+def test_garantir_cresce_sem_perder_valores():
+    ctx = ContextoBusca(10)
+    assert ctx.tipo == "i" and len(ctx.pai) == 10 and ctx.pai[9] == -1
+    ctx.custo[3] = 7
+    ctx.garantir(5)
+    assert ctx.tamanho == 10
+    ctx.garantir(21)
+    assert ctx.tamanho == 21 and ctx.custo[3] == 7 and ctx.pai[20] == -1
+    assert ctx.tamanho_bytes == 4 * 4 * 21
+
+def test_geracao_recomeca_ao_esgotar(monkeypatch):
+    monkeypatch.setattr(contexto, "MAX_GERACAO", 3)
+    ctx = ContextoBusca(4)
+    for _ in range(3):
+        ctx.marca[1] = ctx.nova_consulta()
+    assert ctx.geracao == 3
+    assert ctx.nova_consulta() == 1
+    # Marcas antigas não podem parecer válidas na geração nova
+    assert list(ctx.marca) == [0, 0, 0, 0]
+
+def test_contextos_grandes_nao_ficam_guardados(monkeypatch):
+    liberar_contextos()
+    monkeypatch.setattr(contexto, "MAX_CELULAS_LIVRES", 100)
+    grande = obter_contexto(101)
+    pequeno = obter_contexto(50)
+    devolver_contexto(grande)
+    devolver_contexto(pequeno)
+    assert contexto._livres == [pequeno]
+    assert obter_contexto(10) is pequeno
+    liberar_contextos()
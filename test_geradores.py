@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from constantes import *
+from geradores import ALGORITMOS_GERACAO, abrir_paredes_linha, sortear_mascara, gerar_linhas_eller, extremos_eller
+from labirinto import gerar_labirinto, existe_caminho, marcar_alcancaveis
+
+def abrir_paredes_celula_a_celula(acima, atual, abaixo, sorteios):
+    """Regra de abrir_paredes_linha aplicada célula a célula, com os sorteios já feitos."""
+    for j in range(1, len(atual) - 1):
+        if atual[j] == CEL_PAREDE:
+            vizinhos = (atual[j + 1], abaixo[j], atual[j - 1], acima[j])
+            if vizinhos.count(CEL_PAREDE) >= 2 and vizinhos.count(CEL_CAMINHO) <= 2 and sorteios[j - 1]:
+                atual[j] = CEL_CAMINHO
+
+@pytest.mark.parametrize("codigos", [(CEL_CAMINHO, CEL_PAREDE), (CEL_CAMINHO, CEL_PAREDE, CEL_PAREDE, CEL_BARREIRA, CEL_MOEDA)])
+def test_abrir_paredes_linha_igual_a_regra_por_celula(codigos):
+    sorteador = random.Random(7)
+    for _ in range(500):
+        largura = sorteador.randrange(3, 60)
+        chance = sorteador.random()
+        semente = sorteador.randrange(2 ** 32)
+        linhas = [bytearray(sorteador.choice(codigos) for _ in range(largura)) for _ in range(3)]
+        sorteios = sortear_mascara(random.Random(semente), largura - 2, chance).to_bytes(largura - 2, "little")
+        
+        esperado = [bytearray(linha) for linha in linhas]
+        abrir_paredes_celula_a_celula(*esperado, sorteios)
+        obtido = [bytearray(linha) for linha in linhas]
+        abrir_paredes_linha(*obtido, chance, random.Random(semente))
+        assert obtido == esperado
+
+@pytest.mark.parametrize("chance", [0.0, 0.05, 0.5, 1.0])
+def test_sortear_mascara_respeita_a_chance(chance):
+    quantidade = 100000
+    sorteios = sortear_mascara(random.Random(1), quantidade, chance).to_bytes(quantidade, "little")
+    assert set(sorteios) <= {0, 1}
+    assert abs(sum(sorteios) / quantidade - chance) < 0.01
+
+@pytest.mark.parametrize("algoritmo", sorted(ALGORITMOS_GERACAO))
+def test_gerar_labirinto_reproduzivel_e_conexo(algoritmo):
+    for semente in range(5):
+        lab, inicio, fim, moedas = gerar_labirinto(31, 41, 5, algoritmo, semente, verboso=False)
+        repetido = gerar_labirinto(31, 41, 5, algoritmo, semente, verboso=False)
+        assert bytes(repetido[0].celulas) == bytes(lab.celulas)
+        assert repetido[1:] == (inicio, fim, moedas)
+        # As barreiras nunca fecham a passagem entre início e fim
+        assert existe_caminho(lab, inicio, fim, considerar_barreiras=True)
+        alcancaveis = marcar_alcancaveis(lab, inicio)
+        assert len(moedas) == 5
+        assert all(alcancaveis[lab.indice(*moeda)] for moeda in moedas)
+
+def test_eller_gera_labirinto_perfeito():
+    altura, largura = 41, 61
+    linhas = list(gerar_linhas_eller(altura, largura, semente=3))
+    assert len(linhas) == altura and all(len(linha) == largura for linha in linhas)
+    # Árvore geradora: número de passagens = número de células da malha - 1
+    celulas = sum(len(linha) - linha.count(CEL_PAREDE) for linha in linhas)
+    malha = ((altura - 1) // 2) * ((largura - 1) // 2)
+    assert celulas - malha == malha - 1
+    inicio, fim = extremos_eller(altura, largura)
+    assert linhas[inicio[0]][inicio[1]] == CEL_INICIO
+    assert linhas[fim[0]][fim[1]] == CEL_FIM
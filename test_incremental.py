@@ -0,0 +1,84 @@
+import gc
+import random
+
+import pytest
+
+from constantes import *
+from grade import GradeLabirinto, MIN_REGISTRO
+from labirinto import gerar_labirinto
+from algoritmos import resolver_dijkstra
+from incremental import PlanejadorDStarLite
+
+def custo_do_zero(lab, inicio, fim):
+    caminho, metricas = resolver_dijkstra(lab, inicio, fim)
+    return None if caminho is None else metricas.custo_total
+
+def editar(lab, sorteador, inicio, fim, quantidade):
+    """Põe e tira barreiras e abre ou fecha paredes internas, sem tocar início e fim."""
+    for _ in range(quantidade):
+        pos = (sorteador.randrange(1, lab.altura - 1), sorteador.randrange(1, lab.largura - 1))
+        if pos in (inicio, fim):
+            continue
+        lab[pos] = sorteador.choice((CEL_CAMINHO, CEL_PAREDE, CEL_BARREIRA, CEL_BARREIRA))
+
+@pytest.mark.parametrize("semente", range(8))
+def test_replanejar_igual_a_busca_do_zero(semente):
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 0, "kruskal", semente, verboso=False)
+    sorteador = random.Random(semente)
+    planejador = PlanejadorDStarLite(lab, inicio, fim)
+    for rodada in range(25):
+        caminho, metricas = planejador.resolver()
+        esperado = custo_do_zero(lab, inicio, fim)
+        if esperado is None:
+            assert caminho is None
+        else:
+            assert metricas.custo_total == esperado
+            assert caminho[0] == inicio and caminho[-1] == fim
+        editar(lab, sorteador, inicio, fim, 1 + rodada % 4)
+        if caminho and len(caminho) > 2 and rodada % 3 == 0:
+            # O jogador anda um passo pelo caminho
+            planejador.mover_inicio(caminho[1])
+            inicio = caminho[1]
+    planejador.fechar()
+
+def test_alteracao_direta_nas_celulas_recomeca():
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 0, "prim", 1, verboso=False)
+    planejador = PlanejadorDStarLite(lab, inicio, fim)
+    planejador.resolver()
+    # Alteração sem passar por lab[pos]: o registro não sabe quais células mudaram
+    for i in range(1, lab.altura - 1):
+        for j in range(1, lab.largura - 1):
+            if lab[i, j] == CEL_PAREDE:
+                lab.celulas[i * lab.largura + j] = CEL_CAMINHO
+    lab.marcar_modificada()
+    assert lab.alteracoes_desde(planejador.versao) is None
+    _, metricas = planejador.resolver()
+    assert metricas.custo_total == custo_do_zero(lab, inicio, fim)
+
+def test_registro_liberado_depois_de_sincronizar_e_ao_fechar():
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 0, "prim", 3, verboso=False)
+    planejador = PlanejadorDStarLite(lab, inicio, fim)
+    outro = PlanejadorDStarLite(lab, inicio, fim)
+    barreira = next(pos for pos in lab.posicoes_com(CEL_CAMINHO) if pos not in (inicio, fim))
+    lab[barreira] = CEL_BARREIRA
+    planejador.resolver()
+    # O outro leitor ainda não leu a alteração
+    assert lab.alteracoes_desde(outro.versao) == [lab.indice(*barreira)]
+    outro.resolver()
+    assert lab._registro == []
+    planejador.fechar()
+    assert lab._registro == []
+    del outro
+    gc.collect()
+    # Sem leitores o registro é desligado
+    assert lab._registro is None
+
+def test_registro_limitado_sem_consultas():
+    lab = GradeLabirinto(5, 5, preenchimento=CEL_CAMINHO)
+    planejador = PlanejadorDStarLite(lab, (0, 0), (4, 4))
+    for k in range(5 * MIN_REGISTRO):
+        lab[2, 2] = CEL_BARREIRA if k % 2 else CEL_CAMINHO
+    assert len(lab._registro) <= MIN_REGISTRO
+    # O que foi descartado faz o planejador recomeçar, com o resultado certo
+    _, metricas = planejador.resolver()
+    assert metricas.custo_total == custo_do_zero(lab, (0, 0), (4, 4))
@@ -0,0 +1,139 @@
+import dataclasses
+import io
+import json
+
+from grafo import compilar_grafo
+from labirinto import gerar_labirinto
+from algoritmos import resolver_a_estrela, resolver_dijkstra
+from contracao import contrair_grafo, resolver_contraido
+from fronteira import FronteiraInstrumentada, criar_fronteira
+from instrumentacao import (RegistroMedicao, ObservadorMemoria, ObservadorJsonl, ObservadorPrometheus,
+                            instrumentado, instrumentar, sessao_ativa)
+
+def labirinto():
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 3, "prim", 4, chance_barreira=0.2, verboso=False)
+    return lab, compilar_grafo(lab), inicio, fim
+
+@instrumentado
+def resolver_duas_vezes(grafo, inicio, fim):
+    resolver_dijkstra(grafo, inicio, fim)
+    return resolver_a_estrela(grafo, inicio, fim)
+
+def test_chamadas_aninhadas_sao_medidas_uma_vez():
+    lab, grafo, inicio, fim = labirinto()
+    memoria = ObservadorMemoria()
+    with instrumentar(memoria) as sessao:
+        assert sessao_ativa() is sessao
+        _, metricas = resolver_duas_vezes(grafo, inicio, fim)
+        resolver_contraido(contrair_grafo(grafo), inicio, fim)
+    assert sessao_ativa() is None
+
+    externa, contraida = memoria.registros
+    assert externa.tipo == "busca" and externa.rotulos["funcao"] == "resolver_duas_vezes"
+    assert externa.nome == metricas.algoritmo == "A*"
+    assert externa.contadores["nos_visitados"] == metricas.nos_visitados
+    assert externa.rotulos["caminho_encontrado"] == "true"
+    assert list(externa.fases_ns) == ["busca"] and externa.fases_ns["busca"] > 0
+    assert contraida.rotulos["funcao"] == "resolver_contraido"
+
+def test_geracao_publica_as_fases():
+    memoria = ObservadorMemoria()
+    with instrumentar(memoria):
+        gerar_labirinto(21, 31, 3, "kruskal", 2, verboso=False)
+    registro, = memoria.registros
+    assert registro.tipo == "geracao" and registro.nome == "kruskal"
+    assert list(registro.fases_ns) == ["Escavação", "Caminhos extras", "Início e fim", "Barreiras", "Moedas"]
+    assert registro.contadores["moedas"] == 3
+    assert registro.rotulos == {"altura": "21", "largura": "31", "semente": "2"}
+
+class FronteiraLista:
+    """Fronteira mínima que devolve o que recebe, sem descartar itens repetidos."""
+
+    def __init__(self):
+        self.itens = []
+        self.insercoes = self.remocoes = self.remocoes_obsoletas = 0
+
+    def inserir(self, prioridade, item):
+        self.itens.append((prioridade, item))
+        self.itens.sort(reverse=True)
+        self.insercoes += 1
+
+    def remover(self):
+        self.remocoes += 1
+        return self.itens.pop()
+
+    def __len__(self):
+        return len(self.itens)
+
+def test_fronteira_instrumentada_conta_pico_e_reexpansoes():
+    fronteira = FronteiraInstrumentada(FronteiraLista())
+    for prioridade, item in ((3, "a"), (1, "b"), (2, "a")):
+        fronteira.inserir(prioridade, item)
+    assert [fronteira.remover() for _ in range(3)] == [(1, "b"), (2, "a"), (3, "a")]
+    fronteira.inserir(4, "c")
+    assert fronteira.pico == 3
+    assert fronteira.reexpansoes == 1
+    assert (fronteira.insercoes, fronteira.remocoes) == (4, 3)
+
+def test_contadores_da_fronteira_na_busca():
+    lab, grafo, inicio, fim = labirinto()
+    memoria = ObservadorMemoria()
+    with instrumentar(memoria):
+        _, metricas = resolver_a_estrela(grafo, inicio, fim)
+    registro, = memoria.registros
+    assert registro.contadores["insercoes"] == metricas.insercoes > 0
+    assert 0 < registro.contadores["pico_fronteira"] <= metricas.insercoes
+    # Com heurística consistente o A* não reabre células
+    assert registro.contadores["reexpansoes"] == 0
+    assert not isinstance(criar_fronteira("heap"), FronteiraInstrumentada)  # Fora da sessão
+
+def test_observador_jsonl(tmp_path):
+    registro = RegistroMedicao("busca", "A*", {"busca": 1500}, {"nos_visitados": 7}, rotulos={"funcao": "f"})
+    saida = io.StringIO()
+    ObservadorJsonl(saida).observar(registro)
+    assert json.loads(saida.getvalue()) == dataclasses.asdict(registro)
+
+    arquivo = tmp_path / "medicoes.jsonl"
+    for _ in range(2):  # Cada observador acrescenta ao arquivo
+        observador = ObservadorJsonl(str(arquivo))
+        observador.observar(registro)
+        observador.fechar()
+    linhas = arquivo.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(linha)["contadores"] for linha in linhas] == [{"nos_visitados": 7}] * 2
+
+def test_texto_do_prometheus():
+    prometheus = ObservadorPrometheus(prefixo="teste")
+    assert prometheus.texto() == ""
+    nome = 'a"b\\c\nd'
+    for duracao, pico in ((1_500_000_000, 100), (500_000_000, 50)):
+        prometheus.observar(RegistroMedicao("busca", nome, {"busca": duracao}, {"nos": 3}, {"busca": pico}))
+    rotulos = 'tipo="busca",nome="a\\"b\\\\c\\nd"'
+    assert prometheus.texto().splitlines() == [
+        "# HELP teste_execucoes_total Chamadas medidas.",
+        "# TYPE teste_execucoes_total counter",
+        f"teste_execucoes_total{{{rotulos}}} 2",
+        "# HELP teste_fase_segundos_total Tempo somado por fase.",
+        "# TYPE teste_fase_segundos_total counter",
+        f'teste_fase_segundos_total{{{rotulos},fase="busca"}} 2.0',
+        "# HELP teste_eventos_total Contadores somados (inserções, remoções, nós...).",
+        "# TYPE teste_eventos_total counter",
+        f'teste_eventos_total{{{rotulos},contador="nos"}} 6',
+        "# HELP teste_memoria_pico_bytes Maior pico de memória alocada por fase.",
+        "# TYPE teste_memoria_pico_bytes gauge",
+        f'teste_memoria_pico_bytes{{{rotulos},fase="busca"}} 100',
+    ]
+
+def test_instrumentacao_nao_muda_os_resultados():
+    lab, grafo, inicio, fim = labirinto()
+    sem_sessao = resolver_a_estrela(grafo, inicio, fim)
+    with instrumentar(ObservadorMemoria(), memoria=True):
+        com_sessao = resolver_a_estrela(grafo, inicio, fim)
+    sem_tempo = lambda metricas: dataclasses.replace(metricas, tempo_execucao=0)
+    assert com_sessao[0] == sem_sessao[0]
+    assert sem_tempo(com_sessao[1]) == sem_tempo(sem_sessao[1])
+
+    # A geração também sai igual com a mesma semente
+    gerado = gerar_labirinto(21, 31, 3, "prim", 9, verboso=False)
+    with instrumentar(ObservadorMemoria()):
+        medido = gerar_labirinto(21, 31, 3, "prim", 9, verboso=False)
+    assert medido[0].celulas == gerado[0].celulas and medido[1:] == gerado[1:]
@@ -0,0 +1,49 @@
+import pytest
+
+from constantes import *
+from labirinto import (gerar_labirinto, analisar_rota, desviar_rota, rota_mais_curta, existe_caminho,
+                       marcar_alcancaveis)
+
+@pytest.mark.parametrize("semente", range(6))
+def test_separadores_sao_as_celulas_que_desconectam(semente):
+    lab, inicio, fim, _ = gerar_labirinto(15, 21, 0, "prim", semente, chance_remover_parede=0.2, verboso=False)
+    separadores, rota, gargalos = analisar_rota(lab, inicio, fim)
+    assert rota[0] == lab.indice(*inicio) and rota[-1] == lab.indice(*fim)
+    esperados = 0
+    for pos in lab.posicoes_com(CEL_CAMINHO):
+        if pos in (inicio, fim):
+            continue
+        lab[pos] = CEL_BARREIRA
+        separa = not existe_caminho(lab, inicio, fim, considerar_barreiras=True)
+        lab[pos] = CEL_CAMINHO
+        assert separadores[lab.indice(*pos)] == separa, pos
+        esperados += separa
+    assert gargalos == esperados
+    assert separadores[lab.indice(*inicio)] and separadores[lab.indice(*fim)]
+
+def test_desviar_rota_contorna_a_barreira():
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 0, "prim", 3, chance_remover_parede=0.8,
+                                          chance_barreira=0, verboso=False)
+    separadores, rota, _ = analisar_rota(lab, inicio, fim)
+    bloqueada = next(celula for celula in rota[1:-1] if not separadores[celula])
+    lab[lab.posicao(bloqueada)] = CEL_BARREIRA
+    nova_rota = desviar_rota(lab, rota, bloqueada)
+    assert bloqueada not in nova_rota
+    assert nova_rota[0] == rota[0] and nova_rota[-1] == rota[-1]
+    assert len(set(nova_rota)) == len(nova_rota)
+    for anterior, atual in zip(nova_rota, nova_rota[1:]):
+        assert abs(anterior - atual) in (1, lab.largura)
+        assert lab.celulas[atual] not in (CEL_PAREDE, CEL_BARREIRA)
+
+def test_rota_mais_curta_sem_saida():
+    lab, inicio, fim, _ = gerar_labirinto(11, 11, 0, "prim", 1, verboso=False)
+    origem = lab.indice(*inicio)
+    assert rota_mais_curta(lab, origem, origem) == [origem]
+    assert rota_mais_curta(lab, origem, 0) is None  # Canto de parede
+
+def test_moedas_alcancaveis():
+    lab, inicio, fim, moedas = gerar_labirinto(31, 51, 20, "kruskal", 8, verboso=False)
+    alcancaveis = marcar_alcancaveis(lab, inicio)
+    assert len(moedas) == 20 and len(set(moedas)) == 20
+    assert all(lab[moeda] == CEL_MOEDA and alcancaveis[lab.indice(*moeda)] for moeda in moedas)
+    assert lab[inicio] == CEL_INICIO and lab[fim] == CEL_FIM
@@ -0,0 +1,74 @@
+import io
+import json
+
+import pytest
+
+from arquivo import salvar_labirinto
+from labirinto import gerar_labirinto
+from lote import SaidaLote, executar_lote, main
+
+def rodar(linhas, trabalhadores=0, algoritmos=("a_estrela", "dijkstra")):
+    destino = io.StringIO()
+    saida = SaidaLote(destino)
+    executar_lote(linhas, saida, algoritmos, trabalhadores)
+    registros = [json.loads(linha) for linha in destino.getvalue().splitlines()]
+    return saida, sorted(registros, key=lambda r: (r["trabalho"], r.get("solucionador", "")))
+
+def test_um_registro_por_algoritmo():
+    saida, registros = rodar([json.dumps({"id": "x", "semente": 3, "altura": 21, "largura": 31})])
+    assert [r["solucionador"] for r in registros] == ["a_estrela", "dijkstra"]
+    assert all(r["id"] == "x" and r["caminho_encontrado"] and not r["do_cache"] for r in registros)
+    assert registros[0]["custo_total"] == registros[1]["custo_total"]
+    assert (saida.registros, saida.falhas) == (2, 0)
+
+def test_arquivo_caminho_e_extremos(tmp_path):
+    lab, inicio, fim, moedas = gerar_labirinto(21, 31, 0, "prim", 4, verboso=False)
+    caminho_arquivo = str(tmp_path / "lab.bin")
+    salvar_labirinto(caminho_arquivo, lab, inicio, fim, moedas)
+    trabalho = {"arquivo": caminho_arquivo, "algoritmos": "dfs", "incluir_caminho": True, "fim": list(inicio)}
+    _, (registro,) = rodar([json.dumps(trabalho)])
+    assert registro["inicio"] == registro["fim"] == list(inicio)
+    assert registro["caminho"] == [list(inicio)]
+
+@pytest.mark.parametrize("linha, erro", [
+    ("{não é json", "JSON inválido"),
+    ("[1, 2]", "objeto JSON"),
+    ('{"semente": 1, "altura": 21}', "Campo obrigatório ausente: largura"),
+    ('{"altura": 2, "largura": 2}', "pelo menos 3x3"),
+    ('{"arquivo": "/nao/existe.bin"}', "FileNotFoundError"),
+    ('{"altura": 21, "largura": 31, "algoritmos": 7}', "'algoritmos'"),
+    ('{"altura": 21, "largura": 31, "algoritmos": [["a_estrela"]]}', "'algoritmos'"),
+    ('{"altura": 21, "largura": 31, "gerador": "nenhum"}', "desconhecido"),
+    ('{"altura": 21, "largura": 31, "inicio": [21, 1]}', "'inicio' [21, 1] está fora do labirinto 21x31"),
+    ('{"altura": 21, "largura": 31, "fim": [1, -1]}', "'fim' [1, -1] está fora do labirinto"),
+    ('{"altura": 21, "largura": 31, "fim": [0, 0]}', "'fim' [0, 0] é uma parede"),
+    ('{"altura": 21, "largura": 31, "inicio": [1]}', "'inicio' deve ser [linha, coluna]"),
+])
+def test_trabalho_invalido_vira_linha_de_erro(linha, erro):
+    saida, registros = rodar(["", linha, json.dumps({"altura": 21, "largura": 31, "semente": 1})])
+    falhas = [r for r in registros if "erro" in r]
+    assert len(falhas) == 1 and falhas[0]["trabalho"] == 2
+    assert erro in falhas[0]["erro"]
+    # O trabalho seguinte roda normalmente
+    assert [r["solucionador"] for r in registros if r["trabalho"] == 3] == ["a_estrela", "dijkstra"]
+    assert saida.falhas == 1
+
+def test_algoritmo_desconhecido_nao_impede_os_outros():
+    saida, registros = rodar([json.dumps({"altura": 21, "largura": 31, "algoritmos": ["xyz", "jps"]})])
+    assert "Algoritmo desconhecido: xyz" in registros[1]["erro"]
+    assert registros[0]["solucionador"] == "jps" and registros[0]["caminho_encontrado"]
+    assert saida.falhas == 1
+
+def test_processos_de_trabalho():
+    linhas = [json.dumps({"semente": s, "altura": 21, "largura": 31}) for s in range(6)] + ["{ruim"]
+    saida, registros = rodar(linhas, trabalhadores=2)
+    assert saida.registros == 13 and saida.falhas == 1
+    assert sorted({r["trabalho"] for r in registros}) == list(range(1, 8))
+
+def test_main_retorna_1_com_falhas(tmp_path, capsys):
+    entrada = tmp_path / "trabalhos.jsonl"
+    entrada.write_text('{"altura": 21, "largura": 31}\n{ruim\n', encoding="utf-8")
+    resultados = tmp_path / "resultados.jsonl"
+    assert main([str(entrada), "-o", str(resultados), "--trabalhadores", "0", "--algoritmos", "a_estrela"]) == 1
+    assert len(resultados.read_text(encoding="utf-8").splitlines()) == 2
+    assert "2 registros, 1 com erro" in capsys.readouterr().err
@@ -0,0 +1,80 @@
+import pytest
+
+from constantes import *
+from grade import GradeLabirinto
+from grafo import compilar_grafo
+from labirinto import gerar_labirinto
+from algoritmos import resolver_a_estrela, resolver_dijkstra
+from marcos import FORMATO_CABECALHO_MARCOS, preprocessar_marcos, salvar_marcos, carregar_marcos
+
+@pytest.fixture(scope="module")
+def consulta():
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 0, "kruskal", 6, chance_barreira=0.2, verboso=False)
+    return lab, compilar_grafo(lab), inicio, fim
+
+def test_labirinto_sem_arestas_nao_tem_caminho():
+    # Início e fim abertos, mas sem nenhum vizinho aberto
+    lab = GradeLabirinto(5, 5, preenchimento=CEL_PAREDE)
+    lab[1, 1] = CEL_CAMINHO
+    lab[3, 3] = CEL_CAMINHO
+    grafo = compilar_grafo(lab)
+    tabela = preprocessar_marcos(grafo, 4)
+    assert tabela.marcos == [] and tabela.distancias == []
+    caminho, metricas = resolver_a_estrela(grafo, (1, 1), (3, 3), marcos=tabela)
+    assert caminho is None and not metricas.caminho_encontrado
+    assert resolver_a_estrela(grafo, (1, 1), (1, 1), marcos=tabela)[0] == [(1, 1)]
+
+def test_orcamento_limita_os_marcos(consulta):
+    _, grafo, _, _ = consulta
+    # Um byte de custo por célula mais as distâncias (4 bytes por célula) de cada marco
+    orcamento = grafo.num_celulas * (1 + 2 * 4)
+    assert len(preprocessar_marcos(grafo, 8, orcamento_bytes=orcamento, semente=1).marcos) == 2
+    with pytest.raises(ValueError, match="não comporta nenhum marco"):
+        preprocessar_marcos(grafo, 8, orcamento_bytes=100)
+
+def test_salvar_e_carregar_marcos(consulta, tmp_path):
+    _, grafo, inicio, fim = consulta
+    tabela = preprocessar_marcos(grafo, 4, semente=2)
+    arquivo = str(tmp_path / "lab.lmrk")
+    salvar_marcos(arquivo, tabela)
+
+    carregada = carregar_marcos(arquivo, grafo)
+    assert carregada.marcos == tabela.marcos
+    assert bytes(carregada.custo_celula) == bytes(tabela.custo_celula)
+    assert [list(d) for d in carregada.distancias] == [list(d) for d in tabela.distancias]
+    _, metricas = resolver_a_estrela(grafo, inicio, fim, marcos=carregada)
+    assert metricas.custo_total == resolver_dijkstra(grafo, inicio, fim)[1].custo_total
+
+def test_tabela_sem_marcos_ida_e_volta(tmp_path):
+    grafo = compilar_grafo(GradeLabirinto(5, 5, preenchimento=CEL_PAREDE))
+    arquivo = str(tmp_path / "vazio.lmrk")
+    salvar_marcos(arquivo, preprocessar_marcos(grafo))
+    carregada = carregar_marcos(arquivo, grafo)
+    assert carregada.marcos == [] and carregada.distancias == []
+
+def test_carregar_para_labirinto_alterado_falha(consulta, tmp_path):
+    lab, grafo, _, _ = consulta
+    arquivo = str(tmp_path / "lab.lmrk")
+    salvar_marcos(arquivo, preprocessar_marcos(grafo, 2, semente=3))
+
+    alterado = GradeLabirinto(lab.altura, lab.largura, bytearray(lab.celulas))
+    pos = next(pos for pos in alterado.posicoes_com(CEL_CAMINHO))
+    alterado[pos] = CEL_BARREIRA
+    with pytest.raises(ValueError, match="não correspondem"):
+        carregar_marcos(arquivo, compilar_grafo(alterado))
+    # Sem grafo para conferir, o arquivo abre normalmente
+    assert len(carregar_marcos(arquivo).marcos) == 2
+
+def test_arquivo_corrompido(consulta, tmp_path):
+    _, grafo, _, _ = consulta
+    arquivo = tmp_path / "lab.lmrk"
+    salvar_marcos(str(arquivo), preprocessar_marcos(grafo, 2, semente=3))
+    dados = bytearray(arquivo.read_bytes())
+
+    (tmp_path / "truncado.lmrk").write_bytes(dados[:len(dados) // 2])
+    with pytest.raises(ValueError, match="truncado"):
+        carregar_marcos(str(tmp_path / "truncado.lmrk"))
+    dados[FORMATO_CABECALHO_MARCOS.size + 2 * 8] ^= 0xFF  # Primeiro byte dos custos, após os 2 marcos
+    arquivo.write_bytes(dados)
+    with pytest.raises(ValueError, match="Checksum"):
+        carregar_marcos(str(arquivo))
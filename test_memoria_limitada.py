@@ -0,0 +1,34 @@
+import pytest
+
+from grafo import compilar_grafo
+from labirinto import gerar_labirinto
+from algoritmos import resolver_dijkstra
+from memoria_limitada import resolver_ida_estrela, resolver_sma_estrela
+
+@pytest.fixture(scope="module")
+def consulta():
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 0, "prim", 4, chance_remover_parede=0.6,
+                                          chance_barreira=0.2, verboso=False)
+    grafo = compilar_grafo(lab)
+    return grafo, inicio, fim, resolver_dijkstra(grafo, inicio, fim)[1]
+
+@pytest.mark.parametrize("tamanho_tabela", [1, 64, 4096])
+def test_ida_estrela_otimo_com_tabela_pequena(consulta, tamanho_tabela):
+    grafo, inicio, fim, otimo = consulta
+    caminho, metricas = resolver_ida_estrela(grafo, inicio, fim, tamanho_tabela=tamanho_tabela)
+    assert metricas.custo_total == otimo.custo_total
+
+def test_sma_estrela_respeita_o_limite(consulta):
+    grafo, inicio, fim, otimo = consulta
+    max_nos = 4 * otimo.comprimento_caminho
+    caminho, metricas = resolver_sma_estrela(grafo, inicio, fim, max_nos=max_nos)
+    assert metricas.custo_total == otimo.custo_total
+    # A expansão pode passar do limite por até 4 filhos
+    assert metricas.pico_nos <= max_nos + 4
+
+def test_sma_estrela_sem_memoria_para_o_caminho(consulta):
+    grafo, inicio, fim, otimo = consulta
+    caminho, metricas = resolver_sma_estrela(grafo, inicio, fim, max_nos=otimo.comprimento_caminho // 2)
+    assert caminho is None and not metricas.caminho_encontrado
+    with pytest.raises(ValueError):
+        resolver_sma_estrela(grafo, inicio, fim, max_nos=1)
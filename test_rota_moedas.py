@@ -0,0 +1,61 @@
+from itertools import permutations
+
+import pytest
+
+from constantes import *
+from grade import GradeLabirinto
+from grafo import compilar_grafo, custos_de_entrada
+from labirinto import gerar_labirinto
+from algoritmos import resolver_dijkstra
+from rota_moedas import resolver_rota_moedas
+
+def conferir_rota(grafo, caminho, custo, inicio, fim, moedas):
+    """O caminho anda de vizinho em vizinho, passa por todas as moedas e custa o informado."""
+    assert caminho[0] == inicio and caminho[-1] == fim
+    assert set(moedas) <= set(caminho)
+    custo_celula = custos_de_entrada(grafo)
+    for (l1, c1), (l2, c2) in zip(caminho, caminho[1:]):
+        assert abs(l1 - l2) + abs(c1 - c2) == 1
+        assert custo_celula[grafo.indice((l2, c2))] > 0
+    assert sum(custo_celula[grafo.indice(pos)] for pos in caminho[1:]) == custo
+
+def custo_forca_bruta(grafo, inicio, fim, moedas):
+    pontos = [inicio, *moedas, fim]
+    d = {(a, b): resolver_dijkstra(grafo, a, b)[1].custo_total for a in pontos for b in pontos if a != b}
+    return min(
+        sum(d[a, b] for a, b in zip((inicio, *ordem), (*ordem, fim)))
+        for ordem in permutations(moedas)
+    )
+
+@pytest.mark.parametrize("num_moedas", [0, 1, 4, 7])
+@pytest.mark.parametrize("algoritmo", ["prim", "kruskal"])
+def test_held_karp_igual_a_forca_bruta(num_moedas, algoritmo):
+    lab, inicio, fim, moedas = gerar_labirinto(15, 21, num_moedas, algoritmo, num_moedas,
+                                               chance_barreira=0.2, verboso=False)
+    grafo = compilar_grafo(lab)
+    caminho, metricas = resolver_rota_moedas(grafo, inicio, fim, moedas)
+    assert metricas.algoritmo == "Rota das Moedas (Held-Karp)"
+    assert metricas.custo_total == custo_forca_bruta(grafo, inicio, fim, moedas)
+    conferir_rota(grafo, caminho, metricas.custo_total, inicio, fim, moedas)
+
+def test_heuristica_passa_por_todas_as_moedas():
+    lab, inicio, fim, moedas = gerar_labirinto(41, 41, 30, "kruskal", 5, chance_barreira=0.2, verboso=False)
+    grafo = compilar_grafo(lab)
+    caminho, metricas = resolver_rota_moedas(grafo, inicio, fim, moedas, vizinhos_candidatos=4)
+    assert metricas.algoritmo == "Rota das Moedas (2-opt + Or-opt)"
+    conferir_rota(grafo, caminho, metricas.custo_total, inicio, fim, moedas)
+
+    # Com poucas moedas a heurística nunca fica abaixo do ótimo
+    exato = resolver_rota_moedas(grafo, inicio, fim, moedas[:6])[1].custo_total
+    heuristico = resolver_rota_moedas(grafo, inicio, fim, moedas[:6], limite_exato=0)[1].custo_total
+    assert heuristico >= exato
+
+@pytest.mark.parametrize("limite_exato", [12, 0])
+def test_moeda_inalcancavel(limite_exato):
+    # Corredor aberto na linha 1; a célula (3, 3) está cercada de paredes
+    lab = GradeLabirinto(5, 7, preenchimento=CEL_PAREDE)
+    for coluna in range(1, 6):
+        lab[1, coluna] = CEL_CAMINHO
+    lab[3, 3] = CEL_MOEDA
+    caminho, metricas = resolver_rota_moedas(lab, (1, 1), (1, 5), [(1, 3), (3, 3)], limite_exato=limite_exato)
+    assert caminho is None and not metricas.caminho_encontrado
@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+from grafo import compilar_grafo
+from labirinto import gerar_labirinto
+from algoritmos import resolver_dijkstra
+from servico import ServicoLabirintos
+
+class Cliente:
+    """Conexão de teste: envia linhas e lê respostas JSON."""
+
+    def __init__(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.leitor = leitor
+        self.escritor = escritor
+
+    async def enviar(self, *linhas) -> None:
+        for linha in linhas:
+            if not isinstance(linha, bytes):
+                linha = json.dumps(linha).encode()
+            self.escritor.write(linha + b"\n")
+        await self.escritor.drain()
+
+    async def receber(self, quantidade: int = 1) -> list:
+        respostas = []
+        for _ in range(quantidade):
+            linha = await asyncio.wait_for(self.leitor.readline(), 30)
+            respostas.append(json.loads(linha))
+        return respostas
+
+    async def pedir(self, pedido: dict) -> dict:
+        await self.enviar(pedido)
+        resposta, = await self.receber()
+        return resposta
+
+def com_servico(teste, **opcoes):
+    """Roda `teste(servico, cliente)` com um serviço de um worker numa porta TCP livre."""
+    async def rodar():
+        servico = ServicoLabirintos(trabalhadores=1, **opcoes)
+        servidor = await servico.iniciar(porta=0)
+        porta = servidor.sockets[0].getsockname()[1]
+        leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+        try:
+            return await teste(servico, Cliente(leitor, escritor))
+        finally:
+            escritor.close()
+            await servico.encerrar()
+    return asyncio.run(rodar())
+
+def test_gerar_resolver_e_comparar():
+    async def teste(servico, cliente):
+        gerado = await cliente.pedir({"id": 1, "op": "gerar", "altura": 21, "largura": 31, "semente": 5})
+        assert gerado["ok"] and gerado["id"] == 1
+        consulta = {"labirinto": gerado["labirinto"], "inicio": gerado["inicio"], "fim": gerado["fim"]}
+        resolvido = await cliente.pedir({"id": 2, "op": "resolver", "algoritmo": "jps", **consulta})
+        comparado = await cliente.pedir({"id": 3, "op": "comparar", "algoritmos": ["a_estrela", "dfs"], **consulta})
+        repetido = await cliente.pedir({"id": 4, "op": "resolver", "algoritmo": "jps", **consulta})
+        return gerado, resolvido, comparado, repetido
+    gerado, resolvido, comparado, repetido = com_servico(teste)
+    
+    lab, inicio, fim, _ = gerar_labirinto(21, 31, 5, "prim", 5, verboso=False)
+    assert [list(inicio), list(fim)] == [gerado["inicio"], gerado["fim"]]
+    otimo = resolver_dijkstra(compilar_grafo(lab), inicio, fim)[1].custo_total
+    assert resolvido["metricas"]["custo_total"] == otimo
+    assert resolvido["caminho"][0] == gerado["inicio"] and resolvido["caminho"][-1] == gerado["fim"]
+    assert not resolvido["metricas"]["do_cache"]
+    assert repetido["metricas"]["do_cache"]
+    assert comparado["resultados"]["a_estrela"]["metricas"]["custo_total"] == otimo
+    assert comparado["resultados"]["dfs"]["metricas"]["caminho_encontrado"]
+
+def test_pedidos_invalidos_viram_linhas_de_erro():
+    async def teste(servico, cliente):
+        await cliente.enviar(
+            b"{ruim",
+            b"[1]",
+            {"id": [1], "op": "estado"},
+            {"id": 1, "op": "voar"},
+            {"id": 2, "op": "gerar", "altura": 21},
+            {"id": 3, "op": "gerar", "altura": 2, "largura": 2},
+            {"id": 4, "op": "resolver", "labirinto": "nenhum", "inicio": [1, 1], "fim": [1, 1]},
+            {"id": 5, "op": "resolver", "algoritmo": "xyz", "labirinto": "nenhum", "inicio": [1, 1], "fim": [1, 1]},
+            {"id": 6, "op": "carregar", "arquivo": "/nao/existe.bin"},
+            b'{"id": 7, "op": "estado", "extra": "' + b"x" * 5000 + b'"}',
+        )
+        respostas = await cliente.receber(10)
+        # A conexão continua atendendo depois dos erros
+        estado = await cliente.pedir({"id": 8, "op": "estado"})
+        return respostas, estado
+    respostas, estado = com_servico(teste, tamanho_max_pedido=4096)
+    
+    erros = {}
+    for resposta in respostas:
+        assert resposta["ok"] is False
+        erros.setdefault(resposta["id"], []).append(resposta["erro"])
+    assert any("JSON inválido" in erro for erro in erros[None])
+    assert any("número ou texto" in erro for erro in erros[None])
+    assert any("maior que 4096 bytes" in erro for erro in erros[None])
+    assert len(erros[None]) == 4
+    assert "Operação desconhecida" in erros[1][0]
+    assert erros[2] == ["Campo obrigatório ausente: largura"]
+    assert "3x3" in erros[3][0]
+    assert "Labirinto desconhecido" in erros[4][0]
+    assert "Algoritmo desconhecido: xyz" in erros[5][0]
+    assert erros[6]
+    assert estado["ok"] and estado["contadores"]["erros"] == 10
+
+def test_id_repetido_prazo_e_cancelamento():
+    async def teste(servico, cliente):
+        # Geração demorada: o id 1 continua em andamento quando chega o segundo pedido com ele
+        lento = {"op": "gerar", "altura": 401, "largura": 401, "semente": 1}
+        await cliente.enviar({"id": 1, **lento}, {"id": 1, "op": "estado"})
+        recusado, = await cliente.receber()
+        await cliente.enviar({"id": 2, "op": "cancelar", "alvo": 1})
+        respostas = await cliente.receber(2)
+        esgotado = await cliente.pedir({"id": 3, "prazo": 0.01, **lento})
+        return recusado, respostas, esgotado
+    recusado, respostas, esgotado = com_servico(teste)
+    
+    assert recusado["id"] == 1 and not recusado["ok"]
+    assert "Já existe um pedido em andamento" in recusado["erro"]
+    por_id = {resposta["id"]: resposta for resposta in respostas}
+    assert por_id[2] == {"id": 2, "ok": True, "cancelado": True}
+    assert por_id[1] == {"id": 1, "ok": False, "erro": "Pedido cancelado"}
+    assert not esgotado["ok"] and "esgotado" in esgotado["erro"]
+
+def test_labirinto_de_pedido_esgotado_continua_registrado():
+    async def teste(servico, cliente):
+        guardado = await cliente.pedir({"id": 1, "op": "gerar", "altura": 11, "largura": 11, "semente": 1})
+        # O prazo esgota com a geração já no worker: ela termina e descarta o primeiro (limite 1)
+        esgotado = await cliente.pedir({"id": 2, "prazo": 0.05, "op": "gerar", "altura": 401, "largura": 401})
+        seguinte = await cliente.pedir({"id": 3, "op": "gerar", "altura": 11, "largura": 11, "semente": 2})
+        return guardado, esgotado, seguinte, set(servico.dono), servico.trabalhadores[0].labirintos
+    guardado, esgotado, seguinte, donos, labirintos = com_servico(teste, max_labirintos=1)
+    
+    assert guardado["ok"] and not esgotado["ok"] and seguinte["ok"]
+    assert donos == labirintos == {seguinte["labirinto"]}
+
+def test_desconectar_cancela_pedidos_sem_id():
+    async def teste(servico, cliente):
+        # O worker nasce no primeiro pedido; a conexão que cai é aberta depois, para o
+        # processo filho não herdar o socket dela
+        primeiro = await cliente.pedir({"id": 1, "op": "gerar", "altura": 11, "largura": 11})
+        porta = servico.servidor.sockets[0].getsockname()[1]
+        outro = Cliente(*await asyncio.open_connection("127.0.0.1", porta))
+        lento = {"op": "gerar", "altura": 401, "largura": 401}
+        await outro.enviar(lento, lento)
+        await asyncio.sleep(0.2)  # O primeiro já está no worker e o segundo espera na fila
+        outro.escritor.close()
+        ultimo = await cliente.pedir({"id": 2, "op": "gerar", "altura": 11, "largura": 11})
+        return primeiro, ultimo, len(servico.trabalhadores[0].labirintos)
+    primeiro, ultimo, guardados = com_servico(teste)
+    
+    # O lento que já rodava fica guardado; o que esperava na fila nem chegou ao worker
+    assert primeiro["ok"] and ultimo["ok"]
+    assert guardados == 3
+
+def test_extremos_fora_da_grade_ou_em_paredes():
+    async def teste(servico, cliente):
+        gerado = await cliente.pedir({"id": 1, "op": "gerar", "altura": 21, "largura": 31, "semente": 5})
+        base = {"labirinto": gerado["labirinto"], "inicio": gerado["inicio"], "fim": gerado["fim"]}
+        fora = await cliente.pedir({"id": 2, "op": "resolver", **base, "fim": [5, 31]})
+        negativo = await cliente.pedir({"id": 3, "op": "comparar", **base, "inicio": [-1, 1]})
+        parede = await cliente.pedir({"id": 4, "op": "resolver", **base, "inicio": [0, 0]})
+        valido = await cliente.pedir({"id": 5, "op": "resolver", **base})
+        return fora, negativo, parede, valido
+    fora, negativo, parede, valido = com_servico(teste)
+    
+    assert not fora["ok"] and fora["erro"] == "'fim' [5, 31] está fora do labirinto 21x31"
+    assert not negativo["ok"] and "'inicio' [-1, 1] está fora" in negativo["erro"]
+    assert not parede["ok"] and parede["erro"] == "'inicio' [0, 0] é uma parede"
+    assert valido["ok"]
@@ -0,0 +1,68 @@
+import io
+
+from constantes import *
+from grade import GradeLabirinto
+from visualizacao import TelaGrade, LIMPAR_TELA, LIMPAR_LINHA, mover_cursor
+
+def tela_de_teste(**opcoes):
+    grade = GradeLabirinto(6, 8, preenchimento=CEL_CAMINHO)
+    for coluna in range(8):
+        grade[0, coluna] = grade[5, coluna] = CEL_PAREDE
+    saida = io.StringIO()
+    tela = TelaGrade(grade, linhas_status=1, saida=saida, **opcoes)
+    tela.desenhar_tudo()
+    return tela, saida
+
+def ler(saida: io.StringIO) -> str:
+    texto = saida.getvalue()
+    saida.seek(0)
+    saida.truncate()
+    return texto
+
+def test_quadro_inicial_desenha_a_grade_inteira():
+    tela, saida = tela_de_teste()
+    texto = ler(saida)
+    assert texto.count(LIMPAR_TELA) == 1
+    assert texto.count(CARACTERES_CELULA[CEL_PAREDE]) == 2 * 8
+    assert texto.count(CARACTERES_CELULA[CEL_CAMINHO]) == 4 * 8
+
+def test_redesenha_so_as_celulas_alteradas():
+    tela, saida = tela_de_teste()
+    ler(saida)
+    largura = tela.grade.largura
+    tela.alterar(2 * largura + 3, CEL_VISITADO)
+    tela.alterar(4 * largura + 6, CEL_SOLUCAO)
+    tela.apresentar()
+    # A linha 0 da tela é a de status, então a linha l da grade fica na linha l + 1
+    assert ler(saida) == (mover_cursor(3, 3) + CARACTERES_CELULA[CEL_VISITADO]
+                          + mover_cursor(5, 6) + CARACTERES_CELULA[CEL_SOLUCAO])
+
+    # Sem mudanças, nada é escrito; voltar ao que já está na tela também não
+    tela.apresentar()
+    tela.alterar(2 * largura + 3, CEL_VISITADO)
+    tela.alterar(2 * largura + 4, CEL_VISITADO)
+    tela.alterar(2 * largura + 4, CEL_CAMINHO)
+    tela.apresentar()
+    assert ler(saida) == ""
+
+    # Só a linha de status que mudou é reescrita
+    tela.apresentar(("Expandidas: 1",))
+    assert ler(saida) == mover_cursor(0, 0) + LIMPAR_LINHA + "Expandidas: 1"
+    tela.apresentar(("Expandidas: 1",))
+    assert ler(saida) == ""
+
+def test_janela_adia_celulas_fora_da_parte_visivel():
+    tela, saida = tela_de_teste(janela=(4, 4))
+    ler(saida)
+    largura = tela.grade.largura
+    tela.alterar(1 * largura + 1, CEL_VISITADO)
+    tela.alterar(4 * largura + 6, CEL_VISITADO)  # Fora da janela
+    tela.apresentar()
+    assert ler(saida) == mover_cursor(2, 1) + CARACTERES_CELULA[CEL_VISITADO]
+
+    # Ao rolar até ela, a célula adiada aparece no redesenho da janela
+    tela.seguir((4, 6))
+    tela.apresentar()
+    texto = ler(saida)
+    assert tela.origem != (0, 0) and LIMPAR_TELA in texto
+    assert CARACTERES_CELULA[CEL_VISITADO] in texto
@@ -0,0 +1,300 @@
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple, Union
+
+from constantes import *
+from grade import Labirinto, Posicao, Caminho, GradeLabirinto, como_grade
+from grafo import GrafoLabirinto, grade_do_grafo
+from algoritmos import MetricasBusca, PassosBusca
+from janela import Minimapa, ESPACO_MINIMAPA, origem_janela, codigos_janela
+
+# Sequências ANSI usadas para redesenhar só o que mudou
+LIMPAR_TELA = "\x1b[2J\x1b[H"
+ESCONDER_CURSOR = "\x1b[?25l"
+MOSTRAR_CURSOR = "\x1b[?25h"
+LIMPAR_LINHA = "\x1b[2K"
+
+def mover_cursor(linha: int, coluna: int) -> str:
+    """Sequência ANSI que leva o cursor à linha e coluna (contadas a partir de 0)."""
+    return f"\x1b[{linha + 1};{coluna + 1}H"
+
+# Códigos desenhados com dois caracteres de largura (emoji): deslocam o resto da linha
+CODIGOS_LARGOS = (CEL_FIM,)
+
+class TelaGrade:
+    """
+    Grade desenhada no terminal com buffer de frente: `frente` guarda o código que está
+    na tela em cada célula visível, e alterar() só agenda a célula se o código novo for
+    diferente. apresentar() escreve as células agendadas e as linhas de status que
+    mudaram num único write, então o custo de um quadro depende do que mudou, não do
+    tamanho da grade. Tudo é posicionado com o cursor (sem quebras de linha), o que
+    funciona em modo bruto.
+
+    Com `janela`, só uma parte da grade aparece: seguir(pos) rola a janela quando o foco
+    chega perto da borda, e um minimapa opcional mostra a grade inteira ao lado. As
+    células alteradas fora da janela ficam em `sobrepostas` até aparecerem.
+    """
+
+    def __init__(self, grade: GradeLabirinto, linhas_status: int = 0, saida: Optional[TextIO] = None,
+                 janela: Optional[Tuple[int, int]] = None, minimapa: bool = False):
+        """
+        Args:
+            grade: Grade a desenhar
+            linhas_status: Linhas de texto reservadas acima da grade
+            saida: Onde escrever (padrão: sys.stdout)
+            janela: (altura, largura) da parte visível; None mostra a grade inteira
+            minimapa: Com janela, mostra ao lado um resumo da grade inteira
+        """
+        self.grade = grade
+        self.linhas_status = linhas_status
+        self.saida = saida if saida is not None else sys.stdout
+        self.minimapa = None
+        if janela is None:
+            altura, largura = grade.altura, grade.largura
+        else:
+            altura, largura = janela
+            if minimapa:
+                self.minimapa = Minimapa.para_janela(grade, altura, largura)
+                largura -= self.minimapa.largura + ESPACO_MINIMAPA
+            altura, largura = min(altura, grade.altura), max(1, min(largura, grade.largura))
+        self.altura_janela = altura
+        self.largura_janela = largura
+        self.origem = (0, 0)
+        self.foco: Optional[Posicao] = None
+        self.bloco_foco = -1
+        self.frente = bytearray(altura * largura)
+        self.sobrepostas: Dict[int, int] = {}  # célula -> código diferente do da grade
+        self.sujas: Dict[int, int] = {}  # célula -> código a desenhar no próximo quadro
+        self.status = [""] * linhas_status
+        self.largas: Dict[int, List[int]] = {}  # linha da janela -> colunas com códigos largos
+        self.redesenhar = True
+
+    def _local(self, celula: int) -> int:
+        """Índice da célula no buffer de frente, ou -1 se estiver fora da janela."""
+        linha, coluna = divmod(celula, self.grade.largura)
+        linha -= self.origem[0]
+        coluna -= self.origem[1]
+        if 0 <= linha < self.altura_janela and 0 <= coluna < self.largura_janela:
+            return linha * self.largura_janela + coluna
+        return -1
+
+    def _texto(self, linha: int, coluna: int, codigo: int) -> str:
+        """Caractere do código; numa posição larga da grade, códigos estreitos ganham um espaço."""
+        texto = CARACTERES_CELULA[codigo]
+        largas = self.largas.get(linha)
+        if largas and coluna in largas and codigo not in CODIGOS_LARGOS:
+            texto += " "
+        return texto
+
+    def _coluna_na_tela(self, linha: int, coluna: int) -> int:
+        largas = self.largas.get(linha)
+        if largas:
+            return coluna + sum(1 for col in largas if col < coluna)
+        return coluna
+
+    def _quadro_inteiro(self) -> List[str]:
+        """Partes de um quadro que redesenha a janela inteira (e o minimapa)."""
+        grade = self.grade
+        altura, largura = self.altura_janela, self.largura_janela
+        self.sujas.clear()
+        self.frente[:] = codigos_janela(grade, self.origem, altura, largura, self.sobrepostas)
+        # As posições largas vêm da grade, não das sobreposições, para o desenho não mudar de lugar
+        base = codigos_janela(grade, self.origem, altura, largura)
+        self.largas.clear()
+        for local, codigo in enumerate(base):
+            if codigo in CODIGOS_LARGOS:
+                self.largas.setdefault(local // largura, []).append(local % largura)
+        partes = [ESCONDER_CURSOR, LIMPAR_TELA]
+        for i, texto in enumerate(self.status):
+            partes.append(mover_cursor(i, 0) + texto)
+        for linha in range(altura):
+            inicio = linha * largura
+            partes.append(mover_cursor(self.linhas_status + linha, 0) + "".join(
+                self._texto(linha, coluna, codigo)
+                for coluna, codigo in enumerate(self.frente[inicio:inicio + largura])))
+        partes.append(mover_cursor(self.linhas_status + altura, 0) + "█" * largura)
+        self.redesenhar = False
+        return partes
+
+    def _quadro_minimapa(self) -> List[str]:
+        """Partes que redesenham o minimapa ao lado da janela."""
+        linha0, coluna0 = self.origem
+        janela = (linha0, coluna0, self.altura_janela, self.largura_janela)
+        coluna = self.largura_janela + ESPACO_MINIMAPA
+        return [mover_cursor(self.linhas_status + i, coluna) + texto
+                for i, texto in enumerate(self.minimapa.linhas(janela, self.foco))]
+
+    def desenhar_tudo(self) -> None:
+        """Limpa a tela e desenha a janela inteira (no início ou depois de rolar)."""
+        partes = self._quadro_inteiro()
+        if self.minimapa is not None:
+            partes += self._quadro_minimapa()
+        self.saida.write("".join(partes))
+        self.saida.flush()
+
+    def alterar(self, celula: int, codigo: int) -> None:
+        """Define o código mostrado numa célula a partir do próximo quadro."""
+        if codigo == self.grade.celulas[celula]:
+            self.sobrepostas.pop(celula, None)
+        else:
+            self.sobrepostas[celula] = codigo
+        local = self._local(celula)
+        if local < 0:
+            return
+        if self.frente[local] != codigo:
+            self.sujas[celula] = codigo
+        else:
+            self.sujas.pop(celula, None)
+
+    def seguir(self, pos: Posicao) -> None:
+        """
+        Define o foco da janela. Se ele chegar a menos de 1/4 da janela da borda, a
+        janela é recentrada nele e redesenhada inteira no próximo quadro.
+        """
+        self.foco = pos
+        altura, largura = self.altura_janela, self.largura_janela
+        linha = pos[0] - self.origem[0]
+        coluna = pos[1] - self.origem[1]
+        margem_linhas, margem_colunas = altura // 4, largura // 4
+        if (margem_linhas <= linha < altura - margem_linhas
+                and margem_colunas <= coluna < largura - margem_colunas):
+            return
+        origem = origem_janela(self.grade, pos, altura, largura)
+        if origem != self.origem:
+            self.origem = origem
+            self.redesenhar = True
+
+    def apresentar(self, status: Sequence[str] = ()) -> None:
+        """Escreve as células alteradas e as linhas de status novas num único write."""
+        redesenhar = self.redesenhar
+        novas = [i for i, texto in enumerate(status) if texto != self.status[i]]
+        for i in novas:
+            self.status[i] = status[i]
+        if redesenhar:
+            partes = self._quadro_inteiro()
+        else:
+            partes = []
+            largura, frente = self.grade.largura, self.frente
+            linha0, coluna0 = self.origem
+            for celula, codigo in self.sujas.items():
+                linha, coluna = divmod(celula, largura)
+                linha -= linha0
+                coluna -= coluna0
+                partes.append(mover_cursor(self.linhas_status + linha, self._coluna_na_tela(linha, coluna))
+                              + self._texto(linha, coluna, codigo))
+                frente[linha * self.largura_janela + coluna] = codigo
+            self.sujas.clear()
+            for i in novas:
+                partes.append(mover_cursor(i, 0) + LIMPAR_LINHA + self.status[i])
+        if self.minimapa is not None:
+            bloco = self.minimapa.bloco(self.foco) if self.foco is not None else -1
+            if redesenhar or bloco != self.bloco_foco:
+                partes += self._quadro_minimapa()
+                self.bloco_foco = bloco
+        if partes:
+            self.saida.write("".join(partes))
+            self.saida.flush()
+
+    def encerrar(self) -> None:
+        """Leva o cursor para baixo da grade e volta a mostrá-lo."""
+        self.saida.write(mover_cursor(self.linhas_status + self.altura_janela + 1, 0) + MOSTRAR_CURSOR)
+        self.saida.flush()
+
+class RenderizadorBusca:
+    """
+    Desenha uma busca em andamento no terminal. O labirinto é desenhado uma vez; depois,
+    cada quadro reescreve só as células que mudaram desde o quadro anterior (TelaGrade).
+    Os eventos que chegam entre dois quadros apenas acumulam células sujas, então nenhuma
+    cópia do labirinto é guardada, por maior que ele seja. Com `janela`, mostra só a
+    parte em torno da primeira célula expandida, com um minimapa ao lado.
+    """
+
+    def __init__(self, lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto],
+                 quadros_por_segundo: float = 30, saida: Optional[TextIO] = None,
+                 janela: Optional[Tuple[int, int]] = None):
+        grade = grade_do_grafo(lab) if isinstance(lab, GrafoLabirinto) else como_grade(lab)
+        self.tela = TelaGrade(grade, linhas_status=1, saida=saida, janela=janela, minimapa=janela is not None)
+        self.intervalo = 1 / quadros_por_segundo
+        self.expandidas = 0
+        self.quadros = 0
+        self.status = ""
+
+    def iniciar(self) -> None:
+        """Limpa a tela e desenha o labirinto inteiro."""
+        self.tela.desenhar_tudo()
+
+    def marcar(self, celula: int, codigo: int) -> None:
+        """Agenda o redesenho de uma célula (início e fim nunca são cobertos)."""
+        if self.tela.grade.celulas[celula] not in (CEL_INICIO, CEL_FIM):
+            self.tela.alterar(celula, codigo)
+
+    def desenhar_quadro(self) -> None:
+        """Escreve de uma vez as células sujas e a linha de status."""
+        self.tela.apresentar((self.status,))
+        self.quadros += 1
+
+    def consumir(self, passos: PassosBusca,
+                 eventos_por_quadro: Optional[int] = None) -> Tuple[Optional[Caminho], MetricasBusca]:
+        """
+        Consome os eventos da busca e desenha no máximo quadros_por_segundo quadros.
+
+        Args:
+            passos: Busca passo a passo (ex.: passos_a_estrela(...))
+            eventos_por_quadro: Se informado, cada quadro avança esse número de expansões
+                e espera o intervalo do quadro (velocidade de reprodução fixa); senão a
+                busca roda o mais rápido possível e os quadros só amostram o progresso
+
+        Returns:
+            O caminho e as métricas retornados pela busca
+        """
+        proximo_quadro = time.monotonic() + self.intervalo
+        pendentes = 0
+        try:
+            while True:
+                evento = next(passos)
+                if not self.expandidas:
+                    self.tela.seguir(self.tela.grade.posicao(evento.celula))
+                self.marcar(evento.celula, CEL_VISITADO)
+                self.expandidas += 1
+                pendentes += 1
+                if eventos_por_quadro is not None and pendentes < eventos_por_quadro:
+                    continue
+                agora = time.monotonic()
+                if eventos_por_quadro is not None and agora < proximo_quadro:
+                    time.sleep(proximo_quadro - agora)
+                    agora = proximo_quadro
+                if agora >= proximo_quadro:
+                    melhor = "" if evento.melhor_custo is None else f"  Melhor: {evento.melhor_custo}"
+                    self.status = f"Expandidas: {self.expandidas}  Custo: {evento.custo}{melhor}"
+                    self.desenhar_quadro()
+                    proximo_quadro = agora + self.intervalo
+                    pendentes = 0
+        except StopIteration as parada:
+            caminho, metricas = parada.value
+        if caminho:
+            for linha, coluna in caminho:
+                self.marcar(linha * self.tela.grade.largura + coluna, CEL_SOLUCAO)
+        self.status = (f"{metricas.algoritmo}: {self.expandidas} expandidas, "
+                       f"custo {metricas.custo_total}" if caminho else f"{metricas.algoritmo}: sem caminho")
+        self.desenhar_quadro()
+        return caminho, metricas
+
+    def finalizar(self) -> None:
+        """Leva o cursor para baixo do labirinto e volta a mostrá-lo."""
+        self.tela.encerrar()
+
+def visualizar_busca(lab: Union[Labirinto, GradeLabirinto, GrafoLabirinto], passos: PassosBusca,
+                     quadros_por_segundo: float = 30,
+                     eventos_por_quadro: Optional[int] = None,
+                     janela: Optional[Tuple[int, int]] = None) -> Tuple[Optional[Caminho], MetricasBusca]:
+    """
+    Mostra uma busca em andamento no terminal, marcando as células expandidas com
+    VISITADO_BUSCA e, no fim, o caminho encontrado. Retorna o caminho e as métricas.
+    Com `janela` (ex.: janela_do_terminal(grade, 3)), só a parte visível é desenhada.
+    """
+    renderizador = RenderizadorBusca(lab, quadros_por_segundo, janela=janela)
+    renderizador.iniciar()
+    try:
+        return renderizador.consumir(passos, eventos_por_quadro)
+    finally:
+        renderizador.finalizar()